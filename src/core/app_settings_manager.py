@@ -147,6 +147,8 @@ class AppSettingsManager:
             "selected_405nm_column": self.selected_405nm_column,
             "selected_465nm_column": self.selected_465nm_column,
             "last_run_dfer_option": self.last_run_dfer_option,
+            "dfer_binary_output": self.dfer_binary_output,
+            "dfer_result_cache": self.dfer_result_cache,
         }
 
     def save_config_to_file(self, config: dict) -> None:
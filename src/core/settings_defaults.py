@@ -83,6 +83,8 @@ DEFAULT_SETTINGS: dict[str, str] = {
     "selected_405nm_column": "405nm",
     "selected_465nm_column": "465nm",
     "last_run_dfer_option": "1",
+    "dfer_binary_output": False,
+    "dfer_result_cache": False,
 }
 
 
@@ -10,6 +10,7 @@ Scientific Reports 11, 24212 (2021). https://doi.org/10.1038/s41598-021-03626-9
 """
 
 from .analysis import compute_options, run_analysis
-from .pfer import run_pfer
+from .batch import run_dfer_batch, run_pfer_batch
+from .pfer import run_pfer, sweep_prominence
 
-__all__ = ["run_analysis", "run_pfer", "compute_options"]
+__all__ = ["run_analysis", "run_pfer", "sweep_prominence", "compute_options", "run_dfer_batch", "run_pfer_batch"]
@@ -1,10 +1,32 @@
 from __future__ import annotations
 
+import logging
 from pathlib import Path
 
-from .df_common import detect_photometry_file_type, expected_analysis_output_path
+from .df_common import (
+    BUTTER_CUTOFF,
+    BUTTER_ORDER,
+    SAVGOL_COARSE,
+    SAVGOL_FINE,
+    detect_photometry_file_type,
+    expected_analysis_output_path,
+    precision_dtype,
+)
 from .df_dual import compute_dual_options, run_dual_analysis
 from .df_single import compute_single_options, run_single_analysis
+from .df_stream import DEFAULT_CHUNK_ROWS, run_streaming_analysis
+from .progress import (
+    DFER_STAGES,
+    STREAMING_DFER_STAGES,
+    CancelToken,
+    ProgressCallback,
+    StageProgress,
+)
+from .recording import PhotometryRecording, load_recording
+from .result_cache import result_cache
+from .results_io import bundle_paths, remove_result_bundle
+
+logger = logging.getLogger(__name__)
 
 
 def run_analysis(
@@ -15,47 +37,147 @@ def run_analysis(
     make_plots: bool = False,
     mode: str = "full",
     plot_stage: str = "all",
+    options: dict | None = None,
+    streaming: bool = False,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    binary_output: bool = False,
+    precision: str = "float64",
+    progress: ProgressCallback | None = None,
+    cancel: CancelToken | None = None,
+    cache: bool = False,
 ) -> str:
     """Run DFer on a single or dual photometry CSV.
 
     Set ``make_plots=True`` only when the optional ``html-plots`` extra is
     installed; the Qt app renders matplotlib figures inline instead.
+    Pass the ``compute_options`` result as ``options`` to skip recomputing the
+    option traces; it is ignored if it was built for a different file state
+    or analysis window.
+    Set ``streaming=True`` for recordings too large to hold in memory: the
+    CSV is processed ``chunk_rows`` rows at a time and no plots are made.
+    ``binary_output=True`` also writes a memory-mappable ``.npy`` + ``.json``
+    bundle next to the CSV, which ``read_result_frame`` prefers.
+    ``precision="float32"`` keeps the recording and intermediate traces in
+    float32 (fits and filter state stay float64); streaming runs ignore it.
+    ``progress(stage, fraction)`` is called as each stage of ``DFER_STAGES``
+    (``STREAMING_DFER_STAGES`` when streaming) starts, and ``cancel`` is
+    checked between stages; a cancelled run raises ``AnalysisCancelled``.
+    ``cache=True`` looks the run up in the shared result cache first (see
+    ``result_cache``) and restores the outputs of an identical earlier run
+    instead of recomputing them; runs that make plots are never cached.
     """
     if mode not in {"full", "options_only"}:
         raise ValueError("mode must be 'full' or 'options_only'")
     if plot_stage not in {"preview", "final", "all", "none"}:
         raise ValueError("plot_stage must be 'preview' | 'final' | 'all' | 'none'")
-
+    precision_dtype(precision)
+
+    if not cache or mode != "full" or make_plots:
+        return _run_analysis(selectedfile, w_start, w_end, analysis_path, make_plots, mode, plot_stage,
+                             options, streaming, chunk_rows, binary_output, precision, progress, cancel)
+
+    results = result_cache()
+    output_path = expected_analysis_output_path(selectedfile, create_dir=False)
+    key = results.key("dfer", [selectedfile], {
+        "w_start": w_start,
+        "w_end": w_end,
+        "analysis_path": analysis_path,
+        "streaming": streaming,
+        "binary_output": binary_output,
+        "precision": precision,
+        "butter": [BUTTER_CUTOFF, BUTTER_ORDER],
+        "savgol": [list(SAVGOL_FINE), list(SAVGOL_COARSE)],
+        "output": str(output_path),
+    })
+    restored = results.restore(key)
+    if restored is not None:
+        if not binary_output:
+            remove_result_bundle(restored)
+        StageProgress(STREAMING_DFER_STAGES if streaming else DFER_STAGES, progress, cancel).done()
+        logger.info("Reused cached DFer result for %s", Path(selectedfile).name)
+        return str(restored)
+
+    out_file_path = _run_analysis(selectedfile, w_start, w_end, analysis_path, make_plots, mode, plot_stage,
+                                  options, streaming, chunk_rows, binary_output, precision, progress, cancel)
+    outputs = [out_file_path, *bundle_paths(out_file_path)] if binary_output else [out_file_path]
+    results.store(key, out_file_path, outputs)
+    return out_file_path
+
+
+def _run_analysis(
+    selectedfile: str | Path,
+    w_start: str,
+    w_end: str,
+    analysis_path: str,
+    make_plots: bool,
+    mode: str,
+    plot_stage: str,
+    options: dict | None,
+    streaming: bool,
+    chunk_rows: int,
+    binary_output: bool,
+    precision: str,
+    progress: ProgressCallback | None,
+    cancel: CancelToken | None,
+) -> str:
     do_preview_plots = make_plots and (plot_stage in {"preview", "all"})
     do_final_plots = make_plots and (plot_stage in {"final", "all"})
 
-    selectedfile = str(Path(selectedfile).expanduser().resolve())
-    filename = Path(selectedfile).name
+    if streaming:
+        if mode != "full":
+            raise ValueError("streaming DFer only supports mode='full'")
+        return run_streaming_analysis(
+            selectedfile, w_start, w_end, analysis_path, chunk_rows, binary_output,
+            StageProgress(STREAMING_DFER_STAGES, progress, cancel))
 
-    file_type, skiprows = detect_photometry_file_type(selectedfile)
+    stages = StageProgress(DFER_STAGES, progress, cancel)
+    stages.stage("load")
+    recording = load_recording(selectedfile, precision)
+    reusable = options if options_match(options, recording, w_start, w_end) else None
 
-    if file_type == "single":
+    if recording.file_type == "single":
         return run_single_analysis(
-            selectedfile=selectedfile,
-            filename=filename,
+            recording=recording,
             w_start=w_start,
             w_end=w_end,
             analysis_path=analysis_path,
             do_preview_plots=do_preview_plots,
             do_final_plots=do_final_plots,
             mode=mode,
+            options=reusable,
+            binary_output=binary_output,
+            stages=stages,
         )
 
     return run_dual_analysis(
-        selectedfile=selectedfile,
-        filename=filename,
-        skiprows=skiprows,
+        recording=recording,
         w_start=w_start,
         w_end=w_end,
         analysis_path=analysis_path,
         do_preview_plots=do_preview_plots,
         do_final_plots=do_final_plots,
         mode=mode,
+        options=reusable,
+        binary_output=binary_output,
+        stages=stages,
+    )
+
+
+def options_match(
+    options: dict | None,
+    recording: PhotometryRecording,
+    w_start: str,
+    w_end: str,
+) -> bool:
+    """Return True when ``options`` was computed for this recording and window."""
+    if not isinstance(options, dict):
+        return False
+    return (
+        options.get("fingerprint") == recording.key
+        and options.get("file_type") == recording.file_type
+        and options.get("precision", "float64") == recording.precision
+        and options.get("w_start") == w_start
+        and options.get("w_end") == w_end
     )
 
 
@@ -63,19 +185,28 @@ def compute_options(
     selectedfile: str | Path,
     w_start: str = "",
     w_end: str = "",
+    precision: str = "float64",
+    progress: ProgressCallback | None = None,
+    cancel: CancelToken | None = None,
 ) -> dict:
     """Compute DFer option traces without plotting or saving files.
 
     Returns a dict of numpy arrays suitable for inline matplotlib display.
     Works for both single-channel and dual-channel photometry files.
+    ``precision="float32"`` stores the traces in float32. ``progress`` and
+    ``cancel`` behave as in ``run_analysis`` (load, fit, filter and smooth
+    stages only).
     """
-    selectedfile = str(Path(selectedfile).expanduser().resolve())
-    file_type, skiprows = detect_photometry_file_type(selectedfile)
-
-    if file_type == "single":
-        return compute_single_options(selectedfile, w_start, w_end)
+    stages = StageProgress(DFER_STAGES, progress, cancel)
+    stages.stage("load")
+    recording = load_recording(selectedfile, precision)
 
-    return compute_dual_options(selectedfile, skiprows, w_start, w_end)
+    if recording.file_type == "single":
+        options = compute_single_options(recording, w_start, w_end, stages)
+    else:
+        options = compute_dual_options(recording, w_start, w_end, stages)
+    stages.done()
+    return options
 
 
 __all__ = [
@@ -83,4 +214,5 @@ __all__ = [
     "expected_analysis_output_path",
     "run_analysis",
     "compute_options",
+    "load_recording",
 ]
@@ -0,0 +1,360 @@
+"""Headless batch runners for DFer and PFer over a folder of recordings.
+
+Usage::
+
+    python -m src.dfer.batch dfer path/to/cohort --option 2 --workers 6
+    python -m src.dfer.batch pfer path/to/cohort --prominence 0.003 --workers 6
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import glob
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from .analysis import run_analysis
+from .df_common import detect_photometry_file_type, expected_analysis_output_path
+from .pfer import DEFAULT_ART_THRESHOLD, DEFAULT_PROMINENCE, _run_pfer
+from .recording import recording_cache
+
+logger = logging.getLogger(__name__)
+
+DFER_MANIFEST_NAME = "dfer_batch_manifest.csv"
+MANIFEST_COLUMNS = ["input", "file_type", "output", "status", "seconds", "error"]
+PFER_SUMMARY_NAME = "pfer_batch_summary.csv"
+PFER_SUMMARY_COLUMNS = [
+    "input", "file_type", "signal", "status", "peak_count", "mean_amplitude",
+    "mean_rise_time_s", "baseline_peak_count", "warning1", "warning2",
+    "stats_csv", "seconds", "error",
+]
+_BATCH_REPORT_NAMES = {DFER_MANIFEST_NAME, PFER_SUMMARY_NAME}
+_RESULT_FOLDER = "dfof_results"
+_DFER_OUTPUT_SUFFIX = "_Data.csv"
+
+
+def discover_recordings(source: str | Path) -> list[Path]:
+    """Return the CSV files selected by a directory or glob pattern.
+
+    Directories are searched recursively so dual sessions stored one folder
+    deep are found. Anything inside a ``dfof_results`` folder is ignored, as
+    are the DFer manifests and PFer summaries earlier batches wrote there.
+    """
+    source_text = str(source)
+    if glob.has_magic(source_text):
+        candidates = [Path(p) for p in glob.glob(os.path.expanduser(source_text), recursive=True)]
+    else:
+        root = Path(source_text).expanduser()
+        if root.is_file():
+            candidates = [root]
+        elif root.is_dir():
+            candidates = list(root.rglob("*.csv"))
+        else:
+            raise FileNotFoundError(f"Batch source does not exist:\n{root}")
+
+    files = {
+        path.resolve()
+        for path in candidates
+        if path.is_file()
+        and path.suffix.lower() == ".csv"
+        and _RESULT_FOLDER not in path.parts
+        and path.name not in _BATCH_REPORT_NAMES
+    }
+    return sorted(files)
+
+
+def discover_dfer_outputs(source: str | Path) -> list[Path]:
+    """Return the DFer outputs (``*_Data.csv``/``*_Dual_Data.csv``) selected by ``source``.
+
+    ``source`` is a ``dfof_results`` folder, a folder searched recursively
+    for them, a single output, or a glob pattern.
+    """
+    source_text = str(source)
+    if glob.has_magic(source_text):
+        candidates = [Path(p) for p in glob.glob(os.path.expanduser(source_text), recursive=True)]
+    else:
+        root = Path(source_text).expanduser()
+        if root.is_file():
+            candidates = [root]
+        elif root.is_dir():
+            candidates = list(root.rglob(f"*{_DFER_OUTPUT_SUFFIX}"))
+        else:
+            raise FileNotFoundError(f"Batch source does not exist:\n{root}")
+
+    files = {
+        path.resolve()
+        for path in candidates
+        if path.is_file() and path.name.endswith(_DFER_OUTPUT_SUFFIX)
+    }
+    return sorted(files)
+
+
+def _default_manifest_path(source: str | Path, files: list[Path], name: str = DFER_MANIFEST_NAME) -> Path:
+    root = Path(str(source)).expanduser()
+    if not glob.has_magic(str(source)) and root.is_dir():
+        return root.resolve() / name
+    if files:
+        return Path(os.path.commonpath([str(path.parent) for path in files])) / name
+    return Path.cwd() / name
+
+
+def _is_up_to_date(input_path: Path, output_path: Path) -> bool:
+    try:
+        return output_path.stat().st_mtime >= input_path.stat().st_mtime
+    except FileNotFoundError:
+        return False
+
+
+def _run_one(selectedfile: str, w_start: str, w_end: str, analysis_path: str, cache: bool) -> tuple[str, float]:
+    started = time.perf_counter()
+    try:
+        out_path = run_analysis(
+            selectedfile,
+            w_start=w_start,
+            w_end=w_end,
+            analysis_path=analysis_path,
+            make_plots=False,
+            mode="full",
+            plot_stage="none",
+            cache=cache,
+        )
+    finally:
+        # Each recording is processed once per batch; don't let pool workers
+        # hold finished recordings in the process-wide cache.
+        recording_cache().clear()
+    return out_path, time.perf_counter() - started
+
+
+def _run_pfer_one(
+    csv_path: str,
+    w_start: str,
+    w_end: str,
+    prominence: float,
+    artifact_threshold: int,
+    cache: bool,
+) -> tuple[list[dict[str, object]], float]:
+    started = time.perf_counter()
+    _, summary = _run_pfer(csv_path, w_start, w_end, prominence, artifact_threshold,
+                           make_plots=False, precision="float64", progress=None, cancel=None, cache=cache)
+    return summary, time.perf_counter() - started
+
+
+def _write_manifest(manifest_path: Path, rows: list[dict], columns: list[str] = MANIFEST_COLUMNS) -> None:
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    with manifest_path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def run_dfer_batch(
+    source: str | Path,
+    w_start: str = "",
+    w_end: str = "",
+    analysis_path: str = "1",
+    max_workers: int | None = None,
+    force: bool = False,
+    manifest_path: str | Path | None = None,
+    cache: bool = False,
+) -> str:
+    """Run DFer on every raw photometry CSV under ``source``.
+
+    Recordings are processed on a bounded process pool. Files whose output is
+    newer than the input are skipped unless ``force`` is set. With ``cache``
+    on (and ``force`` off), other files are restored from the shared result
+    cache when an identical run is found there. Returns the path of the
+    per-file status/timing manifest.
+    """
+    if analysis_path not in {"1", "2", "3", "4"}:
+        raise ValueError("analysis_path must be '1','2','3','4'")
+
+    files = discover_recordings(source)
+    manifest = (
+        Path(manifest_path).expanduser().resolve()
+        if manifest_path is not None
+        else _default_manifest_path(source, files)
+    )
+    files = [path for path in files if path != manifest]
+
+    rows: dict[Path, dict] = {}
+    pending: list[Path] = []
+    claimed_outputs: set[Path] = set()
+    for path in files:
+        row = {"input": str(path), "file_type": "", "output": "",
+               "status": "", "seconds": "", "error": ""}
+        rows[path] = row
+        try:
+            file_type, _ = detect_photometry_file_type(path)
+        except ValueError as exc:
+            row.update(status="skipped", error=str(exc).splitlines()[0])
+            continue
+        # run_analysis creates the result folder only for files it actually processes.
+        output_path = expected_analysis_output_path(path, file_type=file_type, create_dir=False)
+        row.update(file_type=file_type, output=str(output_path))
+        if output_path in claimed_outputs:
+            row.update(status="skipped", error="Another recording in this batch writes the same output.")
+            continue
+        claimed_outputs.add(output_path)
+        if not force and _is_up_to_date(path, output_path):
+            row.update(status="up-to-date")
+            continue
+        pending.append(path)
+
+    logger.info("DFer batch: %s file(s) found, %s to process", len(files), len(pending))
+
+    if pending:
+        workers = max(1, min(max_workers or os.cpu_count() or 1, len(pending)))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(_run_one, str(path), w_start, w_end, analysis_path, cache and not force): path
+                for path in pending
+            }
+            for future in as_completed(futures):
+                path = futures[future]
+                row = rows[path]
+                try:
+                    out_path, seconds = future.result()
+                except Exception as exc:
+                    row.update(status="failed", error=str(exc).splitlines()[0] if str(exc) else repr(exc))
+                    logger.error("DFer batch failed for %s: %s", path.name, exc)
+                else:
+                    row.update(status="ok", output=out_path, seconds=f"{seconds:.3f}")
+                    logger.info("DFer batch finished %s in %.1f s", path.name, seconds)
+
+    _write_manifest(manifest, list(rows.values()))
+    logger.info("DFer batch manifest: %s", manifest)
+    return str(manifest)
+
+
+def run_pfer_batch(
+    source: str | Path,
+    w_start: str = "",
+    w_end: str = "",
+    prominence: float = DEFAULT_PROMINENCE,
+    artifact_threshold: int = DEFAULT_ART_THRESHOLD,
+    max_workers: int | None = None,
+    summary_path: str | Path | None = None,
+    cache: bool = False,
+) -> str:
+    """Run PFer on every DFer output under ``source`` and write a cohort summary.
+
+    Files are processed on a bounded process pool; each still gets its usual
+    stats/waveform CSVs. The summary has one row per file and signal with
+    the peak count, mean amplitude, mean rise time, baseline peak count and
+    the two suitability warnings (``warning1``/``warning2``), plus the
+    status, timing and error of the file. With ``cache`` on, files whose
+    identical run is in the shared result cache are restored from it.
+    Returns the summary path.
+    """
+    files = discover_dfer_outputs(source)
+    summary = (
+        Path(summary_path).expanduser().resolve()
+        if summary_path is not None
+        else _default_manifest_path(source, files, PFER_SUMMARY_NAME)
+    )
+    logger.info("PFer batch: %s file(s) to process", len(files))
+
+    rows: dict[Path, list[dict]] = {}
+    if files:
+        workers = max(1, min(max_workers or os.cpu_count() or 1, len(files)))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(_run_pfer_one, str(path), w_start, w_end, prominence, artifact_threshold,
+                            cache): path
+                for path in files
+            }
+            for future in as_completed(futures):
+                path = futures[future]
+                file_type = "dual" if path.name.endswith("_Dual_Data.csv") else "single"
+                base = {"input": str(path), "file_type": file_type}
+                try:
+                    signals, seconds = future.result()
+                except Exception as exc:
+                    error = str(exc).splitlines()[0] if str(exc) else repr(exc)
+                    rows[path] = [{**base, "status": "failed", "error": error}]
+                    logger.error("PFer batch failed for %s: %s", path.name, exc)
+                else:
+                    rows[path] = [
+                        {**base, **signal, "status": "ok", "seconds": f"{seconds:.3f}"}
+                        for signal in signals
+                    ]
+                    logger.info("PFer batch finished %s in %.1f s", path.name, seconds)
+
+    _write_manifest(summary, [row for path in files for row in rows[path]], PFER_SUMMARY_COLUMNS)
+    logger.info("PFer batch summary: %s", summary)
+    return str(summary)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Run DFer/PFer over a folder of recordings.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    dfer = subparsers.add_parser("dfer", help="Run DFer on raw photometry CSVs.")
+    dfer.add_argument("source", help="Folder (searched recursively) or glob of raw CSVs.")
+    dfer.add_argument("--start", default="", help="Analysis window start in seconds.")
+    dfer.add_argument("--end", default="", help="Analysis window end in seconds.")
+    dfer.add_argument("--option", default="1", choices=["1", "2", "3", "4"],
+                      help="DFer analysis option.")
+    dfer.add_argument("--workers", type=int, default=None,
+                      help="Maximum worker processes (default: CPU count).")
+    dfer.add_argument("--force", action="store_true",
+                      help="Reprocess recordings whose output is already up to date.")
+    dfer.add_argument("--manifest", default=None, help="Manifest CSV path.")
+    dfer.add_argument("--cache", action="store_true",
+                      help="Restore identical earlier runs from the shared result cache.")
+
+    pfer = subparsers.add_parser("pfer", help="Run PFer on DFer outputs and summarise the cohort.")
+    pfer.add_argument("source", help="Folder (searched recursively) or glob of *_Data.csv outputs.")
+    pfer.add_argument("--start", default="", help="Baseline window start in seconds.")
+    pfer.add_argument("--end", default="", help="Baseline window end in seconds.")
+    pfer.add_argument("--prominence", type=float, default=DEFAULT_PROMINENCE,
+                      help="Peak prominence threshold.")
+    pfer.add_argument("--artifact-threshold", type=int, default=DEFAULT_ART_THRESHOLD,
+                      help="Minimum samples between trough and peak.")
+    pfer.add_argument("--workers", type=int, default=None,
+                      help="Maximum worker processes (default: CPU count).")
+    pfer.add_argument("--summary", default=None, help="Summary CSV path.")
+    pfer.add_argument("--cache", action="store_true",
+                      help="Restore identical earlier runs from the shared result cache.")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s:%(name)s:%(message)s")
+    try:
+        if args.command == "pfer":
+            manifest = run_pfer_batch(
+                args.source,
+                w_start=args.start,
+                w_end=args.end,
+                prominence=args.prominence,
+                artifact_threshold=args.artifact_threshold,
+                max_workers=args.workers,
+                summary_path=args.summary,
+                cache=args.cache,
+            )
+        else:
+            manifest = run_dfer_batch(
+                args.source,
+                w_start=args.start,
+                w_end=args.end,
+                analysis_path=args.option,
+                max_workers=args.workers,
+                force=args.force,
+                manifest_path=args.manifest,
+                cache=args.cache,
+            )
+    except Exception:
+        logger.exception("%s batch failed.", args.command.upper())
+        return 1
+    print(manifest)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
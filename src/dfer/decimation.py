@@ -0,0 +1,116 @@
+"""Min/max envelope decimation for plotting long traces.
+
+A trace drawn into ``n`` pixel columns cannot show more than one vertical
+stroke per column, from the column's minimum to its maximum. ``minmax_indices``
+splits the samples into ``n_bins`` equal runs and keeps the first and last
+sample plus the positions of each run's minimum and maximum, in time order.
+The decimated line therefore covers exactly the same vertical extent in every
+bin as the full trace, so no peak or trough that is visible at that width is
+dropped. When several traces share one x axis the kept positions are the
+union over all of them, so every trace keeps its own envelope.
+
+``plot_decimated`` draws such an envelope on a Matplotlib axis and redoes it
+for the visible range whenever the x limits change, so zooming in brings
+back full detail.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+    from matplotlib.lines import Line2D
+
+#: Samples kept per bin; bins are usually one per horizontal pixel.
+POINTS_PER_BIN = 2
+
+
+def minmax_indices(n_bins: int, *traces: np.ndarray) -> np.ndarray:
+    """Return the sorted sample positions that preserve each trace's min/max envelope.
+
+    All ``traces`` must have the same length. Traces short enough to draw in
+    full (at most ``POINTS_PER_BIN * n_bins`` samples) keep every position.
+    NaN samples count as a bin's extreme, so gaps stay visible.
+    """
+    if n_bins < 1:
+        raise ValueError("n_bins must be at least 1")
+    if not traces:
+        raise ValueError("minmax_indices needs at least one trace")
+    n = len(traces[0])
+    if any(len(trace) != n for trace in traces):
+        raise ValueError("All traces must have the same length.")
+    if n <= POINTS_PER_BIN * n_bins:
+        return np.arange(n)
+
+    width = -(-n // n_bins)  # ceil, so every sample lands in a bin
+    n_bins = -(-n // width)
+    offsets = np.arange(n_bins) * width
+    keep = [np.array([0, n - 1])]
+    for trace in traces:
+        values = np.asarray(trace, dtype=float)
+        # Pad the last bin with copies of the last sample; argmin/argmax
+        # return the first extreme, which is never a pad position.
+        padded = np.empty(n_bins * width)
+        padded[:n] = values
+        padded[n:] = values[-1]
+        rows = padded.reshape(n_bins, width)
+        keep.append(offsets + np.argmin(rows, axis=1))
+        keep.append(offsets + np.argmax(rows, axis=1))
+    return np.unique(np.concatenate(keep))
+
+
+def minmax_decimate(
+    x: np.ndarray,
+    traces: dict[str, np.ndarray],
+    n_bins: int,
+) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    """Decimate ``traces`` (sharing the x values ``x``) to their min/max envelope.
+
+    Returns the kept x values and a dict of the kept samples of each trace.
+    """
+    index = minmax_indices(n_bins, *traces.values())
+    return np.asarray(x)[index], {name: np.asarray(trace)[index] for name, trace in traces.items()}
+
+
+def _visible_indices(x: np.ndarray, y: np.ndarray, lo: float, hi: float, n_bins: int) -> np.ndarray:
+    n = len(x)
+    if n == 0:
+        return np.arange(0)
+    # One sample either side of the limits keeps the edge segments; the
+    # first and last samples keep the line's full data extent.
+    start = max(int(np.searchsorted(x, lo, side="left")) - 1, 0)
+    stop = min(int(np.searchsorted(x, hi, side="right")) + 1, n)
+    if stop <= start:
+        return np.array([0, n - 1]) if n > 1 else np.arange(n)
+    index = start + minmax_indices(n_bins, y[start:stop])
+    return np.union1d(index, [0, n - 1])
+
+
+def plot_decimated(ax: Axes, x: np.ndarray, y: np.ndarray, *args: Any, **kwargs: Any) -> Line2D:
+    """``ax.plot(x, y, ...)`` for long traces with increasing ``x``.
+
+    Draws the min/max envelope of the visible samples at one bin per pixel
+    of the axis width, and redraws it on every x-limit change of ``ax`` or
+    an axis sharing its x (e.g. a ``twinx``). The line's x data always
+    starts and ends with the first and last sample.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    index = _visible_indices(x, y, -np.inf, np.inf, _pixel_bins(ax))
+    (line,) = ax.plot(x[index], y[index], *args, **kwargs)
+
+    def _redecimate(changed: Axes) -> None:
+        lo, hi = sorted(changed.get_xlim())
+        index = _visible_indices(x, y, lo, hi, _pixel_bins(ax))
+        line.set_data(x[index], y[index])
+
+    for axis in ax.get_shared_x_axes().get_siblings(ax):
+        axis.callbacks.connect("xlim_changed", _redecimate)
+    return line
+
+
+def _pixel_bins(ax: Axes) -> int:
+    return max(int(ax.bbox.width), 1)
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 import logging
-from typing import cast
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, cast
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
 from scipy import signal
-from scipy.signal import butter, savgol_filter
+from scipy.signal import butter, oaconvolve, savgol_coeffs, savgol_filter
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +18,37 @@ BUTTER_CUTOFF = 0.4       # Hz  - lowpass cutoff for both single and dual
 BUTTER_ORDER = 1
 SAVGOL_FINE = (21, 6)     # (window, poly) - gentle smoothing
 SAVGOL_COARSE = (501, 0)  # (window, poly) - strong smoothing / moving average
+SAVGOL_FFT_MIN_WINDOW = 101  # windows at least this long use FFT convolution
+MAX_PAIR_WORKERS = 4      # threads filtering control-target pairs concurrently
+
+# Storage dtypes for the ``precision`` setting. Fits and filter state always
+# run in float64; "float32" only changes how traces are kept.
+PRECISIONS = {"float64": np.float64, "float32": np.float32}
+
+# Column order of the DFer ``_Data.csv`` / ``_Dual_Data.csv`` outputs.
+SINGLE_OUTPUT_COLUMNS = ["t_min", "405", "465", "filtered_465", "fitted_405",
+                         "dFoF_405", "Z_405", "dFoF_465", "Z_465"]
+DUAL_CONTROL = "410"
+DUAL_TARGETS = ("470", "560")
+DUAL_INPUT_COLUMNS = ["TimeStamp", "CH1-410", "CH1-470", "CH1-560"]
+
+
+def dual_output_columns(control: str, targets: tuple[str, ...] | list[str]) -> list[str]:
+    """Output columns for a control channel and its target channels, pair by pair."""
+    columns = ["t_min", control, *targets]
+    for target in targets:
+        columns += [f"filtered_{target}", f"fitted_{control}_to_{target}", f"dFoF_{target}", f"Z_{target}"]
+    return columns
+
+
+DUAL_OUTPUT_COLUMNS = dual_output_columns(DUAL_CONTROL, DUAL_TARGETS)
+
+
+def precision_dtype(precision: str) -> np.dtype:
+    """Return the trace storage dtype for a ``precision`` setting."""
+    if precision not in PRECISIONS:
+        raise ValueError("precision must be 'float64' or 'float32'")
+    return np.dtype(PRECISIONS[precision])
 
 
 def missing_columns(df: pd.DataFrame, required: list[str]) -> list[str]:
@@ -30,9 +63,11 @@ def raise_missing_columns(file_kind: str, missing: list[str], required_help: str
     )
 
 
-def validate_single_df(df: pd.DataFrame) -> None:
-    missing = missing_columns(df, ["#time(seconds)", "405nm"])
-    signal_present = ("465nm" in df.columns) or ("490nm" in df.columns)
+def check_single_columns(columns) -> str:
+    """Raise unless ``columns`` hold the single-photometry inputs; return the signal column."""
+    columns = list(columns)
+    missing = [column for column in ["#time(seconds)", "405nm"] if column not in columns]
+    signal_present = ("465nm" in columns) or ("490nm" in columns)
     if not signal_present:
         missing.append("465nm or 490nm")
     if missing:
@@ -41,34 +76,46 @@ def validate_single_df(df: pd.DataFrame) -> None:
             missing,
             "#time(seconds), 405nm, and either 465nm or 490nm",
         )
-    if len(df.index) < 3:
-        raise ValueError("Single photometry CSV must contain at least 3 rows of data.")
+    return "465nm" if "465nm" in columns else "490nm"
 
 
-def validate_dual_df(df: pd.DataFrame) -> None:
-    required = ["TimeStamp", "CH1-410", "CH1-470", "CH1-560"]
-    missing = missing_columns(df, required)
+def check_dual_columns(columns) -> None:
+    """Raise unless ``columns`` hold the dual-photometry inputs."""
+    columns = list(columns)
+    missing = [column for column in DUAL_INPUT_COLUMNS if column not in columns]
     if missing:
         raise_missing_columns(
             "Dual photometry",
             missing,
-            "TimeStamp, CH1-410, CH1-470, CH1-560",
+            ", ".join(DUAL_INPUT_COLUMNS),
         )
+
+
+def validate_single_df(df: pd.DataFrame) -> None:
+    check_single_columns(df.columns)
+    if len(df.index) < 3:
+        raise ValueError("Single photometry CSV must contain at least 3 rows of data.")
+
+
+def validate_dual_df(df: pd.DataFrame) -> None:
+    check_dual_columns(df.columns)
     if len(df.index) < 3:
         raise ValueError("Dual photometry CSV must contain at least 3 rows of data.")
 
 
 def butter_lowpass_filter(data: np.ndarray, cutoff: float, fs: float, order: int = 5) -> np.ndarray:
-    if len(data) < 4:
+    """Zero-phase Butterworth lowpass along the last axis (1-D trace or row stack)."""
+    if np.shape(data)[-1] < 4:
         return np.asarray(data, dtype=float).copy()
     b, a = cast(tuple[np.ndarray, np.ndarray], butter(
         order, cutoff, fs=fs, btype="low", analog=False))
-    return np.asarray(signal.filtfilt(b, a, data, padtype=None), dtype=float)
+    return np.asarray(signal.filtfilt(b, a, data, axis=-1, padtype=None), dtype=float)
 
 
 def safe_savgol(data: np.ndarray, window: int, poly: int) -> np.ndarray:
+    """Savitzky-Golay smoothing along the last axis with the window clamped to the data."""
     arr = np.asarray(data, dtype=float)
-    n = len(arr)
+    n = arr.shape[-1]
     if n == 0:
         return arr.copy()
     max_window = n if (n % 2 == 1) else (n - 1)
@@ -82,72 +129,212 @@ def safe_savgol(data: np.ndarray, window: int, poly: int) -> np.ndarray:
         safe_window = min_valid_window
     if safe_window > max_window:
         return arr.copy()
-    return np.asarray(savgol_filter(arr, safe_window, poly), dtype=float)
+    return savgol_smooth(arr, safe_window, poly)
+
+
+def _moving_average(arr: np.ndarray, window: int) -> np.ndarray:
+    # Centre each row first so the running sum stays small and exact enough.
+    offset = np.mean(arr, axis=-1, keepdims=True)
+    centred = arr - offset
+    csum = np.cumsum(centred, axis=-1)
+    zero = np.zeros(csum.shape[:-1] + (1,))
+    csum = np.concatenate([zero, csum], axis=-1)
+    return (csum[..., window:] - csum[..., :-window]) / window + offset
+
+
+def savgol_smooth(arr: np.ndarray, window: int, poly: int) -> np.ndarray:
+    """Savitzky-Golay filter along the last axis matching ``savgol_filter`` (mode="interp").
+
+    Picks the cheapest exact implementation: an O(n) running sum for
+    polyorder 0 (a plain moving average), FFT overlap-add convolution for long
+    windows, and SciPy's direct filter otherwise. Edge samples are refitted
+    from the first/last ``window`` points exactly as ``savgol_filter`` does.
+    """
+    arr = np.asarray(arr, dtype=float)
+    n = arr.shape[-1]
+    if window > n or window % 2 == 0 or poly >= window:
+        return np.asarray(savgol_filter(arr, window, poly, axis=-1), dtype=float)
+    if poly > 0 and window < SAVGOL_FFT_MIN_WINDOW:
+        return np.asarray(savgol_filter(arr, window, poly, axis=-1), dtype=float)
+
+    half = window // 2
+    out = np.empty_like(arr)
+    if poly == 0:
+        out[..., half:n - half] = _moving_average(arr, window)
+        out[..., :half] = np.mean(arr[..., :window], axis=-1, keepdims=True)
+        out[..., n - half:] = np.mean(arr[..., n - window:], axis=-1, keepdims=True)
+        return out
+
+    kernel = savgol_coeffs(window, poly, use="conv")
+    kernel = kernel.reshape((1,) * (arr.ndim - 1) + (window,))
+    out[..., half:n - half] = oaconvolve(arr, kernel, mode="valid", axes=-1)
+    out[..., :half] = savgol_filter(arr[..., :window], window, poly, axis=-1)[..., :half]
+    out[..., n - half:] = savgol_filter(arr[..., n - window:], window, poly, axis=-1)[..., window - half:]
+    return out
 
 
 def polyeval(coeffs: np.ndarray, n: int) -> np.ndarray:
     return np.polyval(coeffs, np.arange(n))
 
 
-def compute_adjusted_baselines(
+def quadratic_baselines(traces: np.ndarray) -> np.ndarray:
+    """Return the quadratic fit (against sample index) of every row of ``traces``.
+
+    All rows share one Vandermonde matrix, so a single least-squares solve
+    fits the whole stack.
+    """
+    stack = np.atleast_2d(np.asarray(traces, dtype=float))
+    idx = np.arange(stack.shape[-1])
+    coeffs = np.polyfit(idx, stack.T, 2)
+    return (coeffs[0][:, None] * idx + coeffs[1][:, None]) * idx + coeffs[2][:, None]
+
+
+def shared_control_baselines(
     control: np.ndarray,
-    target: np.ndarray,
-) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
-    n = len(target)
-    idx = np.arange(n)
-    scale_factor = np.mean(target) / np.mean(control)
-    scaled_control = control * scale_factor
-    qfit_control = np.polyfit(idx, control, 2)
-    qfit_target = np.polyfit(idx, target, 2)
-    qfit_scaled = np.polyfit(idx, scaled_control, 2)
-    control_quad = polyeval(qfit_control, n)
-    raw_target_quad = polyeval(qfit_target, n)
-    scaled_quad = polyeval(qfit_scaled, n)
+    targets: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Fit the control once and derive every pair's baselines from it.
+
+    Returns (scale_factors, adjusted_2, scaled_quad). ``scaled_quad`` and
+    ``adjusted_2`` have one row per target. Each pair's scaled control is
+    ``scale * control``; its quadratic fit is ``scale * control_quad``, and
+    its adjusted baseline (``adjusted_1``) is ``scale * control`` itself, so
+    neither needs a fit of its own.
+    """
+    control = np.asarray(control, dtype=float)
+    targets = np.atleast_2d(np.asarray(targets, dtype=float))
+    scale_factors = np.mean(targets, axis=-1) / np.mean(control)
+    quads = quadratic_baselines(np.vstack([control, targets]))
+    control_quad = quads[0]
+    raw_target_quad = quads[1:]
     raw_df = (control - control_quad) / control_quad
-    adjusted_1 = scaled_quad * raw_df + scaled_quad
     adjusted_2 = raw_target_quad * raw_df + raw_target_quad
-    return adjusted_1, adjusted_2, raw_target_quad, scaled_quad
+    return scale_factors, adjusted_2, scale_factors[:, None] * control_quad
+
+
+def _map_pairs(fn: Callable, items: list, max_workers: int | None) -> list:
+    if max_workers is None:
+        max_workers = min(MAX_PAIR_WORKERS, os.cpu_count() or 1)
+    workers = min(len(items), max_workers)
+    if workers <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dfer-pair") as pool:
+        return list(pool.map(fn, items))
+
+
+def _lowpass(rows: np.ndarray, fs: float) -> np.ndarray:
+    return butter_lowpass_filter(rows, BUTTER_CUTOFF, fs, BUTTER_ORDER)
+
+
+def _smooth(filtered: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Row 0 is a baseline (the control or a pair's adjusted_2) and also gets
+    # the coarse smoothing.
+    return safe_savgol(filtered, *SAVGOL_FINE), safe_savgol(filtered[:1], *SAVGOL_COARSE)[0]
+
+
+def smooth_bank(
+    control: np.ndarray,
+    scale_factors: np.ndarray,
+    adjusted_2: np.ndarray,
+    targets: np.ndarray,
+    fs: float,
+    dtype: np.dtype | type = np.float64,
+    stage: Callable[[str], None] | None = None,
+    max_workers: int | None = None,
+) -> dict[str, np.ndarray]:
+    """Filter and smooth the control and every control-target pair.
+
+    The control is filtered and smoothed once; because both filters are
+    linear, each pair's ``adj1``/``adj3`` are that result times the pair's
+    scale factor. Each pair's ``adjusted_2`` and target run as one task on a
+    small thread pool (the SciPy filters release the GIL), at most
+    ``max_workers`` at a time (default: ``MAX_PAIR_WORKERS``, capped at the
+    CPU count). The filters run in float64; results are stored as ``dtype``.
+    Returned arrays have one row per target: ``target_smooth`` and
+    ``adj1``-``adj4`` (the four option baselines). ``stage`` is called with
+    ``"filter"`` and ``"smooth"`` before each step (see
+    ``progress.StageProgress.stage``).
+    """
+    targets = np.atleast_2d(np.asarray(targets, dtype=float))
+    tasks = [np.atleast_2d(control)] + [
+        np.vstack([adjusted_2[k], targets[k]]) for k in range(targets.shape[0])]
+    if stage is not None:
+        stage("filter")
+    filtered = _map_pairs(lambda rows: _lowpass(rows, fs), tasks, max_workers)
+    if stage is not None:
+        stage("smooth")
+    smoothed = _map_pairs(_smooth, filtered, max_workers)
+
+    (control_fine, control_coarse), pairs = smoothed[0], smoothed[1:]
+    scale = np.asarray(scale_factors, dtype=float)[:, None]
+    return {
+        "target_smooth": np.vstack([fine[1] for fine, _ in pairs]).astype(dtype, copy=False),
+        "adj1": (scale * control_fine[0]).astype(dtype, copy=False),
+        "adj2": np.vstack([fine[0] for fine, _ in pairs]).astype(dtype, copy=False),
+        "adj3": (scale * control_coarse).astype(dtype, copy=False),
+        "adj4": np.vstack([coarse for _, coarse in pairs]).astype(dtype, copy=False),
+    }
+
+
+def filter_bank(
+    control: np.ndarray,
+    targets: np.ndarray,
+    fs: float,
+    dtype: np.dtype | type = np.float64,
+    stage: Callable[[str], None] | None = None,
+    max_workers: int | None = None,
+) -> dict[str, np.ndarray]:
+    """Run the DFer fit/filter/smooth chain for every control-target pair.
+
+    ``targets`` holds one row per target channel. The control fit, filter
+    and smoothing are shared by all pairs; the per-pair work runs on a thread
+    pool (see ``smooth_bank``). Returns the ``smooth_bank`` traces plus
+    ``scaled_quad``, each with one row per target and stored as ``dtype``
+    (the fits themselves are always float64). ``stage`` is called with
+    ``"fit"``, ``"filter"`` and ``"smooth"`` as the chain advances.
+    """
+    if stage is not None:
+        stage("fit")
+    scale_factors, adjusted_2, scaled_quad = shared_control_baselines(control, targets)
+    bank = smooth_bank(control, scale_factors, adjusted_2, targets, fs, dtype, stage, max_workers)
+    bank["scaled_quad"] = scaled_quad.astype(dtype, copy=False)
+    return bank
 
 
 def detect_photometry_file_type(selectedfile: str | Path) -> tuple[str, int]:
+    from .recording import cached_recording, sniff_photometry_header  # lazy — recording imports this module
+
     selectedfile = str(Path(selectedfile).expanduser().resolve())
-    cols0 = pd.read_csv(selectedfile, nrows=0, low_memory=False).columns.astype(str).tolist()
-    first0 = cols0[0] if cols0 else ""
-    if first0 == "#time(seconds)":
-        return "single", 0
-    if first0 == "TimeStamp":
-        return "dual", 0
-    cols1 = pd.read_csv(selectedfile, nrows=0, skiprows=1, low_memory=False).columns.astype(str).tolist()
-    first1 = cols1[0] if cols1 else ""
-    if first1 == "TimeStamp":
-        return "dual", 1
-    raise ValueError(
-        "Could not detect file type.\n\n"
-        "Expected first column '#time(seconds)' (single) or 'TimeStamp' (dual).\n"
-        "Dual files may have metadata in row 1 (we try skiprows=1)."
-    )
+    cached = cached_recording(selectedfile)
+    if cached is not None:
+        return cached.file_type, cached.skiprows
+    file_type, skiprows, _ = sniff_photometry_header(selectedfile)
+    return file_type, skiprows
 
 
 def expected_analysis_output_path(
     selectedfile: str | Path,
     file_type: str | None = None,
+    create_dir: bool = True,
 ) -> Path:
     selected_path = Path(selectedfile).expanduser().resolve()
     if file_type is None:
         file_type, _ = detect_photometry_file_type(selected_path)
     if file_type == "single":
         outdir = selected_path.parent / "dfof_results"
-        outdir.mkdir(parents=True, exist_ok=True)
-        return outdir / f"{selected_path.stem}_Data.csv"
-    if file_type == "dual":
+        out_path = outdir / f"{selected_path.stem}_Data.csv"
+    elif file_type == "dual":
         outdir = selected_path.parent.parent / "dfof_results"
-        outdir.mkdir(parents=True, exist_ok=True)
         safe_stem = "".join(
             c if c not in '<>:"/\\|?*' else "_"
             for c in (selected_path.parent.name or selected_path.stem)
         ).strip()
-        return outdir / f"{safe_stem}_Dual_Data.csv"
-    raise ValueError("file_type must be 'single' or 'dual'")
+        out_path = outdir / f"{safe_stem}_Dual_Data.csv"
+    else:
+        raise ValueError("file_type must be 'single' or 'dual'")
+    if create_dir:
+        outdir.mkdir(parents=True, exist_ok=True)
+    return out_path
 
 
 def window_slice(length: int, dt_sec: float, w_start: str, w_end: str) -> tuple[slice, int, int]:
@@ -6,7 +6,9 @@ import numpy as np
 import pandas as pd
 from matplotlib.figure import Figure
 
-from .plotting import render_html
+from .decimation import plot_decimated
+from .plotting import render_html, trace_figures, trace_sources
+from .results_io import read_result_frame
 
 
 # ---------------------------------------------------------------------------
@@ -38,8 +40,8 @@ def mpl_options_figure(data: dict) -> Figure:
         fig = Figure(figsize=(12, 12), tight_layout=True)
         for i, (title, adj) in enumerate(zip(_OPTION_TITLES_SINGLE, adjs)):
             ax = fig.add_subplot(4, 1, i + 1)
-            ax.plot(t, smooth_465, color="green", linewidth=0.6, label="465nm")
-            ax.plot(t, adj, color="red", linewidth=0.6, alpha=0.7, label="fitted control")
+            plot_decimated(ax, t, smooth_465, color="green", linewidth=0.6, label="465nm")
+            plot_decimated(ax, t, adj, color="red", linewidth=0.6, alpha=0.7, label="fitted control")
             ax.set_title(title, fontsize=9)
             ax.set_ylabel("RFU")
             if i == 3:
@@ -56,14 +58,14 @@ def mpl_options_figure(data: dict) -> Figure:
     fig = Figure(figsize=(12, 12), tight_layout=True)
     for i, (title, key) in enumerate(zip(titles, adj_keys)):
         ax = fig.add_subplot(4, 1, i + 1)
-        ax.plot(t, p470["target_smooth"], color="green", linewidth=0.6,
-                alpha=0.8, label="470nm")
-        ax.plot(t, p470[key], color="green", linewidth=0.6, alpha=0.3,
-                linestyle="--", label="470 fitted")
-        ax.plot(t, p560["target_smooth"], color="red", linewidth=0.6,
-                alpha=0.8, label="560nm")
-        ax.plot(t, p560[key], color="red", linewidth=0.6, alpha=0.3,
-                linestyle="--", label="560 fitted")
+        plot_decimated(ax, t, p470["target_smooth"], color="green", linewidth=0.6,
+                       alpha=0.8, label="470nm")
+        plot_decimated(ax, t, p470[key], color="green", linewidth=0.6, alpha=0.3,
+                       linestyle="--", label="470 fitted")
+        plot_decimated(ax, t, p560["target_smooth"], color="red", linewidth=0.6,
+                       alpha=0.8, label="560nm")
+        plot_decimated(ax, t, p560[key], color="red", linewidth=0.6, alpha=0.3,
+                       linestyle="--", label="560 fitted")
         ax.set_title(title, fontsize=9)
         ax.set_ylabel("RFU")
         if i == 3:
@@ -73,12 +75,11 @@ def mpl_options_figure(data: dict) -> Figure:
 
 
 def mpl_results_figure(csv_path: str) -> Figure:
-    """Read a DFer output CSV and return a matplotlib Figure with dF/F and Z-score.
+    """Read a DFer output (bundle or CSV) and return a matplotlib Figure with dF/F and Z-score.
 
     Handles both single-channel and dual-channel output files.
     """
-    df = pd.read_csv(csv_path, index_col=False)
-    df.columns = [str(c).strip().lstrip("#").strip() for c in df.columns]
+    df = read_result_frame(csv_path, mmap=False)
     t_min = df["t_min"].to_numpy(dtype=float)
 
     is_dual = "dFoF_470" in df.columns
@@ -92,15 +93,15 @@ def mpl_results_figure(csv_path: str) -> Figure:
         z_560 = df["Z_560"].to_numpy(dtype=float)
 
         ax1 = fig.add_subplot(2, 1, 1)
-        ax1.plot(t_min, dfof_470, color="green", linewidth=0.6, label="470nm dF/F")
-        ax1.plot(t_min, dfof_560, color="red", linewidth=0.6, label="560nm dF/F")
+        plot_decimated(ax1, t_min, dfof_470, color="green", linewidth=0.6, label="470nm dF/F")
+        plot_decimated(ax1, t_min, dfof_560, color="red", linewidth=0.6, label="560nm dF/F")
         ax1.set_ylabel("dF/F")
         ax1.set_title("dF/F")
         ax1.legend(fontsize=8, loc="upper right")
 
         ax2 = fig.add_subplot(2, 1, 2)
-        ax2.plot(t_min, z_470, color="green", linewidth=0.6, label="470nm Z")
-        ax2.plot(t_min, z_560, color="red", linewidth=0.6, label="560nm Z")
+        plot_decimated(ax2, t_min, z_470, color="green", linewidth=0.6, label="470nm Z")
+        plot_decimated(ax2, t_min, z_560, color="red", linewidth=0.6, label="560nm Z")
         ax2.set_xlabel("Time (min)")
         ax2.set_ylabel("Z-score")
         ax2.set_title("Z-score")
@@ -112,15 +113,15 @@ def mpl_results_figure(csv_path: str) -> Figure:
         z_465 = df["Z_465"].to_numpy(dtype=float)
 
         ax1 = fig.add_subplot(2, 1, 1)
-        ax1.plot(t_min, dfof_405, color="purple", linewidth=0.6, label="405nm dF/F")
-        ax1.plot(t_min, dfof_465, color="green", linewidth=0.6, label="465nm dF/F")
+        plot_decimated(ax1, t_min, dfof_405, color="purple", linewidth=0.6, label="405nm dF/F")
+        plot_decimated(ax1, t_min, dfof_465, color="green", linewidth=0.6, label="465nm dF/F")
         ax1.set_ylabel("dF/F")
         ax1.set_title("dF/F")
         ax1.legend(fontsize=8, loc="upper right")
 
         ax2 = fig.add_subplot(2, 1, 2)
-        ax2.plot(t_min, z_405, color="purple", linewidth=0.6, label="405nm Z")
-        ax2.plot(t_min, z_465, color="green", linewidth=0.6, label="465nm Z")
+        plot_decimated(ax2, t_min, z_405, color="purple", linewidth=0.6, label="405nm Z")
+        plot_decimated(ax2, t_min, z_465, color="green", linewidth=0.6, label="465nm Z")
         ax2.set_xlabel("Time (min)")
         ax2.set_ylabel("Z-score")
         ax2.set_title("Z-score")
@@ -131,8 +132,7 @@ def mpl_results_figure(csv_path: str) -> Figure:
 
 def mpl_pfer_figure(dfer_csv: str, stats_csv: str) -> Figure:
     """Return a matplotlib Figure showing the dF/F trace with detected peaks."""
-    dfer_df = pd.read_csv(dfer_csv, index_col=False)
-    dfer_df.columns = [str(c).strip().lstrip("#").strip() for c in dfer_df.columns]
+    dfer_df = read_result_frame(dfer_csv, mmap=False)
     t_min = dfer_df["t_min"].to_numpy(dtype=float)
     is_dual = "dFoF_470" in dfer_df.columns
 
@@ -154,7 +154,7 @@ def mpl_pfer_figure(dfer_csv: str, stats_csv: str) -> Figure:
     ax = fig.add_subplot(1, 1, 1)
 
     if trace is not None:
-        ax.plot(t_min, trace, color=color, linewidth=0.6, label=label)
+        plot_decimated(ax, t_min, trace, color=color, linewidth=0.6, label=label)
 
     if "peak_time_min" in stats_df.columns and "peak_amplitude" in stats_df.columns:
         peak_t = stats_df["peak_time_min"].to_numpy(dtype=float)
@@ -175,18 +175,16 @@ def mpl_pfer_figure(dfer_csv: str, stats_csv: str) -> Figure:
 # Bokeh HTML figures (optional — kept for CLI / batch use)
 # ---------------------------------------------------------------------------
 
-def _set_axis_labels(plot, x_label: str, y_label: str) -> None:
-    plot.xaxis.axis_label = x_label
-    plot.yaxis.axis_label = y_label
-
-
 def render_single_preview(filename: str, acquisition_sec: np.ndarray, y405: np.ndarray, y465: np.ndarray) -> None:
-    from bokeh.plotting import figure  # lazy
-    p_raw = figure(width=1000, height=400, title=filename + "   465 vs 405 raw data")
-    _set_axis_labels(p_raw, "Acquisition time (seconds)", "RFU")
-    p_raw.line(acquisition_sec, y405, line_color="red", line_width=0.6)
-    p_raw.line(acquisition_sec, y465, line_color="green", line_width=0.6)
-    render_html(p_raw, "DFer_raw.html", title=filename, open_in_browser=True)
+    from bokeh.layouts import column  # lazy
+    sources = trace_sources(acquisition_sec, {"y405": y405, "y465": y465}, width=1000)
+    overview, detail = trace_figures(
+        filename + "   465 vs 405 raw data", sources,
+        {"y405": dict(line_color="red", line_width=0.6),
+         "y465": dict(line_color="green", line_width=0.6)},
+        "Acquisition time (seconds)", "RFU", width=1000, height=400,
+    )
+    render_html(column(overview, detail), "DFer_raw.html", title=filename, open_in_browser=True)
 
 
 def render_single_option_plots(
@@ -199,32 +197,26 @@ def render_single_option_plots(
     smooth_adj_4: np.ndarray,
 ) -> None:
     from bokeh.layouts import column  # lazy
-    from bokeh.plotting import figure  # lazy
-
-    p1 = figure(width=1100, height=400, title=filename +
-                "     Option 1: Good noise correction and bleach correction")
-    _set_axis_labels(p1, "Time(min)", "RFU")
-    p1.line(t_min, smooth_465, line_color="green", line_width=0.6)
-    p1.line(t_min, smooth_adj_1, line_color="red", line_width=0.6)
 
-    p2 = figure(width=1100, height=400, title=filename +
-                "     Option 2: Assumes that shifts in 465 baseline are independent of activity.")
-    _set_axis_labels(p2, "Time(min)", "RFU")
-    p2.line(t_min, smooth_465, line_color="green", line_width=0.6)
-    p2.line(t_min, smooth_adj_2, line_color="red", line_width=0.6)
-
-    p3 = figure(width=1100, height=400, title=filename + "     Option 3: No noise correction")
-    _set_axis_labels(p3, "Time(min)", "RFU")
-    p3.line(t_min, smooth_465, line_color="green", line_width=0.6)
-    p3.line(t_min, smooth_adj_3, line_color="red", line_width=0.6)
-
-    p4 = figure(width=1100, height=400, title=filename +
-                "     Option 4: No noise correction. No activity-dependent baseline correction")
-    _set_axis_labels(p4, "Time(min)", "RFU")
-    p4.line(t_min, smooth_465, line_color="green", line_width=0.6)
-    p4.line(t_min, smooth_adj_4, line_color="red", line_width=0.6)
-
-    render_html(column(p1, p2, p3, p4), "DFer_options.html", title=filename, open_in_browser=True)
+    adjs = [smooth_adj_1, smooth_adj_2, smooth_adj_3, smooth_adj_4]
+    sources = trace_sources(
+        t_min, {"smooth_465": smooth_465, **{f"adj{i + 1}": adj for i, adj in enumerate(adjs)}}, width=1100)
+    titles = [
+        "Option 1: Good noise correction and bleach correction",
+        "Option 2: Assumes that shifts in 465 baseline are independent of activity.",
+        "Option 3: No noise correction",
+        "Option 4: No noise correction. No activity-dependent baseline correction",
+    ]
+    figures = []
+    for i, title in enumerate(titles):
+        figures.extend(trace_figures(
+            filename + "     " + title, sources,
+            {"smooth_465": dict(line_color="green", line_width=0.6),
+             f"adj{i + 1}": dict(line_color="red", line_width=0.6)},
+            "Time(min)", "RFU", width=1100, height=400,
+        ))
+
+    render_html(column(*figures), "DFer_options.html", title=filename, open_in_browser=True)
 
 
 def render_single_results(
@@ -236,31 +228,37 @@ def render_single_results(
     z_465: np.ndarray,
 ) -> None:
     from bokeh.layouts import column  # lazy
-    from bokeh.plotting import figure  # lazy
-
-    p_df = figure(width=1000, height=400, title=filename + "   DF/F")
-    _set_axis_labels(p_df, "Time(min)", "DF/F")
-    p_df.line(t_min, dfof_405, line_color="purple", line_width=0.6)
-    p_df.line(t_min, dfof_465, line_color="green", line_width=0.6)
 
-    p_z = figure(width=1000, height=400, title=filename + "   Z-score")
-    _set_axis_labels(p_z, "Time(min)", "Z")
-    p_z.line(t_min, z_405, line_color="purple", line_width=0.6)
-    p_z.line(t_min, z_465, line_color="green", line_width=0.6)
+    sources = trace_sources(
+        t_min, {"dfof_405": dfof_405, "dfof_465": dfof_465, "z_405": z_405, "z_465": z_465}, width=1000)
+    p_df = trace_figures(
+        filename + "   DF/F", sources,
+        {"dfof_405": dict(line_color="purple", line_width=0.6),
+         "dfof_465": dict(line_color="green", line_width=0.6)},
+        "Time(min)", "DF/F", width=1000, height=400,
+    )
+    p_z = trace_figures(
+        filename + "   Z-score", sources,
+        {"z_405": dict(line_color="purple", line_width=0.6),
+         "z_465": dict(line_color="green", line_width=0.6)},
+        "Time(min)", "Z", width=1000, height=400,
+    )
 
-    render_html(column(p_df, p_z), "DFer_results.html", title=filename, open_in_browser=True)
+    render_html(column(*p_df, *p_z), "DFer_results.html", title=filename, open_in_browser=True)
 
 
 def render_dual_preview(filename: str, t_ms: np.ndarray, y410: np.ndarray, y470: np.ndarray, y560: np.ndarray) -> None:
-    from bokeh.plotting import figure  # lazy
+    from bokeh.layouts import column  # lazy
     t_sec = t_ms / 1000.0
-    p_raw = figure(width=1100, height=420, title=filename + "   RAW (dual)")
-    _set_axis_labels(p_raw, "Time (sec)", "RFU")
-    p_raw.line(t_sec, y410, line_color="gray", line_width=0.6, line_alpha=0.55, legend_label="410 (control)")
-    p_raw.line(t_sec, y470, line_color="green", line_width=0.6, line_alpha=0.75, legend_label="470")
-    p_raw.line(t_sec, y560, line_color="red", line_width=0.6, line_alpha=0.75, legend_label="560")
-    p_raw.legend.click_policy = "hide"
-    render_html(p_raw, "Dual_raw.html", title=filename, open_in_browser=True)
+    sources = trace_sources(t_sec, {"y410": y410, "y470": y470, "y560": y560}, width=1100)
+    overview, detail = trace_figures(
+        filename + "   RAW (dual)", sources,
+        {"y410": dict(line_color="gray", line_width=0.6, line_alpha=0.55, legend_label="410 (control)"),
+         "y470": dict(line_color="green", line_width=0.6, line_alpha=0.75, legend_label="470"),
+         "y560": dict(line_color="red", line_width=0.6, line_alpha=0.75, legend_label="560")},
+        "Time (sec)", "RFU", width=1100, height=420,
+    )
+    render_html(column(overview, detail), "Dual_raw.html", title=filename, open_in_browser=True)
 
 
 def render_dual_option_plots(
@@ -270,23 +268,29 @@ def render_dual_option_plots(
     p560: dict[str, np.ndarray],
 ) -> None:
     from bokeh.layouts import column  # lazy
-    from bokeh.plotting import figure  # lazy
-
-    def _build(option_number, key470, key560):
-        p = figure(width=1200, height=420, title=filename + f"   Option {option_number} (dual)")
-        _set_axis_labels(p, "Time(min)", "RFU")
-        p.line(t_min, p470["target_smooth"], line_color="green", line_width=0.6, line_alpha=0.75, legend_label="470 (smooth)")
-        p.line(t_min, p470[key470], line_color="green", line_width=0.6, line_alpha=0.30, legend_label="470 fitted-control")
-        p.line(t_min, p560["target_smooth"], line_color="red", line_width=0.6, line_alpha=0.75, legend_label="560 (smooth)")
-        p.line(t_min, p560[key560], line_color="red", line_width=0.6, line_alpha=0.30, legend_label="560 fitted-control")
-        p.legend.click_policy = "hide"
-        return p
-
-    render_html(
-        column(_build("1", "adj1", "adj1"), _build("2", "adj2", "adj2"),
-               _build("3", "adj3", "adj3"), _build("4", "adj4", "adj4")),
-        "Dual_options.html", title=filename, open_in_browser=True,
-    )
+
+    keys = ["target_smooth", "adj1", "adj2", "adj3", "adj4"]
+    sources = trace_sources(
+        t_min, {**{f"470_{key}": p470[key] for key in keys}, **{f"560_{key}": p560[key] for key in keys}},
+        width=1200)
+
+    figures = []
+    for option_number in range(1, 5):
+        key = f"adj{option_number}"
+        figures.extend(trace_figures(
+            filename + f"   Option {option_number} (dual)", sources,
+            {"470_target_smooth": dict(line_color="green", line_width=0.6, line_alpha=0.75,
+                                       legend_label="470 (smooth)"),
+             f"470_{key}": dict(line_color="green", line_width=0.6, line_alpha=0.30,
+                                legend_label="470 fitted-control"),
+             "560_target_smooth": dict(line_color="red", line_width=0.6, line_alpha=0.75,
+                                       legend_label="560 (smooth)"),
+             f"560_{key}": dict(line_color="red", line_width=0.6, line_alpha=0.30,
+                                legend_label="560 fitted-control")},
+            "Time(min)", "RFU", width=1200, height=420,
+        ))
+
+    render_html(column(*figures), "Dual_options.html", title=filename, open_in_browser=True)
 
 
 def render_dual_results(
@@ -298,18 +302,20 @@ def render_dual_results(
     z_560: np.ndarray,
 ) -> None:
     from bokeh.layouts import column  # lazy
-    from bokeh.plotting import figure  # lazy
-
-    p_df = figure(width=1100, height=420, title=filename + "   DF/F (dual)")
-    _set_axis_labels(p_df, "Time(min)", "DF/F")
-    p_df.line(t_min, dfof_470, line_color="green", line_width=0.6, line_alpha=0.85, legend_label="470 dF/F")
-    p_df.line(t_min, dfof_560, line_color="red", line_width=0.6, line_alpha=0.85, legend_label="560 dF/F")
-    p_df.legend.click_policy = "hide"
 
-    p_z = figure(width=1100, height=420, title=filename + "   Z-score (dual)")
-    _set_axis_labels(p_z, "Time(min)", "Z")
-    p_z.line(t_min, z_470, line_color="green", line_width=0.6, line_alpha=0.85, legend_label="470 Z")
-    p_z.line(t_min, z_560, line_color="red", line_width=0.6, line_alpha=0.85, legend_label="560 Z")
-    p_z.legend.click_policy = "hide"
+    sources = trace_sources(
+        t_min, {"dfof_470": dfof_470, "dfof_560": dfof_560, "z_470": z_470, "z_560": z_560}, width=1100)
+    p_df = trace_figures(
+        filename + "   DF/F (dual)", sources,
+        {"dfof_470": dict(line_color="green", line_width=0.6, line_alpha=0.85, legend_label="470 dF/F"),
+         "dfof_560": dict(line_color="red", line_width=0.6, line_alpha=0.85, legend_label="560 dF/F")},
+        "Time(min)", "DF/F", width=1100, height=420,
+    )
+    p_z = trace_figures(
+        filename + "   Z-score (dual)", sources,
+        {"z_470": dict(line_color="green", line_width=0.6, line_alpha=0.85, legend_label="470 Z"),
+         "z_560": dict(line_color="red", line_width=0.6, line_alpha=0.85, legend_label="560 Z")},
+        "Time(min)", "Z", width=1100, height=420,
+    )
 
-    render_html(column(p_df, p_z), "Dual_results.html", title=filename, open_in_browser=True)
+    render_html(column(*p_df, *p_z), "Dual_results.html", title=filename, open_in_browser=True)
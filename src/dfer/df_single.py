@@ -1,22 +1,13 @@
 from __future__ import annotations
 
 import logging
-import time
-from pathlib import Path
 
 import numpy as np
-import pandas as pd
 
 from .df_common import (
-    BUTTER_CUTOFF,
-    BUTTER_ORDER,
-    SAVGOL_COARSE,
-    SAVGOL_FINE,
-    butter_lowpass_filter,
-    compute_adjusted_baselines,
+    SINGLE_OUTPUT_COLUMNS,
     expected_analysis_output_path,
-    safe_savgol,
-    validate_single_df,
+    filter_bank,
     window_slice,
 )
 from .df_plots import (
@@ -24,98 +15,107 @@ from .df_plots import (
     render_single_preview,
     render_single_results,
 )
+from .progress import DFER_STAGES, StageProgress
+from .recording import PhotometryRecording
+from .output_writer import write_csv_async
+from .results_io import remove_result_bundle, write_result_bundle
 
 logger = logging.getLogger(__name__)
 
 
 def compute_single_options(
-    selectedfile: str | Path,
+    recording: PhotometryRecording,
     w_start: str,
     w_end: str,
+    stages: StageProgress | None = None,
 ) -> dict:
     """Compute the four DFer option traces for a single-channel file.
 
     Returns a dict with numpy arrays for inline display (no file I/O, no plots).
+    The dict also carries the windowed raw traces, the scaled control fit and
+    the recording fingerprint so ``run_single_analysis`` can reuse it. Traces
+    are stored at the recording's precision; ``t_min`` is always float64.
     """
-    selectedfile = str(Path(selectedfile).expanduser().resolve())
-    df = pd.read_csv(selectedfile, index_col=False, low_memory=False)
-    validate_single_df(df)
-
-    y405 = df["405nm"][1:].to_numpy(dtype=float)
-    y465_col = "465nm" if "465nm" in df.columns else "490nm"
-    y465 = df[y465_col][1:].to_numpy(dtype=float)
-    t_vec = df["#time(seconds)"][1:].to_numpy(dtype=float)
+    y405 = recording.channels["405"]
+    y465 = recording.channels["465"]
+    t_vec = recording.time
 
     dt_sec = float(np.median(np.diff(t_vec)))
     fs = 1.0 / dt_sec
-    sl, _, _ = window_slice(len(t_vec), dt_sec, w_start, w_end)
+    sl, win_start, win_end = window_slice(len(t_vec), dt_sec, w_start, w_end)
 
-    y405 = np.asarray(y405[sl], dtype=float)
-    y465 = np.asarray(y465[sl], dtype=float)
+    y405 = np.asarray(y405[sl])
+    y465 = np.asarray(y465[sl])
     t_min = np.asarray(t_vec[sl], dtype=float) / 60.0
 
-    adj1, adj2, _, _ = compute_adjusted_baselines(y405, y465)
-    filter_adj1 = butter_lowpass_filter(adj1, BUTTER_CUTOFF, fs, BUTTER_ORDER)
-    filter_adj2 = butter_lowpass_filter(adj2, BUTTER_CUTOFF, fs, BUTTER_ORDER)
-    filter_465 = butter_lowpass_filter(y465, BUTTER_CUTOFF, fs, BUTTER_ORDER)
+    bank = filter_bank(y405, y465[None, :], fs, dtype=y405.dtype,
+                       stage=stages.stage if stages is not None else None)
 
     return {
         "file_type": "single",
-        "filename": Path(selectedfile).name,
-        "signal_label": y465_col,
+        "filename": recording.filename,
+        "signal_label": recording.signal_label,
+        "fingerprint": recording.key,
+        "precision": recording.precision,
+        "w_start": w_start,
+        "w_end": w_end,
+        "win_start": win_start,
+        "win_end": win_end,
         "t_min": t_min,
-        "smooth_465": safe_savgol(filter_465, *SAVGOL_FINE),
-        "smooth_adj_1": safe_savgol(filter_adj1, *SAVGOL_FINE),
-        "smooth_adj_2": safe_savgol(filter_adj2, *SAVGOL_FINE),
-        "smooth_adj_3": safe_savgol(filter_adj1, *SAVGOL_COARSE),
-        "smooth_adj_4": safe_savgol(filter_adj2, *SAVGOL_COARSE),
+        "y405": y405,
+        "y465": y465,
+        "scaled_quad": bank["scaled_quad"][0],
+        "smooth_465": bank["target_smooth"][0],
+        "smooth_adj_1": bank["adj1"][0],
+        "smooth_adj_2": bank["adj2"][0],
+        "smooth_adj_3": bank["adj3"][0],
+        "smooth_adj_4": bank["adj4"][0],
     }
 
 
 def run_single_analysis(
-    selectedfile: str | Path,
-    filename: str,
+    recording: PhotometryRecording,
     w_start: str,
     w_end: str,
     analysis_path: str,
     do_preview_plots: bool,
     do_final_plots: bool,
     mode: str,
+    options: dict | None = None,
+    binary_output: bool = False,
+    stages: StageProgress | None = None,
 ) -> str:
-    """Run the single-photometry DFer workflow."""
-    df = pd.read_csv(selectedfile, index_col=False, low_memory=False)
-    validate_single_df(df)
-    logger.info("Begin analysing %s", filename)
+    """Run the single-photometry DFer workflow.
 
-    y405 = df["405nm"][1:].to_numpy(dtype=float)
-    y465_col = "465nm" if "465nm" in df.columns else "490nm"
-    y465 = df[y465_col][1:].to_numpy(dtype=float)
-    t_vec = df["#time(seconds)"][1:].to_numpy(dtype=float)
+    ``options`` is a ``compute_single_options`` result for the same recording
+    and window; when given, only the dF/F, Z-score and write steps run.
+    ``binary_output`` also writes the memory-mappable result bundle.
+    ``stages`` reports progress and checks for cancellation between stages.
+    """
+    stages = stages or StageProgress(DFER_STAGES)
+    filename = recording.filename
+    logger.info("Begin analysing %s", filename)
 
     if do_preview_plots:
-        render_single_preview(filename, t_vec, y405, y465)
-
-    dt_sec = float(np.median(np.diff(t_vec)))
-    fs = 1.0 / dt_sec
-    sl, win_start, win_end = window_slice(len(t_vec), dt_sec, w_start, w_end)
-
-    y405 = np.asarray(y405[sl], dtype=float)
-    y465 = np.asarray(y465[sl], dtype=float)
-    t_sec = np.asarray(t_vec[sl], dtype=float)
-    t_min = t_sec / 60.0
-
-    logger.info("Samples %s to %s processed", win_start, win_end)
-
-    adj1, adj2, _, scaled_quad = compute_adjusted_baselines(y405, y465)
-    filter_adj1 = butter_lowpass_filter(adj1, BUTTER_CUTOFF, fs, BUTTER_ORDER)
-    filter_adj2 = butter_lowpass_filter(adj2, BUTTER_CUTOFF, fs, BUTTER_ORDER)
-    filter_465 = butter_lowpass_filter(y465, BUTTER_CUTOFF, fs, BUTTER_ORDER)
-
-    smooth_adj_1 = safe_savgol(filter_adj1, *SAVGOL_FINE)
-    smooth_adj_2 = safe_savgol(filter_adj2, *SAVGOL_FINE)
-    smooth_adj_3 = safe_savgol(filter_adj1, *SAVGOL_COARSE)
-    smooth_adj_4 = safe_savgol(filter_adj2, *SAVGOL_COARSE)
-    smooth_465 = safe_savgol(filter_465, *SAVGOL_FINE)
+        render_single_preview(filename, recording.time,
+                              recording.channels["405"], recording.channels["465"])
+
+    if options is None:
+        options = compute_single_options(recording, w_start, w_end, stages)
+    else:
+        logger.info("Reusing option traces from preview")
+
+    logger.info("Samples %s to %s processed", options["win_start"], options["win_end"])
+
+    t_min = options["t_min"]
+    y405 = options["y405"]
+    y465 = options["y465"]
+    scaled_quad = options["scaled_quad"]
+    smooth_465 = options["smooth_465"]
+    smooth_adj_1 = options["smooth_adj_1"]
+    smooth_adj_2 = options["smooth_adj_2"]
+    smooth_adj_3 = options["smooth_adj_3"]
+    smooth_adj_4 = options["smooth_adj_4"]
 
     if do_preview_plots:
         render_single_option_plots(
@@ -132,29 +132,37 @@ def run_single_analysis(
     if analysis_path not in smooth_adj_map:
         raise ValueError("analysis_path must be '1','2','3','4'")
 
+    stages.stage("dfof")
+
     smooth_adjusted_405 = smooth_adj_map[analysis_path]
     dfof_465 = (smooth_465 - smooth_adjusted_405) / smooth_adjusted_405
     dfof_405 = (dfof_adj_for_405[analysis_path] - scaled_quad) / scaled_quad
 
-    mu465, sigma465 = float(np.mean(dfof_465)), float(np.std(dfof_465))
-    mu405, sigma405 = float(np.mean(dfof_405)), float(np.std(dfof_405))
+    mu465, sigma465 = float(np.mean(dfof_465, dtype=np.float64)), float(np.std(dfof_465, dtype=np.float64))
+    mu405, sigma405 = float(np.mean(dfof_405, dtype=np.float64)), float(np.std(dfof_405, dtype=np.float64))
     z_465 = (dfof_465 - mu465) / sigma465
     z_405 = (dfof_405 - mu405) / sigma405
 
-    out_file_path = str(expected_analysis_output_path(selectedfile, file_type="single"))
-    np.savetxt(
-        out_file_path,
-        np.c_[t_min, y405, y465, smooth_465, smooth_adjusted_405,
-              dfof_405, z_405, dfof_465, z_465],
-        delimiter=",",
-        header="t_min,405,465,filtered_465,fitted_405,dFoF_405,Z_405,dFoF_465,Z_465",
-        fmt="%f",
-    )
+    out_file_path = str(expected_analysis_output_path(recording.path, file_type="single"))
+    result = np.c_[t_min, y405, y465, smooth_465, smooth_adjusted_405,
+                   dfof_405, z_405, dfof_465, z_465]
+    stages.stage("write")
+    # The CSV is formatted on a writer thread while the final plots render.
+    csv_written = write_csv_async(out_file_path, result, SINGLE_OUTPUT_COLUMNS,
+                                  cancel=stages.cancel)
 
     if do_final_plots:
+        stages.stage("plot")
         render_single_results(filename, t_min, dfof_405, dfof_465, z_405, z_465)
 
+    csv_written.result()
+    # Written after the CSV is closed so the bundle records its final size/mtime.
+    if binary_output:
+        write_result_bundle(out_file_path, result, SINGLE_OUTPUT_COLUMNS)
+    else:
+        remove_result_bundle(out_file_path)
+    stages.done()
+
     logger.info("%s analysis complete", filename)
-    time.sleep(1)
     logger.info("Ready for next file")
     return out_file_path
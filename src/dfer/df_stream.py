@@ -0,0 +1,430 @@
+"""Chunked, overlap-aware DFer for recordings larger than memory.
+
+The in-memory workflow holds the whole CSV plus a dozen full-length traces.
+``run_streaming_analysis`` instead reads the raw CSV ``chunk_rows`` rows at a
+time. After a scan of the time column for the row count and the exact
+median sample interval, it makes three bounded-memory passes:
+
+1. Fit the quadratic baselines and channel means over the analysis window
+   with a streaming least-squares update (QR of the stacked Vandermonde rows,
+   which accumulates the same sums as the normal equations without squaring
+   their condition number).
+2. Filter and smooth each block together with enough neighbouring samples
+   for the ``filtfilt`` transient and the Savitzky-Golay half-window to settle,
+   compute dF/F on the block core and spill it to a temporary binary file
+   while accumulating the Z-score mean and variance.
+3. Z-score the spilled blocks and append them to the output CSV.
+
+Results match ``run_analysis`` to well below the ``%f`` precision of the
+output.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import tempfile
+from contextlib import nullcontext
+from collections.abc import Iterator
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import cast
+
+import numpy as np
+import pandas as pd
+from scipy.linalg import solve_triangular
+from scipy.signal import butter
+
+from .df_common import (
+    BUTTER_CUTOFF,
+    BUTTER_ORDER,
+    DUAL_OUTPUT_COLUMNS,
+    SAVGOL_COARSE,
+    SAVGOL_FINE,
+    SINGLE_OUTPUT_COLUMNS,
+    detect_photometry_file_type,
+    expected_analysis_output_path,
+    smooth_bank,
+    validate_dual_df,
+    validate_single_df,
+    window_slice,
+)
+from .output_writer import CsvWriter
+from .progress import STREAMING_DFER_STAGES, StageProgress
+from .results_io import ResultBundleWriter, remove_result_bundle
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_ROWS = 1_000_000
+SETTLE_TOLERANCE = 1e-12  # residual filtfilt edge transient tolerated at a block core
+MAX_DISTINCT_INTERVALS = 100_000
+
+
+@dataclass(frozen=True)
+class _StreamLayout:
+    file_type: str
+    skiprows: int | list[int]
+    columns: list[str]  # time, control, then targets
+    target_names: list[str]
+    output_columns: list[str]
+    time_to_sec: float
+
+
+def _stream_layout(path: str) -> _StreamLayout:
+    file_type, skiprows = detect_photometry_file_type(path)
+    if file_type == "single":
+        head = pd.read_csv(path, nrows=3, index_col=False)
+        validate_single_df(head)
+        signal_label = "465nm" if "465nm" in head.columns else "490nm"
+        return _StreamLayout(
+            file_type="single",
+            skiprows=[1],  # the original DFer drops the first data row
+            columns=["#time(seconds)", "405nm", signal_label],
+            target_names=["465"],
+            output_columns=SINGLE_OUTPUT_COLUMNS,
+            time_to_sec=1.0,
+        )
+
+    head = pd.read_csv(path, nrows=3, skiprows=skiprows, index_col=False)
+    validate_dual_df(head)
+    return _StreamLayout(
+        file_type="dual",
+        skiprows=skiprows,
+        columns=["TimeStamp", "CH1-410", "CH1-470", "CH1-560"],
+        target_names=["470", "560"],
+        output_columns=DUAL_OUTPUT_COLUMNS,
+        time_to_sec=1.0 / 1000.0,
+    )
+
+
+def _iter_chunks(path: str, layout: _StreamLayout, chunk_rows: int) -> Iterator[np.ndarray]:
+    reader = pd.read_csv(
+        path,
+        skiprows=layout.skiprows,
+        usecols=layout.columns,
+        index_col=False,
+        chunksize=chunk_rows,
+    )
+    with reader:
+        for chunk in reader:
+            yield chunk[layout.columns].to_numpy(dtype=float)
+
+
+def _median_from_counts(values: np.ndarray, counts: np.ndarray) -> float:
+    order = np.argsort(values)
+    values, cum = values[order], np.cumsum(counts[order])
+    total = int(cum[-1])
+    lower = values[np.searchsorted(cum, (total - 1) // 2, side="right")]
+    upper = values[np.searchsorted(cum, total // 2, side="right")]
+    return float((lower + upper) / 2.0)
+
+
+def _iter_intervals(path: str, layout: _StreamLayout, chunk_rows: int) -> Iterator[np.ndarray]:
+    time_only = replace(layout, columns=layout.columns[:1])
+    previous = None
+    for chunk in _iter_chunks(path, time_only, chunk_rows):
+        t = chunk[:, 0]
+        if previous is not None:
+            t = np.concatenate([[previous], t])
+        if len(t):
+            previous = float(t[-1])
+        yield np.diff(t)
+
+
+def _ordered_keys(values: np.ndarray) -> np.ndarray:
+    """Map float64 values to uint64 keys with the same ordering."""
+    bits = np.ascontiguousarray(values, dtype=np.float64).view(np.uint64)
+    negative = (bits >> np.uint64(63)).astype(bool)
+    return np.where(negative, ~bits, bits | np.uint64(1 << 63))
+
+
+def _value_from_key(key: int) -> float:
+    bits = key & ~(1 << 63) if key >> 63 else ~key & ((1 << 64) - 1)
+    return float(np.array([bits], dtype=np.uint64).view(np.float64)[0])
+
+
+def _exact_interval_median(path: str, layout: _StreamLayout, chunk_rows: int, total: int) -> float:
+    """Exact median of the sample intervals by a 16-bit radix select (four time-column passes)."""
+    ranks = sorted({(total - 1) // 2, total // 2})
+    prefixes = dict.fromkeys(ranks, 0)
+    remaining = {rank: rank for rank in ranks}
+    for shift in (48, 32, 16, 0):
+        counts = {rank: np.zeros(1 << 16, dtype=np.int64) for rank in ranks}
+        for intervals in _iter_intervals(path, layout, chunk_rows):
+            keys = _ordered_keys(intervals)
+            for rank in ranks:
+                selected = keys
+                if shift < 48:
+                    selected = keys[(keys >> np.uint64(shift + 16)) == np.uint64(prefixes[rank])]
+                digits = ((selected >> np.uint64(shift)) & np.uint64(0xFFFF)).astype(np.intp)
+                counts[rank] += np.bincount(digits, minlength=1 << 16)
+        for rank in ranks:
+            cum = np.cumsum(counts[rank])
+            digit = int(np.searchsorted(cum, remaining[rank], side="right"))
+            remaining[rank] -= int(cum[digit] - counts[rank][digit])
+            prefixes[rank] = (prefixes[rank] << 16) | digit
+    lower, upper = (_value_from_key(prefixes[rank]) for rank in (ranks[0], ranks[-1]))
+    return (lower + upper) / 2.0
+
+
+def _scan_time(path: str, layout: _StreamLayout, chunk_rows: int) -> tuple[int, float]:
+    """Return (row count, median sample interval in seconds) from the time column.
+
+    Interval values are tallied rather than stored, which gives the exact
+    median in one pass when timestamps are quantised (as logger CSVs are).
+    With more than ``MAX_DISTINCT_INTERVALS`` distinct intervals (e.g. float
+    seconds with jitter) the exact median is found by a radix select instead,
+    at the cost of a few more passes over the time column.
+    """
+    tally: dict[float, int] | None = {}
+    n_intervals = 0
+    for intervals in _iter_intervals(path, layout, chunk_rows):
+        n_intervals += len(intervals)
+        if tally is None:
+            continue
+        values, counts = np.unique(intervals, return_counts=True)
+        for value, count in zip(values.tolist(), counts.tolist()):
+            tally[value] = tally.get(value, 0) + count
+        if len(tally) > MAX_DISTINCT_INTERVALS:
+            tally = None
+    length = n_intervals + 1
+    if length < 3:
+        raise ValueError("Photometry CSV must contain at least 3 rows of data.")
+    if tally is None:
+        logger.info("Sample intervals are not quantised; finding their exact median by radix select")
+        dt = _exact_interval_median(path, layout, chunk_rows, n_intervals)
+    else:
+        dt = _median_from_counts(np.fromiter(tally, dtype=float),
+                                 np.fromiter(tally.values(), dtype=np.int64))
+    return length, dt * layout.time_to_sec
+
+
+def settle_samples(fs: float) -> int:
+    """Samples on each side of a block needed for streamed filtering to match one pass.
+
+    Covers the Butterworth ``filtfilt`` start-up transient (decayed to
+    ``SETTLE_TOLERANCE``) plus the widest Savitzky-Golay half-window.
+    """
+    _, a = cast(tuple[np.ndarray, np.ndarray], butter(
+        BUTTER_ORDER, BUTTER_CUTOFF, fs=fs, btype="low", analog=False))
+    pole = float(np.max(np.abs(np.roots(a)))) if len(a) > 1 else 0.0
+    transient = math.ceil(math.log(SETTLE_TOLERANCE) / math.log(pole)) if 0.0 < pole < 1.0 else 0
+    half_window = max(SAVGOL_FINE[0], SAVGOL_COARSE[0]) // 2
+    return transient + 2 * half_window + 1
+
+
+class _StreamingQuadraticFit:
+    """Least-squares quadratic fits of several traces against one sample index.
+
+    Rows are folded in chunk by chunk; only a small triangular factor is kept.
+    The index is scaled by ``scale`` to keep the Vandermonde columns comparable.
+    """
+
+    def __init__(self, n_traces: int, scale: float) -> None:
+        self.scale = float(scale)
+        self._r = np.zeros((0, 3 + n_traces))
+
+    def update(self, idx: np.ndarray, traces: np.ndarray) -> None:
+        u = idx / self.scale
+        rows = np.column_stack([np.ones_like(u), u, u * u, traces])
+        self._r = np.linalg.qr(np.vstack([self._r, rows]), mode="r")
+
+    def coefficients(self) -> np.ndarray:
+        """Return (3, n_traces) coefficients of 1, u and u**2."""
+        return solve_triangular(self._r[:3, :3], self._r[:3, 3:])
+
+    def evaluate(self, coeffs: np.ndarray, idx: np.ndarray) -> np.ndarray:
+        u = idx / self.scale
+        return (coeffs[2][:, None] * u + coeffs[1][:, None]) * u + coeffs[0][:, None]
+
+
+@dataclass
+class _RunningMoments:
+    """Chan et al. pairwise mean/variance accumulator for each output column."""
+
+    count: int
+    mean: np.ndarray
+    m2: np.ndarray
+
+    @classmethod
+    def empty(cls, width: int) -> _RunningMoments:
+        return cls(0, np.zeros(width), np.zeros(width))
+
+    def update(self, block: np.ndarray) -> None:
+        n = block.shape[0]
+        if n == 0:
+            return
+        block_mean = block.mean(axis=0)
+        block_m2 = ((block - block_mean) ** 2).sum(axis=0)
+        total = self.count + n
+        delta = block_mean - self.mean
+        self.mean = self.mean + delta * (n / total)
+        self.m2 = self.m2 + block_m2 + delta * delta * (self.count * n / total)
+        self.count = total
+
+    @property
+    def std(self) -> np.ndarray:
+        return np.sqrt(self.m2 / self.count)
+
+
+def _fit_pass(path, layout, chunk_rows, sl) -> tuple[_StreamingQuadraticFit, np.ndarray, np.ndarray]:
+    """Fit every channel over the window and return (fit, coefficients, scale factors)."""
+    n_channels = len(layout.columns) - 1
+    fit = _StreamingQuadraticFit(n_channels, scale=chunk_rows)
+    sums = np.zeros(n_channels)
+    position = 0
+    for rows in _window_rows(path, layout, chunk_rows, sl):
+        fit.update(np.arange(position, position + len(rows), dtype=float), rows[:, 1:])
+        sums += rows[:, 1:].sum(axis=0)
+        position += len(rows)
+    return fit, fit.coefficients(), sums[1:] / sums[0]
+
+
+def _window_rows(path, layout, chunk_rows, sl) -> Iterator[np.ndarray]:
+    position = 0
+    for chunk in _iter_chunks(path, layout, chunk_rows):
+        lo = max(sl.start - position, 0)
+        hi = min(sl.stop - position, len(chunk))
+        position += len(chunk)
+        if hi > lo:
+            yield chunk[lo:hi]
+        if position >= sl.stop:
+            return
+
+
+def _segments(rows: Iterator[np.ndarray], n_window: int, block_rows: int, pad: int):
+    """Yield (segment_start, core_start, core_stop, segment) over the window.
+
+    Each segment is a block core plus up to ``pad`` neighbouring rows per side.
+    """
+    buffer: np.ndarray | None = None
+    buffer_start = 0
+    core_start = 0
+    for new_rows in rows:
+        buffer = new_rows if buffer is None else np.vstack([buffer, new_rows])
+        buffer_stop = buffer_start + len(buffer)
+        while core_start < n_window:
+            core_stop = min(core_start + block_rows, n_window)
+            segment_start = max(core_start - pad, 0)
+            segment_stop = min(core_stop + pad, n_window)
+            if buffer_stop < segment_stop:
+                break
+            yield (segment_start, core_start, core_stop,
+                   buffer[segment_start - buffer_start:segment_stop - buffer_start])
+            core_start = core_stop
+            drop = max(core_start - pad, 0) - buffer_start
+            buffer = buffer[drop:]
+            buffer_start += drop
+
+
+def run_streaming_analysis(
+    selectedfile: str | Path,
+    w_start: str = "",
+    w_end: str = "",
+    analysis_path: str = "1",
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    binary_output: bool = False,
+    stages: StageProgress | None = None,
+) -> str:
+    """Run DFer on a single or dual CSV without loading the whole recording.
+
+    Writes the same columns as ``run_analysis`` (and the result bundle when
+    ``binary_output`` is set); peak memory is bounded by ``chunk_rows``
+    rather than recording length. No plots are rendered. ``stages`` (built
+    from ``STREAMING_DFER_STAGES``) reports progress per chunk and is checked
+    for cancellation between chunks.
+    """
+    if analysis_path not in {"1", "2", "3", "4"}:
+        raise ValueError("analysis_path must be '1','2','3','4'")
+    chunk_rows = int(chunk_rows)
+    if chunk_rows < 2:
+        raise ValueError("chunk_rows must be at least 2")
+    stages = stages or StageProgress(STREAMING_DFER_STAGES)
+
+    path = str(Path(selectedfile).expanduser().resolve())
+    layout = _stream_layout(path)
+    filename = Path(path).name
+    logger.info("Begin streaming analysis of %s", filename)
+
+    stages.stage("load")
+    length, dt_sec = _scan_time(path, layout, chunk_rows)
+    fs = 1.0 / dt_sec
+    sl, win_start, win_end = window_slice(length, dt_sec, w_start, w_end)
+    n_window = sl.stop - sl.start
+    stages.stage("fit")
+    fit, coeffs, scale_factors = _fit_pass(path, layout, chunk_rows, sl)
+    pad = settle_samples(fs)
+    logger.info("Samples %s to %s processed", win_start, win_end)
+
+    n_columns = len(layout.output_columns)
+    dfof_columns = [i for i, name in enumerate(layout.output_columns) if name.startswith("dFoF_")]
+    out_file_path = expected_analysis_output_path(path, file_type=layout.file_type)
+
+    # Spill to an unnamed temporary file with plain reads/writes; a memmap
+    # would keep every dirty page resident until the run ends.
+    with tempfile.TemporaryFile(dir=out_file_path.parent) as spill:
+        moments = _RunningMoments.empty(len(dfof_columns))
+        rows = _window_rows(path, layout, chunk_rows, sl)
+        for segment_start, core_start, core_stop, segment in _segments(
+                rows, n_window, chunk_rows, pad):
+            stages.stage("dfof", core_start / n_window)
+            block = _dfof_block(segment, segment_start, fit, coeffs, scale_factors,
+                                fs, analysis_path, layout)
+            core = block[core_start - segment_start:core_stop - segment_start]
+            spill.write(np.ascontiguousarray(core).tobytes())
+            moments.update(core[:, dfof_columns])
+
+        mu, sigma = moments.mean, moments.std
+        spill.seek(0)
+        bundle = (ResultBundleWriter(out_file_path, layout.output_columns, n_window)
+                  if binary_output else nullcontext())
+        # The bundle closes after the CSV so its header records the final CSV size/mtime.
+        with bundle, CsvWriter(out_file_path, layout.output_columns) as csv_out:
+            for start in range(0, n_window, chunk_rows):
+                stages.stage("write", start / n_window)
+                count = min(chunk_rows, n_window - start)
+                block = np.fromfile(spill, dtype=float, count=count * n_columns)
+                block = block.reshape(count, n_columns)
+                for column, m, s in zip(dfof_columns, mu, sigma):
+                    block[:, column + 1] = (block[:, column] - m) / s
+                csv_out.write(block)
+                if binary_output:
+                    bundle.write(block)
+    if not binary_output:
+        remove_result_bundle(out_file_path)
+    stages.done()
+
+    logger.info("%s analysis complete", filename)
+    logger.info("Ready for next file")
+    return str(out_file_path)
+
+
+def _dfof_block(segment, segment_start, fit, coeffs, scale_factors, fs, analysis_path, layout):
+    idx = np.arange(segment_start, segment_start + len(segment), dtype=float)
+    control = segment[:, 1]
+    targets = segment[:, 2:].T
+    quads = fit.evaluate(coeffs, idx)
+    control_quad = quads[0]
+    target_quad = quads[1:]
+    scaled_quad = scale_factors[:, None] * control_quad
+    raw_df = (control - control_quad) / control_quad
+    adjusted_2 = target_quad * raw_df + target_quad
+    bank = smooth_bank(control, scale_factors, adjusted_2, targets, fs)
+
+    t_min = (segment[:, 0] * layout.time_to_sec) / 60.0
+    fitted = bank[{"1": "adj1", "2": "adj2", "3": "adj3", "4": "adj4"}[analysis_path]]
+    dfof = (bank["target_smooth"] - fitted) / fitted
+
+    if layout.file_type == "single":
+        control_adj = bank["adj1"] if analysis_path in {"1", "3"} else bank["adj2"]
+        dfof_405 = (control_adj[0] - scaled_quad[0]) / scaled_quad[0]
+        zeros = np.zeros_like(t_min)
+        return np.column_stack([t_min, control, targets[0], bank["target_smooth"][0],
+                                fitted[0], dfof_405, zeros, dfof[0], zeros])
+
+    zeros = np.zeros_like(t_min)
+    return np.column_stack([
+        t_min, control, targets[0], targets[1],
+        bank["target_smooth"][0], fitted[0], dfof[0], zeros,
+        bank["target_smooth"][1], fitted[1], dfof[1], zeros,
+    ])
@@ -1,18 +1,25 @@
 from __future__ import annotations
 
 import logging
-import time
 from collections.abc import Mapping
 from pathlib import Path
 from typing import TypedDict, cast
 
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 from numpy.typing import NDArray
 from scipy.signal import find_peaks
 
 from src import default_dirs
 
+from .df_common import precision_dtype
+from .output_writer import write_csv
+from .plotting import trace_figures, trace_sources
+from .progress import PFER_STAGES, CancelToken, ProgressCallback, StageProgress
+from .result_cache import result_cache
+from .results_io import bundle_paths, fresh_bundle_columns, read_result_frame
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -35,7 +42,7 @@ class PFerResult(TypedDict):
     trough_amp: NDArray[np.float64]
     amplitudes: NDArray[np.float64]
     rise_t: NDArray[np.float64]
-    sigs: list[NDArray[np.float64]]
+    sigs: np.ndarray  # peaks x samples
     waveform_time: NDArray[np.float64] | None
     mean_wave: NDArray[np.float64] | None
     baseline_peak_count: int
@@ -84,27 +91,44 @@ def _fix_jitter(
     if len(peaks_arr) == 0 or len(troughs_arr) == 0:
         return peaks_arr, troughs_arr, prom_arr, width_arr
 
-    peak_id = np.column_stack([peaks_arr, np.ones(len(peaks_arr))])
-    trough_id = np.column_stack([troughs_arr, np.full(len(troughs_arr), 2)])
-    combined = np.vstack([peak_id, trough_id])
-    order = np.argsort(combined[:, 0])
-    types = combined[order, 1].astype(int)
-    jitter = np.where(np.diff(types) == 0)[0]
-
-    for idx in reversed(jitter):
-        del_pos = idx // 2
-        if types[idx] == 2:
-            troughs_arr = np.delete(troughs_arr, del_pos)
-        else:
-            peaks_arr = np.delete(peaks_arr, del_pos)
-            if prom_arr is not None:
-                prom_arr = np.delete(prom_arr, del_pos)
-            if width_arr is not None:
-                width_arr = np.delete(width_arr, del_pos)
+    # Merge both event types in time order and flag each run of same-type
+    # neighbours. As in DFer_v1.4, the event removed for a repeat at merged
+    # position i is the one at position i // 2 of its own array (the slot it
+    # would hold if the sequence alternated from a leading trough).
+    events = np.concatenate([peaks_arr, troughs_arr])
+    is_trough = np.zeros(len(events), dtype=bool)
+    is_trough[len(peaks_arr):] = True
+    types = is_trough[np.argsort(events, kind="stable")]
+    jitter = np.flatnonzero(types[1:] == types[:-1])
+
+    keep_troughs = _keep_mask(len(troughs_arr), jitter[types[jitter]] // 2)
+    keep_peaks = _keep_mask(len(peaks_arr), jitter[~types[jitter]] // 2)
+    troughs_arr = troughs_arr[keep_troughs]
+    peaks_arr = peaks_arr[keep_peaks]
+    if prom_arr is not None:
+        prom_arr = prom_arr[keep_peaks]
+    if width_arr is not None:
+        width_arr = width_arr[keep_peaks]
 
     return peaks_arr, troughs_arr, prom_arr, width_arr
 
 
+def _keep_mask(length: int, positions: np.ndarray) -> np.ndarray:
+    """Keep-mask equivalent to ``np.delete``-ing ``positions`` one by one, highest first.
+
+    Deleting the same position twice removes the next element too, so the
+    i-th smallest position d_i removes element ``i + max(d_j - j for j <= i)``.
+    Deletions that run past the end of the array are dropped.
+    """
+    keep = np.ones(length, dtype=bool)
+    if len(positions):
+        ordered = np.sort(positions)
+        rank = np.arange(len(ordered))
+        removed = rank + np.maximum.accumulate(ordered - rank)
+        keep[removed[removed < length]] = False
+    return keep
+
+
 def _baseline_mask(t_vec: np.ndarray, w_start: str, w_end: str) -> np.ndarray:
     if not w_start:
         return np.ones_like(t_vec, dtype=bool)
@@ -128,44 +152,61 @@ def _waveforms_for_peaks(
     signal_trace: np.ndarray,
     t_vec: np.ndarray,
     peak_times_min: np.ndarray,
-) -> tuple[list[NDArray[np.float64]], NDArray[np.float64] | None, NDArray[np.float64] | None]:
-    peak_indices = np.searchsorted(t_vec, peak_times_min)
-    waveform_len = WAVEFORM_HALF + WAVEFORM_TAIL
+) -> tuple[np.ndarray, NDArray[np.float64] | None, NDArray[np.float64] | None]:
+    """Return (peaks x samples waveforms, waveform time, mean waveform).
 
-    sigs: list[np.ndarray] = []
-    for idx in peak_indices:
-        start = int(idx) - WAVEFORM_HALF
-        end = int(idx) + WAVEFORM_TAIL
-        if start < 0 or end > len(signal_trace):
-            continue
-        waveform = signal_trace[start:end]
-        sigs.append(waveform - waveform.min())
+    Each row is the trace from ``WAVEFORM_HALF`` samples before a peak to
+    ``WAVEFORM_TAIL`` samples after it, shifted so its minimum is 0. Peaks too
+    close to either end are skipped.
+    """
+    waveform_len = WAVEFORM_HALF + WAVEFORM_TAIL
+    starts = np.searchsorted(t_vec, peak_times_min) - WAVEFORM_HALF
+    starts = starts[(starts >= 0) & (starts <= len(signal_trace) - waveform_len)]
+    if len(starts) == 0:
+        return np.empty((0, waveform_len), dtype=signal_trace.dtype), None, None
 
-    if not sigs:
-        return sigs, None, None
+    # One gather from a strided view: the only copy is the result itself.
+    sigs = sliding_window_view(signal_trace, waveform_len)[starts]
+    sigs -= sigs.min(axis=1, keepdims=True)
 
     waveform_time = np.linspace(-0.085, 0.165, num=waveform_len) * 60
-    mean_wave = np.asarray(np.mean(sigs, axis=0), dtype=float)
+    mean_wave = np.asarray(sigs.mean(axis=0), dtype=float)
     return sigs, waveform_time, mean_wave
 
 
-def _find_peak_features(
-    trace: np.ndarray,
-    prominence: float,
-) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+PeakFeatures = tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+def _find_peak_features(trace: np.ndarray, prominence: float) -> PeakFeatures:
+    """Return (peaks, troughs, peak prominences, peak widths, trough prominences)."""
     peaks, raw_peak_props = find_peaks(trace, prominence=prominence, width=0, rel_height=0.5)
-    troughs, _ = find_peaks(-trace, prominence=prominence, width=0, rel_height=0.5)
+    troughs, raw_trough_props = find_peaks(-trace, prominence=prominence)
     peak_props = cast(Mapping[str, np.ndarray], raw_peak_props)
-    peak_prom = np.asarray(peak_props["prominences"], dtype=float)
-    peak_width = np.asarray(peak_props["widths"], dtype=float)
+    trough_props = cast(Mapping[str, np.ndarray], raw_trough_props)
     return (
         np.asarray(peaks, dtype=int),
         np.asarray(troughs, dtype=int),
-        peak_prom,
-        peak_width,
+        np.asarray(peak_props["prominences"], dtype=float),
+        np.asarray(peak_props["widths"], dtype=float),
+        np.asarray(trough_props["prominences"], dtype=float),
     )
 
 
+def _select_prominent(
+    features: PeakFeatures,
+    prominence: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Keep the features ``find_peaks`` would return at a higher ``prominence``.
+
+    Prominences and widths do not depend on the threshold, so filtering
+    candidates found at a lower one gives the same peaks and troughs.
+    """
+    peaks, troughs, peak_prom, peak_width, trough_prom = features
+    keep_peaks = peak_prom >= prominence
+    keep_troughs = trough_prom >= prominence
+    return peaks[keep_peaks], troughs[keep_troughs], peak_prom[keep_peaks], peak_width[keep_peaks]
+
+
 def _apply_peak_mask(
     mask: np.ndarray,
     peaks: np.ndarray,
@@ -203,11 +244,23 @@ def _analyze_signal(
     baseline_trace: np.ndarray,
     prominence: float,
     artifact_threshold: int,
+    features: PeakFeatures | None = None,
+    baseline_features: PeakFeatures | None = None,
 ) -> PFerResult:
+    """Detect and clean up the peaks of one signal.
+
+    ``features``/``baseline_features`` are ``_find_peak_features`` results
+    for the signal and baseline traces at a prominence no higher than
+    ``prominence``; they are computed here when not given.
+    """
     end_t = float(t_vec.max())
 
-    peaks, troughs, peak_prom, peak_width = _find_peak_features(signal_trace, prominence)
-    baseline_peaks, baseline_troughs, _, _ = _find_peak_features(baseline_trace, prominence)
+    if features is None:
+        features = _find_peak_features(signal_trace, prominence)
+    if baseline_features is None:
+        baseline_features = _find_peak_features(baseline_trace, prominence)
+    peaks, troughs, peak_prom, peak_width = _select_prominent(features, prominence)
+    baseline_peaks, baseline_troughs, _, _ = _select_prominent(baseline_features, prominence)
 
     peaks, troughs, peak_prom_opt, peak_width_opt = _fix_jitter(peaks, troughs, peak_prom, peak_width)
     baseline_peaks, baseline_troughs, _, _ = _fix_jitter(baseline_peaks, baseline_troughs)
@@ -307,26 +360,19 @@ def _waveform_output_path(outdir: Path, stem: str, signal_name: str, is_dual: bo
 
 def _export_results(outdir: Path, stem: str, signal_name: str, result: PFerResult, is_dual: bool) -> Path:
     out_path = _stats_output_path(outdir, stem, signal_name, is_dual)
-    np.savetxt(
+    write_csv(
         out_path,
         np.c_[result["peak_min"], result["trough_min"], result["peak_amp"],
               result["trough_amp"], result["amplitudes"], result["rise_t"]],
-        delimiter=",",
-        header="peak_time_min,trough_time_min,peak_amplitude,trough_amplitude,relative_amplitude,rise_time_s",
-        fmt="%f",
+        ["peak_time_min", "trough_time_min", "peak_amplitude", "trough_amplitude",
+         "relative_amplitude", "rise_time_s"],
     )
 
     waveform_time = result["waveform_time"]
     mean_wave = result["mean_wave"]
     if waveform_time is not None and mean_wave is not None:
         wave_path = _waveform_output_path(outdir, stem, signal_name, is_dual)
-        np.savetxt(
-            wave_path,
-            np.c_[waveform_time, mean_wave],
-            delimiter=",",
-            header="time_s,mean_peak_waveform_dFoF",
-            fmt="%f",
-        )
+        write_csv(wave_path, np.c_[waveform_time, mean_wave], ["time_s", "mean_peak_waveform_dFoF"])
 
     return out_path
 
@@ -339,6 +385,7 @@ def _build_bokeh_plots(
     results: dict[str, PFerResult],
 ) -> None:
     from bokeh.layouts import column  # lazy
+    from bokeh.models import ColumnDataSource  # lazy
     from bokeh.plotting import figure, output_file, save  # lazy
 
     figures = []
@@ -356,29 +403,39 @@ def _build_bokeh_plots(
         waveform_time = result["waveform_time"]
         mean_wave = result["mean_wave"]
 
-        p1 = figure(width=1000, height=360,
-                    title=f"{filename}   Detected peaks ({signal_name})")
-        _set_axis_labels(p1, "Time (min)", "dF/F")
-        p1.line(t_vec, trace, line_color=color, line_width=0.6)
+        trace_panes = trace_figures(
+            f"{filename}   Detected peaks ({signal_name})",
+            trace_sources(t_vec, {"trace": trace}, width=1000),
+            {"trace": dict(line_color=color, line_width=0.6)},
+            "Time (min)", "dF/F", width=1000, height=360,
+        )
         if len(peak_min) > 0:
-            p1.inverted_triangle(peak_min, peak_amp, color="red", size=7)
-            p1.triangle(trough_min, trough_amp, color="black", size=7)
-        figures.append(p1)
-
-        p2 = figure(width=1000, height=320,
+            markers = ColumnDataSource({"peak_min": peak_min, "peak_amp": peak_amp,
+                                        "trough_min": trough_min, "trough_amp": trough_amp})
+            for pane in trace_panes:
+                pane.scatter("peak_min", "peak_amp", source=markers, marker="inverted_triangle",
+                             color="red", size=7)
+                pane.scatter("trough_min", "trough_amp", source=markers, marker="triangle",
+                             color="black", size=7)
+        figures.extend(trace_panes)
+
+        p2 = figure(width=1000, height=320, output_backend="webgl",
                     title=f"{filename}   Individual peak waveforms ({signal_name})")
         _set_axis_labels(p2, "Time (sec)", "dF/F")
-        if sigs and waveform_time is not None:
-            wave_xs = [waveform_time.tolist() for _ in sigs]
-            wave_ys = [sig.tolist() for sig in sigs]
-            p2.multi_line(wave_xs, wave_ys, line_color=color, line_width=0.6)
+        if len(sigs) and waveform_time is not None:
+            # One NaN-separated line instead of one glyph per waveform.
+            p2.line("x", "y", line_color=color, line_width=0.6, source=ColumnDataSource({
+                "x": np.tile(np.append(waveform_time, np.nan), len(sigs)),
+                "y": np.column_stack([sigs, np.full(len(sigs), np.nan)]).ravel(),
+            }))
         figures.append(p2)
 
-        p3 = figure(width=1000, height=320,
+        p3 = figure(width=1000, height=320, output_backend="webgl",
                     title=f"{filename}   Average waveform ({signal_name})")
         _set_axis_labels(p3, "Time (sec)", "dF/F")
         if waveform_time is not None and mean_wave is not None:
-            p3.line(waveform_time, mean_wave, line_color=color, line_width=0.6)
+            p3.line("x", "y", line_color=color, line_width=0.6,
+                    source=ColumnDataSource({"x": waveform_time, "y": mean_wave}))
         figures.append(p3)
 
     out_html = Path(default_dirs.processor) / "PFer_results.html"
@@ -387,30 +444,18 @@ def _build_bokeh_plots(
     save(column(*figures))
 
 
-def run_pfer(
-    csv_path: str | Path,
-    w_start: str = "",
-    w_end: str = "",
-    prominence: float = DEFAULT_PROMINENCE,
-    artifact_threshold: int = DEFAULT_ART_THRESHOLD,
-    make_plots: bool = False,
-) -> str:
-    """Run peak-finding (PFer) on a DFer output CSV.
+def _load_pfer_input(
+    csv_path: str,
+    w_start: str,
+    w_end: str,
+    dtype: type,
+) -> tuple[np.ndarray, str, list[dict[str, str]], dict[str, tuple[np.ndarray, np.ndarray]]]:
+    """Read a DFer output and return (t_min, kind, signal specs, traces).
 
-    Single-channel DFer outputs keep the legacy single stats filename.
-    Dual-channel DFer outputs write one stats/waveform pair per signal.
-    Set ``make_plots=True`` only when the optional ``html-plots`` extra is
-    installed; the Qt app renders matplotlib figures inline instead.
+    ``traces`` maps each signal name to its (signal, baseline-window) traces,
+    both shifted so their 2nd percentile is 0.
     """
-    csv_path = str(Path(csv_path).expanduser().resolve())
-    filename = Path(csv_path).name
-    stem = Path(csv_path).stem
-
-    outdir = Path(csv_path).parent
-    outdir.mkdir(parents=True, exist_ok=True)
-
-    df = pd.read_csv(csv_path, index_col=False)
-    df.columns = [str(col).strip().lstrip("#").strip() for col in df.columns]
+    df = read_result_frame(csv_path)
 
     if "t_min" not in df.columns:
         _raise_missing_columns(
@@ -423,21 +468,146 @@ def run_pfer(
     baseline_mask = _baseline_mask(t_vec, w_start, w_end)
     dataset_kind, signal_specs = _signal_specs(df)
 
+    traces: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+    for spec in signal_specs:
+        signal_trace = df[spec["signal_col"]].to_numpy(dtype=dtype)
+        signal_trace = signal_trace - dtype.type(np.percentile(signal_trace, 2))
+
+        baseline_source = df[spec["baseline_col"]].to_numpy(dtype=dtype)
+        baseline_source = baseline_source - dtype.type(np.percentile(baseline_source, 2))
+        traces[spec["name"]] = (signal_trace, baseline_source[baseline_mask])
+    return t_vec, dataset_kind, signal_specs, traces
+
+
+def _suitability_warnings(dataset_kind: str, result: PFerResult) -> tuple[bool, bool]:
+    """Return PFer's two "may not be suitable" flags for one signal.
+
+    Warning 1: fewer peaks than in the baseline window. Warning 2: the mean
+    amplitude is within 15% of the baseline window's. Both are only
+    evaluated for single-channel inputs with peaks in signal and baseline.
+    """
+    peak_count = int(result["peak_count"])
+    baseline_peak_count = int(result["baseline_peak_count"])
+    if dataset_kind != "single" or peak_count == 0 or baseline_peak_count == 0:
+        return False, False
+    amplitudes = result["amplitudes"]
+    baseline_amp_mean = result["baseline_amp_mean"]
+    warning1 = peak_count < baseline_peak_count
+    warning2 = (
+        len(amplitudes) > 0
+        and baseline_amp_mean is not None
+        and (float(np.mean(amplitudes)) * 0.85) < baseline_amp_mean
+    )
+    return warning1, bool(warning2)
+
+
+def _summary_row(
+    signal_name: str,
+    result: PFerResult,
+    warnings: tuple[bool, bool],
+    stats_path: Path,
+) -> dict[str, object]:
+    has_peaks = len(result["amplitudes"]) > 0
+    return {
+        "signal": signal_name,
+        "peak_count": int(result["peak_count"]),
+        "mean_amplitude": float(np.mean(result["amplitudes"])) if has_peaks else np.nan,
+        "mean_rise_time_s": float(np.mean(result["rise_t"])) if has_peaks else np.nan,
+        "baseline_peak_count": int(result["baseline_peak_count"]),
+        "warning1": warnings[0],
+        "warning2": warnings[1],
+        "stats_csv": str(stats_path),
+    }
+
+
+def _run_pfer(
+    csv_path: str | Path,
+    w_start: str,
+    w_end: str,
+    prominence: float,
+    artifact_threshold: int,
+    make_plots: bool,
+    precision: str,
+    progress: ProgressCallback | None,
+    cancel: CancelToken | None,
+    cache: bool = False,
+) -> tuple[str, list[dict[str, object]]]:
+    """Run PFer and return (``run_pfer`` result, one summary row per signal).
+
+    With ``cache=True`` (and no plots) an identical earlier run is restored
+    from the shared result cache instead.
+    """
+    if not cache or make_plots:
+        return _compute_pfer(csv_path, w_start, w_end, prominence, artifact_threshold,
+                             make_plots, precision, progress, cancel)
+
+    csv_path = Path(csv_path).expanduser().resolve()
+    # PFer reads the full-precision bundle while it matches the CSV.
+    inputs = [csv_path]
+    if fresh_bundle_columns(csv_path) is not None:
+        inputs.append(bundle_paths(csv_path)[0])
+    results = result_cache()
+    key = results.key("pfer", inputs, {
+        "w_start": w_start,
+        "w_end": w_end,
+        "prominence": float(prominence),
+        "artifact_threshold": int(artifact_threshold),
+        "precision": precision,
+        "csv": str(csv_path),
+    })
+    restored = results.restore(key)
+    if restored is not None:
+        StageProgress(PFER_STAGES, progress, cancel).done()
+        logger.info("Reused cached PFer result for %s", csv_path.name)
+        out, summary = restored
+        return out, summary
+
+    out, summary = _compute_pfer(csv_path, w_start, w_end, prominence, artifact_threshold,
+                                 make_plots, precision, progress, cancel)
+    outputs = []
+    for row in summary:
+        stats_path = Path(str(row["stats_csv"]))
+        waveform_path = stats_path.with_name(stats_path.name.replace("_Peak_STATS.csv", "_Peak_WAVEFORM.csv"))
+        outputs += [stats_path, waveform_path] if waveform_path.exists() else [stats_path]
+    results.store(key, [out, summary], outputs)
+    return out, summary
+
+
+def _compute_pfer(
+    csv_path: str | Path,
+    w_start: str,
+    w_end: str,
+    prominence: float,
+    artifact_threshold: int,
+    make_plots: bool,
+    precision: str,
+    progress: ProgressCallback | None,
+    cancel: CancelToken | None,
+) -> tuple[str, list[dict[str, object]]]:
+    dtype = precision_dtype(precision)
+    stages = StageProgress(PFER_STAGES, progress, cancel)
+    csv_path = str(Path(csv_path).expanduser().resolve())
+    filename = Path(csv_path).name
+    stem = Path(csv_path).stem
+
+    outdir = Path(csv_path).parent
+    outdir.mkdir(parents=True, exist_ok=True)
+
+    stages.stage("load")
+    t_vec, dataset_kind, signal_specs, inputs = _load_pfer_input(csv_path, w_start, w_end, dtype)
+
     traces: dict[str, np.ndarray] = {}
     results: dict[str, PFerResult] = {}
+    warnings: dict[str, tuple[bool, bool]] = {}
     output_paths: list[Path] = []
 
     logger.info("Begin PFer analysis: %s", filename)
     logger.info("Detected %s PFer input", dataset_kind)
 
-    for spec in signal_specs:
+    for index, spec in enumerate(signal_specs):
+        stages.stage("peaks", index / len(signal_specs))
         signal_name = spec["name"]
-        signal_trace = df[spec["signal_col"]].to_numpy(dtype=float)
-        signal_trace = signal_trace - np.percentile(signal_trace, 2)
-
-        baseline_source = df[spec["baseline_col"]].to_numpy(dtype=float)
-        baseline_source = baseline_source - np.percentile(baseline_source, 2)
-        baseline_trace = baseline_source[baseline_mask]
+        signal_trace, baseline_trace = inputs[signal_name]
 
         logger.info("Cleaning up peaks for channel %s...", signal_name)
         result = _analyze_signal(
@@ -450,7 +620,6 @@ def run_pfer(
 
         traces[signal_name] = signal_trace
         results[signal_name] = result
-        output_paths.append(_export_results(outdir, stem, signal_name, result, is_dual=(dataset_kind == "dual")))
 
         logger.info("Final peak count (%s): %s", signal_name, result["peak_count"])
         amplitudes = result["amplitudes"]
@@ -459,22 +628,134 @@ def run_pfer(
             logger.info("Mean amplitude (%s): %.4f", signal_name, np.mean(amplitudes))
             logger.info("Mean rise time (%s): %.2f s", signal_name, np.mean(rise_t))
 
-        baseline_peak_count = int(result["baseline_peak_count"])
-        baseline_amp_mean = result["baseline_amp_mean"]
-        if dataset_kind == "single" and result["peak_count"] > 0 and baseline_peak_count > 0:
-            if result["peak_count"] < baseline_peak_count:
-                logger.warning("PFer warning 1: data may not be suitable for PFer analysis")
-            if len(amplitudes) > 0 and baseline_amp_mean is not None:
-                if (float(np.mean(amplitudes)) * 0.85) < baseline_amp_mean:
-                    logger.warning("PFer warning 2: data may not be suitable for PFer analysis")
+        warnings[signal_name] = _suitability_warnings(dataset_kind, result)
+        if warnings[signal_name][0]:
+            logger.warning("PFer warning 1: data may not be suitable for PFer analysis")
+        if warnings[signal_name][1]:
+            logger.warning("PFer warning 2: data may not be suitable for PFer analysis")
+
+    for index, spec in enumerate(signal_specs):
+        stages.stage("write", index / len(signal_specs))
+        output_paths.append(_export_results(
+            outdir, stem, spec["name"], results[spec["name"]], is_dual=(dataset_kind == "dual")))
 
     if make_plots:
+        stages.stage("plot")
         _build_bokeh_plots(filename, t_vec, signal_specs, traces, results)
+    stages.done()
 
     logger.info("%s PFer analysis complete", filename)
-    time.sleep(1)
     logger.info("Ready for next file")
 
+    summary = [
+        _summary_row(spec["name"], results[spec["name"]], warnings[spec["name"]], path)
+        for spec, path in zip(signal_specs, output_paths)
+    ]
     if dataset_kind == "single":
-        return str(output_paths[0])
-    return "\n".join(str(path) for path in output_paths)
+        return str(output_paths[0]), summary
+    return "\n".join(str(path) for path in output_paths), summary
+
+
+def run_pfer(
+    csv_path: str | Path,
+    w_start: str = "",
+    w_end: str = "",
+    prominence: float = DEFAULT_PROMINENCE,
+    artifact_threshold: int = DEFAULT_ART_THRESHOLD,
+    make_plots: bool = False,
+    precision: str = "float64",
+    progress: ProgressCallback | None = None,
+    cancel: CancelToken | None = None,
+    cache: bool = False,
+) -> str:
+    """Run peak-finding (PFer) on a DFer output CSV.
+
+    Single-channel DFer outputs keep the legacy single stats filename.
+    Dual-channel DFer outputs write one stats/waveform pair per signal.
+    Set ``make_plots=True`` only when the optional ``html-plots`` extra is
+    installed; the Qt app renders matplotlib figures inline instead.
+    ``precision="float32"`` keeps the dF/F traces in float32; percentiles and
+    time stay float64.
+    ``progress(stage, fraction)`` is called as each stage of ``PFER_STAGES``
+    starts, and ``cancel`` is checked between stages and signals; a
+    cancelled run raises ``AnalysisCancelled``.
+    ``cache=True`` restores the outputs of an identical earlier run from the
+    shared result cache instead of recomputing them (runs with plots are
+    never cached).
+    """
+    out, _ = _run_pfer(csv_path, w_start, w_end, prominence, artifact_threshold,
+                       make_plots, precision, progress, cancel, cache)
+    return out
+
+
+def sweep_prominence(
+    csv_path: str | Path,
+    prominences: list[float],
+    w_start: str = "",
+    w_end: str = "",
+    artifact_threshold: int = DEFAULT_ART_THRESHOLD,
+    write_stats: bool = False,
+    precision: str = "float64",
+) -> pd.DataFrame:
+    """Run PFer on a DFer output CSV at several prominence thresholds.
+
+    The CSV is read once and ``find_peaks`` runs once per trace, at the lowest
+    prominence. Each higher threshold is then derived from the stored
+    prominences, so only the jitter, artifact, amplitude and Z-score
+    clean-up runs per threshold. The results match ``run_pfer`` at each
+    prominence.
+
+    Returns one row per signal and prominence: ``signal``, ``prominence``,
+    ``peak_count``, ``mean_amplitude``, ``mean_rise_time_s`` and
+    ``baseline_peak_count`` (means are NaN without peaks). The table is also
+    saved as ``<stem>_Prominence_SWEEP.csv`` beside the input.
+    ``write_stats=True`` also writes the usual stats/waveform files for every
+    threshold, with ``_prom<value>`` added to the stem; their paths are in a
+    ``stats_csv`` column.
+    """
+    thresholds = sorted({float(value) for value in prominences})
+    if not thresholds or thresholds[0] <= 0:
+        raise ValueError("prominences must be a non-empty list of positive values.")
+    dtype = precision_dtype(precision)
+    csv_path = str(Path(csv_path).expanduser().resolve())
+    stem = Path(csv_path).stem
+    outdir = Path(csv_path).parent
+
+    t_vec, dataset_kind, signal_specs, inputs = _load_pfer_input(csv_path, w_start, w_end, dtype)
+    logger.info("Begin PFer prominence sweep (%s thresholds): %s", len(thresholds), Path(csv_path).name)
+
+    rows: list[dict[str, object]] = []
+    for spec in signal_specs:
+        signal_name = spec["name"]
+        signal_trace, baseline_trace = inputs[signal_name]
+        features = _find_peak_features(signal_trace, thresholds[0])
+        baseline_features = _find_peak_features(baseline_trace, thresholds[0])
+        for prominence in thresholds:
+            result = _analyze_signal(
+                t_vec=t_vec,
+                signal_trace=signal_trace,
+                baseline_trace=baseline_trace,
+                prominence=prominence,
+                artifact_threshold=artifact_threshold,
+                features=features,
+                baseline_features=baseline_features,
+            )
+            has_peaks = len(result["amplitudes"]) > 0
+            row: dict[str, object] = {
+                "signal": signal_name,
+                "prominence": prominence,
+                "peak_count": result["peak_count"],
+                "mean_amplitude": float(np.mean(result["amplitudes"])) if has_peaks else np.nan,
+                "mean_rise_time_s": float(np.mean(result["rise_t"])) if has_peaks else np.nan,
+                "baseline_peak_count": int(result["baseline_peak_count"]),
+            }
+            if write_stats:
+                row["stats_csv"] = str(_export_results(
+                    outdir, f"{stem}_prom{prominence:g}", signal_name, result,
+                    is_dual=(dataset_kind == "dual")))
+            rows.append(row)
+
+    table = pd.DataFrame(rows)
+    table.to_csv(outdir / f"{stem}_Prominence_SWEEP.csv", index=False)
+    logger.info("PFer prominence sweep complete")
+    return table
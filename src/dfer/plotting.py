@@ -4,11 +4,18 @@ import logging
 import os
 import webbrowser
 from pathlib import Path
+from typing import Any
+
+import numpy as np
 
 from src import default_dirs
 
+from .decimation import minmax_indices
+
 logger = logging.getLogger(__name__)
 
+DETAIL_FRACTION = 0.05  # share of the trace shown in a detail pane at first
+
 
 def is_wsl() -> bool:
     """Return True when running under Windows Subsystem for Linux."""
@@ -34,3 +41,64 @@ def render_html(obj, html_name: str, title: str, open_in_browser: bool) -> Path:
 
     logger.info("Saved plot HTML: %s", html_path)
     return html_path
+
+
+def trace_sources(x: np.ndarray, traces: dict[str, np.ndarray], width: int) -> tuple[Any, Any]:
+    """Return (overview, detail) Bokeh ``ColumnDataSource``s for traces sharing ``x``.
+
+    The overview source holds the min/max envelope of every trace at one
+    bin per pixel of ``width``; the detail source holds every sample, with
+    the trace values as float32 (ample for display, half the HTML size).
+    Both have an ``x`` column plus one column per trace name, stored as
+    arrays so Bokeh embeds them as binary buffers rather than JSON lists.
+    """
+    from bokeh.models import ColumnDataSource  # lazy
+
+    x = np.asarray(x)
+    columns = {name: np.asarray(trace) for name, trace in traces.items()}
+    index = minmax_indices(width, *columns.values())
+    overview = ColumnDataSource({"x": x[index], **{name: trace[index] for name, trace in columns.items()}})
+    detail = ColumnDataSource({"x": x, **{name: trace.astype(np.float32) for name, trace in columns.items()}})
+    return overview, detail
+
+
+def trace_figures(
+    title: str,
+    sources: tuple[Any, Any],
+    lines: dict[str, dict[str, Any]],
+    x_label: str,
+    y_label: str,
+    width: int,
+    height: int,
+) -> tuple[Any, Any]:
+    """Return a WebGL (overview, detail) figure pair drawing ``lines`` from ``sources``.
+
+    ``lines`` maps a source column to its ``line`` keyword arguments. The
+    overview shows the decimated envelope of the whole trace with a range
+    tool; dragging it pans/zooms the full-resolution detail pane below.
+    """
+    from bokeh.models import Range1d, RangeTool  # lazy
+    from bokeh.plotting import figure  # lazy
+
+    overview_source, detail_source = sources
+    x = detail_source.data["x"]
+    start, end = (float(x[0]), float(x[-1])) if len(x) else (0.0, 1.0)
+    detail_end = start + (end - start) * DETAIL_FRACTION if end > start else start + 1.0
+
+    overview = figure(width=width, height=height, title=title, output_backend="webgl")
+    detail = figure(width=width, height=height, title=title + "   (full resolution)",
+                    output_backend="webgl", x_range=Range1d(start, detail_end))
+    for plot in (overview, detail):
+        plot.xaxis.axis_label = x_label
+        plot.yaxis.axis_label = y_label
+
+    for name, style in lines.items():
+        overview.line("x", name, source=overview_source, **style)
+        detail_style = {key: value for key, value in style.items() if key != "legend_label"}
+        detail.line("x", name, source=detail_source, **detail_style)
+    if overview.legend:
+        overview.legend.click_policy = "hide"
+
+    range_tool = RangeTool(x_range=detail.x_range)
+    overview.add_tools(range_tool)
+    return overview, detail
@@ -0,0 +1,71 @@
+"""Stage progress reporting and cooperative cancellation for DFer/PFer runs.
+
+Long runs are split into named stages. Before each stage the pipeline checks
+its ``CancelToken`` (raising ``AnalysisCancelled``) and reports
+``progress(stage, fraction)``, where ``fraction`` is the share of the whole
+run already done (0.0-1.0). Both hooks are optional; without them a
+``StageProgress`` does nothing.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Callable, Sequence
+
+ProgressCallback = Callable[[str, float], None]
+
+DFER_STAGES = ("load", "fit", "filter", "smooth", "dfof", "write", "plot")
+STREAMING_DFER_STAGES = ("load", "fit", "dfof", "write")
+PFER_STAGES = ("load", "peaks", "write", "plot")
+
+
+class AnalysisCancelled(Exception):
+    """Raised inside a run whose ``CancelToken`` was cancelled."""
+
+
+class CancelToken:
+    """Thread-safe flag a UI sets to ask a running analysis to stop."""
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise AnalysisCancelled("Analysis cancelled")
+
+
+class StageProgress:
+    """Report the stages of one pipeline run and honour its cancel token."""
+
+    def __init__(
+        self,
+        stages: Sequence[str],
+        progress: ProgressCallback | None = None,
+        cancel: CancelToken | None = None,
+    ) -> None:
+        self.stages = tuple(stages)
+        self.cancel = cancel
+        self._progress = progress
+
+    def check(self) -> None:
+        """Raise ``AnalysisCancelled`` if the run was cancelled."""
+        if self.cancel is not None:
+            self.cancel.raise_if_cancelled()
+
+    def stage(self, name: str, fraction: float = 0.0) -> None:
+        """Enter stage ``name`` (``fraction`` of the way through it)."""
+        self.check()
+        if self._progress is not None:
+            done = self.stages.index(name) + min(max(fraction, 0.0), 1.0)
+            self._progress(name, done / len(self.stages))
+
+    def done(self) -> None:
+        if self._progress is not None:
+            self._progress("done", 1.0)
@@ -0,0 +1,249 @@
+"""Parsed photometry recordings and the process-wide recording cache.
+
+Detection, option previews, the final DFer run and the raw graph all need
+the same validated numeric columns. ``load_recording`` parses a file once
+and keeps the arrays in an LRU cache keyed by (resolved path, mtime, size),
+so later calls for an unchanged file skip ``pd.read_csv`` entirely.
+A miss reads the header once to detect the file type, then parses only the
+time and channel columns, straight to float64.
+Recordings loaded with ``precision="float32"`` keep their channels in
+float32 (time stays float64) and are cached separately from float64 ones.
+"""
+
+from __future__ import annotations
+
+import csv
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .df_common import (
+    DUAL_INPUT_COLUMNS,
+    PRECISIONS,
+    check_dual_columns,
+    check_single_columns,
+    precision_dtype,
+)
+
+DEFAULT_CACHE_BYTES = 1 << 30  # 1 GiB
+
+RecordingKey = tuple[str, int, int]
+_CacheKey = tuple[RecordingKey, str]
+
+
+@dataclass(frozen=True, eq=False)
+class PhotometryRecording:
+    """Validated numeric columns of a raw single or dual photometry CSV.
+
+    ``time`` is in seconds for single files (first data row dropped, as in the
+    original DFer) and in milliseconds for dual files. ``channels`` maps the
+    wavelength names ("405"/"465" or "410"/"470"/"560") to read-only arrays.
+    ``key`` is the (path, mtime, size) fingerprint the arrays were read at.
+    Instances compare and hash by identity; compare ``key`` to check whether
+    two recordings came from the same file state.
+    """
+
+    path: str
+    file_type: str
+    skiprows: int
+    signal_label: str
+    key: RecordingKey
+    time: np.ndarray
+    channels: dict[str, np.ndarray] = field(default_factory=dict)
+
+    @property
+    def filename(self) -> str:
+        return Path(self.path).name
+
+    @property
+    def precision(self) -> str:
+        """Storage precision of the channel arrays ("float64" or "float32")."""
+        return next(iter(self.channels.values())).dtype.name
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.time.nbytes + sum(arr.nbytes for arr in self.channels.values()))
+
+
+def recording_key(path: str | Path) -> RecordingKey:
+    """Return the cache key (resolved path, mtime_ns, size) for ``path``."""
+    resolved = Path(path).expanduser().resolve()
+    stat = resolved.stat()
+    return str(resolved), stat.st_mtime_ns, stat.st_size
+
+
+def _read_only(values, dtype: np.dtype | type = np.float64) -> np.ndarray:
+    arr = np.ascontiguousarray(values, dtype=dtype)
+    arr.setflags(write=False)
+    return arr
+
+
+def sniff_photometry_header(path: str | Path) -> tuple[str, int, list[str]]:
+    """Return (file type, rows before the header, header names) of a raw photometry CSV.
+
+    Single files start with ``#time(seconds)``; dual files with ``TimeStamp``,
+    optionally after one metadata row.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        rows = csv.reader(handle)
+        first = next(rows, [])
+        if first and first[0] == "#time(seconds)":
+            return "single", 0, first
+        if first and first[0] == "TimeStamp":
+            return "dual", 0, first
+        second = next(rows, [])
+        if second and second[0] == "TimeStamp":
+            return "dual", 1, second
+    raise ValueError(
+        "Could not detect file type.\n\n"
+        "Expected first column '#time(seconds)' (single) or 'TimeStamp' (dual).\n"
+        "Dual files may have metadata in row 1 (we try skiprows=1)."
+    )
+
+
+def _read_columns(path: str, skiprows: int | list[int], columns: list[str]) -> pd.DataFrame:
+    return pd.read_csv(
+        path,
+        skiprows=skiprows,
+        usecols=columns,
+        dtype=dict.fromkeys(columns, np.float64),
+        index_col=False,
+    )
+
+
+def _parse_recording(key: RecordingKey, precision: str = "float64") -> PhotometryRecording:
+    path = key[0]
+    dtype = precision_dtype(precision)
+    file_type, skiprows, header = sniff_photometry_header(path)
+    if file_type == "single":
+        signal_label = check_single_columns(header)
+        # The original DFer drops the first data row.
+        df = _read_columns(path, [1], ["#time(seconds)", "405nm", signal_label])
+        if len(df.index) < 2:
+            raise ValueError("Single photometry CSV must contain at least 3 rows of data.")
+        return PhotometryRecording(
+            path=path,
+            file_type="single",
+            skiprows=skiprows,
+            signal_label=signal_label,
+            key=key,
+            time=_read_only(df["#time(seconds)"].to_numpy()),
+            channels={
+                "405": _read_only(df["405nm"].to_numpy(), dtype),
+                "465": _read_only(df[signal_label].to_numpy(), dtype),
+            },
+        )
+
+    check_dual_columns(header)
+    df = _read_columns(path, skiprows, DUAL_INPUT_COLUMNS)
+    if len(df.index) < 3:
+        raise ValueError("Dual photometry CSV must contain at least 3 rows of data.")
+    return PhotometryRecording(
+        path=path,
+        file_type="dual",
+        skiprows=skiprows,
+        signal_label="CH1-470",
+        key=key,
+        time=_read_only(df["TimeStamp"].to_numpy()),
+        channels={
+            "410": _read_only(df["CH1-410"].to_numpy(), dtype),
+            "470": _read_only(df["CH1-470"].to_numpy(), dtype),
+            "560": _read_only(df["CH1-560"].to_numpy(), dtype),
+        },
+    )
+
+
+class RecordingCache:
+    """Thread-safe LRU cache of parsed recordings bounded by total array bytes."""
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES) -> None:
+        self.max_bytes = int(max_bytes)
+        self._entries: OrderedDict[_CacheKey, PhotometryRecording] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def peek(self, key: RecordingKey, precision: str = "float64") -> PhotometryRecording | None:
+        entry_key = (key, precision)
+        with self._lock:
+            recording = self._entries.get(entry_key)
+            if recording is not None:
+                self._entries.move_to_end(entry_key)
+            return recording
+
+    def put(self, key: RecordingKey, recording: PhotometryRecording) -> None:
+        size = recording.nbytes
+        key = (key, recording.precision)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            if size > self.max_bytes:
+                return
+            self._entries[key] = recording
+            self._bytes += size
+            self._evict()
+
+    def resize(self, max_bytes: int) -> None:
+        with self._lock:
+            self.max_bytes = int(max_bytes)
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+
+    def load(self, path: str | Path, precision: str = "float64") -> PhotometryRecording:
+        precision_dtype(precision)
+        key = recording_key(path)
+        cached = self.peek(key, precision)
+        if cached is not None:
+            return cached
+        recording = _parse_recording(key, precision)
+        self.put(key, recording)
+        return recording
+
+
+_RECORDING_CACHE = RecordingCache()
+
+
+def recording_cache() -> RecordingCache:
+    """Return the process-wide recording cache."""
+    return _RECORDING_CACHE
+
+
+def load_recording(path: str | Path, precision: str = "float64") -> PhotometryRecording:
+    """Return the parsed recording for ``path``, reading it only on a cache miss.
+
+    ``precision="float32"`` stores the channel arrays in float32.
+    """
+    return _RECORDING_CACHE.load(path, precision)
+
+
+def cached_recording(path: str | Path) -> PhotometryRecording | None:
+    """Return the cached recording for ``path`` without touching the file contents."""
+    try:
+        key = recording_key(path)
+    except OSError:
+        return None
+    for precision in PRECISIONS:
+        recording = _RECORDING_CACHE.peek(key, precision)
+        if recording is not None:
+            return recording
+    return None
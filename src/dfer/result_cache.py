@@ -0,0 +1,213 @@
+"""Content-addressed cache of finished DFer/PFer runs.
+
+A run is identified by the SHA-256 of its input file(s) plus a fingerprint
+of everything else that shapes its output: the run's parameters, the filter
+constants, the output paths and a hash of this package's source code. When
+an identical run has finished before, its outputs are restored instead of
+recomputed: left alone if they are still on disk unchanged, otherwise copied
+back (with their original mtimes) from the stored copies.
+
+The cache lives in the per-user config directory, so the Qt app and batch
+workers share hits. It holds one small JSON index entry per run under
+``entries/``, copies of the output files under ``objects/`` (named by their
+SHA-256, so identical outputs are stored once) and memoised input hashes
+under ``inputs/``. Every file is written to a temporary name and renamed
+into place, so concurrent processes never see a partial entry. Once the
+stored copies exceed ``max_bytes`` the least recently used runs are dropped.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterable
+
+from src.shared.persistence.app_paths import config_file_path
+
+logger = logging.getLogger(__name__)
+
+RESULT_CACHE_DIRNAME = "dfer_result_cache"
+DEFAULT_RESULT_CACHE_BYTES = 2 << 30  # 2 GiB of stored outputs
+_HASH_CHUNK_BYTES = 1 << 20
+
+
+def _sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while chunk := handle.read(_HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=1)
+def code_version() -> str:
+    """Return a hash of the ``src.dfer`` sources, so code changes invalidate the cache."""
+    digest = hashlib.sha256()
+    for path in sorted(Path(__file__).parent.glob("*.py")):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def _write_json_atomic(path: Path, payload: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _read_json(path: Path) -> Any:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+class ResultCache:
+    """On-disk index of finished runs keyed by input content and parameters."""
+
+    def __init__(self, root: str | Path, max_bytes: int = DEFAULT_RESULT_CACHE_BYTES) -> None:
+        if max_bytes < 0:
+            raise ValueError("max_bytes must be zero or positive")
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / "entries" / f"{key}.json"
+
+    def _object_path(self, sha256: str) -> Path:
+        return self.root / "objects" / sha256
+
+    def input_hash(self, path: str | Path) -> str:
+        """Return the SHA-256 of ``path``, reusing the stored hash while its size/mtime match."""
+        path = Path(path).expanduser().resolve()
+        stat = path.stat()
+        memo = self.root / "inputs" / f"{hashlib.sha256(str(path).encode()).hexdigest()}.json"
+        record = _read_json(memo)
+        if isinstance(record, dict) and record.get("signature") == [stat.st_size, stat.st_mtime_ns]:
+            return str(record["sha256"])
+        sha256 = _sha256_file(path)
+        _write_json_atomic(memo, {"path": str(path), "signature": [stat.st_size, stat.st_mtime_ns],
+                                  "sha256": sha256})
+        return sha256
+
+    def key(self, tool: str, inputs: Iterable[str | Path], params: dict[str, Any]) -> str:
+        """Return the cache key of running ``tool`` with ``params`` on ``inputs``."""
+        fingerprint = {
+            "tool": tool,
+            "inputs": [self.input_hash(path) for path in inputs],
+            "params": params,
+            "code": code_version(),
+        }
+        return hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode()).hexdigest()
+
+    def restore(self, key: str) -> Any | None:
+        """Put the outputs of run ``key`` back in place and return its result, or None on a miss."""
+        entry_path = self._entry_path(key)
+        entry = _read_json(entry_path)
+        if not isinstance(entry, dict):
+            return None
+        try:
+            for output in entry["outputs"]:
+                path = Path(output["path"])
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    stat = None
+                if stat is not None and [stat.st_size, stat.st_mtime_ns] == output["signature"]:
+                    continue
+                path.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(self._object_path(output["sha256"]), path)
+                mtime_ns = output["signature"][1]
+                os.utime(path, ns=(mtime_ns, mtime_ns))
+            os.utime(entry_path)  # last used, for eviction
+        except (OSError, KeyError, TypeError) as exc:
+            logger.warning("Discarding unusable result cache entry %s: %s", key[:12], exc)
+            entry_path.unlink(missing_ok=True)
+            return None
+        return entry["result"]
+
+    def store(self, key: str, result: Any, outputs: Iterable[str | Path]) -> None:
+        """Record ``result`` and copies of the ``outputs`` files as run ``key``.
+
+        Runs whose outputs alone exceed ``max_bytes`` are not stored. Failures
+        are logged and ignored; the cache is only an accelerator.
+        """
+        try:
+            paths = [Path(path) for path in outputs]
+            size = sum(path.stat().st_size for path in set(paths))
+            if size > self.max_bytes:
+                logger.info("Not caching run %s: %d bytes of outputs exceed the %d byte budget",
+                            key[:12], size, self.max_bytes)
+                return
+            records = []
+            for path in paths:
+                sha256 = _sha256_file(path)
+                stored = self._object_path(sha256)
+                if not stored.exists():
+                    stored.parent.mkdir(parents=True, exist_ok=True)
+                    fd, tmp = tempfile.mkstemp(dir=stored.parent, prefix=".tmp-")
+                    os.close(fd)
+                    shutil.copyfile(path, tmp)
+                    os.replace(tmp, stored)
+                stat = path.stat()
+                records.append({"path": str(path), "signature": [stat.st_size, stat.st_mtime_ns],
+                                "sha256": sha256})
+            _write_json_atomic(self._entry_path(key), {"result": result, "outputs": records})
+            self._evict()
+        except (OSError, TypeError, ValueError) as exc:
+            logger.warning("Could not store result cache entry: %s", exc)
+
+    def _evict(self) -> None:
+        entries = []
+        for path in (self.root / "entries").glob("*.json"):
+            try:
+                entries.append((path.stat().st_mtime_ns, path))
+            except FileNotFoundError:
+                continue
+        entries.sort(reverse=True)  # most recently used first
+
+        kept: set[str] = set()
+        total = 0
+        for _, path in entries:
+            entry = _read_json(path)
+            if not isinstance(entry, dict):
+                path.unlink(missing_ok=True)
+                continue
+            objects = {output["sha256"] for output in entry.get("outputs", [])} - kept
+            size = sum(self._object_size(sha256) for sha256 in objects)
+            if total + size > self.max_bytes:
+                path.unlink(missing_ok=True)
+                continue
+            kept |= objects
+            total += size
+
+        for stored in (self.root / "objects").glob("*"):
+            if stored.name not in kept and not stored.name.startswith(".tmp-"):
+                stored.unlink(missing_ok=True)
+
+    def _object_size(self, sha256: str) -> int:
+        try:
+            return self._object_path(sha256).stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def clear(self) -> None:
+        """Drop every entry and stored output."""
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+def result_cache() -> ResultCache:
+    """Return the result cache in the per-user config directory."""
+    return ResultCache(config_file_path(RESULT_CACHE_DIRNAME))
@@ -0,0 +1,165 @@
+"""Binary DFer result bundles written next to the ``_Data.csv`` outputs.
+
+A bundle is a raw ``.npy`` float64 matrix (memory-mappable, full precision)
+plus a small ``.json`` header listing its columns, sharing the CSV's stem:
+``rec_Data.csv`` -> ``rec_Data.npy`` + ``rec_Data.json``. The header also
+records the size and mtime of the CSV it was written with (bundles are
+written after their CSV is closed). Readers call ``read_result_frame``,
+which uses the bundle while the CSV still matches that record and falls back
+to parsing the CSV otherwise.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+from typing import BinaryIO
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_FORMAT_VERSION = 1
+
+
+def bundle_paths(csv_path: str | Path) -> tuple[Path, Path]:
+    """Return the (matrix, header) paths of the bundle belonging to ``csv_path``."""
+    csv_path = Path(csv_path)
+    return csv_path.with_suffix(".npy"), csv_path.with_suffix(".json")
+
+
+def normalise_result_columns(columns) -> list[str]:
+    """Strip the ``# `` comment prefix savetxt puts on the first header name."""
+    return [str(c).strip().lstrip("#").strip() for c in columns]
+
+
+def _csv_signature(csv_path: Path) -> tuple[int, int] | None:
+    try:
+        stat = csv_path.stat()
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _write_header(csv_path: Path, columns: list[str], n_rows: int) -> None:
+    _, header_path = bundle_paths(csv_path)
+    signature = _csv_signature(csv_path)
+    header_path.write_text(
+        json.dumps({
+            "format_version": BUNDLE_FORMAT_VERSION,
+            "columns": columns,
+            "rows": n_rows,
+            "csv": csv_path.name,
+            "csv_size": signature[0] if signature else None,
+            "csv_mtime_ns": signature[1] if signature else None,
+        }, indent=2),
+        encoding="utf-8",
+    )
+
+
+def write_result_bundle(csv_path: str | Path, matrix: np.ndarray, columns: list[str]) -> Path:
+    """Write ``matrix`` (one column per name in ``columns``) as the bundle for ``csv_path``.
+
+    Call it after the CSV is closed, so the recorded CSV signature is final.
+    """
+    csv_path = Path(csv_path)
+    matrix = np.ascontiguousarray(matrix, dtype=float)
+    if matrix.ndim != 2 or matrix.shape[1] != len(columns):
+        raise ValueError("Result matrix must have one column per header name.")
+    matrix_path, _ = bundle_paths(csv_path)
+    np.save(matrix_path, matrix)
+    _write_header(csv_path, list(columns), matrix.shape[0])
+    return matrix_path
+
+
+class ResultBundleWriter:
+    """Append row blocks to a bundle whose total row count is known up front.
+
+    The header (with the CSV signature) is written on exit, so close the CSV
+    writer first.
+    """
+
+    def __init__(self, csv_path: str | Path, columns: list[str], n_rows: int) -> None:
+        self.csv_path = Path(csv_path)
+        self.columns = list(columns)
+        self.n_rows = int(n_rows)
+        self._written = 0
+        self._handle: BinaryIO | None = None
+
+    def __enter__(self) -> ResultBundleWriter:
+        matrix_path, _ = bundle_paths(self.csv_path)
+        self._handle = matrix_path.open("wb")
+        np.lib.format.write_array_header_2_0(self._handle, {
+            "descr": np.lib.format.dtype_to_descr(np.dtype(float)),
+            "fortran_order": False,
+            "shape": (self.n_rows, len(self.columns)),
+        })
+        return self
+
+    def write(self, block: np.ndarray) -> None:
+        assert self._handle is not None
+        block = np.ascontiguousarray(block, dtype=float)
+        self._handle.write(block.tobytes())
+        self._written += block.shape[0]
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        assert self._handle is not None
+        self._handle.close()
+        if exc_type is None and self._written != self.n_rows:
+            raise ValueError(f"Bundle expected {self.n_rows} rows but {self._written} were written.")
+        if exc_type is None:
+            _write_header(self.csv_path, self.columns, self.n_rows)
+        else:
+            remove_result_bundle(self.csv_path)
+
+
+def remove_result_bundle(csv_path: str | Path) -> None:
+    """Delete the bundle for ``csv_path`` so readers fall back to the CSV."""
+    for path in bundle_paths(csv_path):
+        path.unlink(missing_ok=True)
+
+
+def fresh_bundle_columns(csv_path: str | Path) -> list[str] | None:
+    """Return the bundle's columns if it exists and was written for the current CSV."""
+    csv_path = Path(csv_path)
+    matrix_path, header_path = bundle_paths(csv_path)
+    if not matrix_path.exists():
+        return None
+    try:
+        header = json.loads(header_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if header.get("format_version") != BUNDLE_FORMAT_VERSION:
+        return None
+    signature = _csv_signature(csv_path)
+    # A bundle whose CSV was deleted is still readable.
+    if signature is not None and list(signature) != [header.get("csv_size"), header.get("csv_mtime_ns")]:
+        return None
+    columns = header.get("columns")
+    return [str(c) for c in columns] if isinstance(columns, list) else None
+
+
+def read_result_frame(csv_path: str | Path, mmap: bool = True) -> pd.DataFrame:
+    """Load a DFer output as a DataFrame with normalised column names.
+
+    Uses the binary bundle when it matches the CSV (memory-mapped unless
+    ``mmap`` is False, e.g. when the frame outlives the next DFer run),
+    otherwise parses the CSV.
+    """
+    columns = fresh_bundle_columns(csv_path)
+    if columns is not None:
+        matrix_path, _ = bundle_paths(csv_path)
+        try:
+            matrix = np.load(matrix_path, mmap_mode="r" if mmap else None, allow_pickle=False)
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable result bundle %s: %s", matrix_path.name, exc)
+        else:
+            if matrix.ndim == 2 and matrix.shape[1] == len(columns):
+                return pd.DataFrame(matrix, columns=columns, copy=False)
+            logger.warning("Ignoring result bundle %s with mismatched columns", matrix_path.name)
+
+    df = pd.read_csv(csv_path, index_col=False)
+    df.columns = normalise_result_columns(df.columns)
+    return df
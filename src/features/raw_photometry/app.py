@@ -28,6 +28,7 @@ from PySide6.QtWidgets import (
     QLineEdit,
     QMessageBox,
     QPlainTextEdit,
+    QProgressBar,
     QPushButton,
     QRadioButton,
     QSizePolicy,
@@ -40,12 +41,12 @@ from PySide6.QtWidgets import (
 from src import default_dirs
 from src.core.app_settings_manager import AppSettingsManager
 from src.dfer import compute_options, run_analysis, run_pfer
-from src.dfer.df_common import (
-    detect_photometry_file_type,
-    validate_dual_df,
-    validate_single_df,
-)
+from src.dfer.df_common import detect_photometry_file_type
+from src.dfer.decimation import plot_decimated
 from src.dfer.df_plots import mpl_pfer_figure
+from src.dfer.progress import AnalysisCancelled, CancelToken, ProgressCallback
+from src.dfer.recording import load_recording
+from src.dfer.results_io import read_result_frame
 from src.gui.shared.messages_and_errors import format_action_error, show_action_error
 from src.gui.shared.qt_view_styles import (
     APP_TABS_STYLESHEET,
@@ -155,6 +156,18 @@ _OPTION_TITLES = [
     "Option 4: No noise correction, no activity-dependent baseline correction",
 ]
 
+_STAGE_LABELS = {
+    "load": "Loading data",
+    "fit": "Fitting baselines",
+    "filter": "Filtering",
+    "smooth": "Smoothing",
+    "dfof": "Computing dF/F",
+    "peaks": "Finding peaks",
+    "write": "Writing results",
+    "plot": "Plotting",
+    "done": "Done",
+}
+
 
 def _normalise_dfer_result_frame(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
@@ -177,7 +190,8 @@ def _mpl_dfer_results_figure_from_frame(
 
     if is_dual:
         if graph == "dfof":
-            ax.plot(
+            plot_decimated(
+                ax,
                 t_min,
                 df["dFoF_470"].to_numpy(dtype=float),
                 color="green",
@@ -185,7 +199,8 @@ def _mpl_dfer_results_figure_from_frame(
                 alpha=0.55,
                 label="470nm dF/F",
             )
-            ax.plot(
+            plot_decimated(
+                ax,
                 t_min,
                 df["dFoF_560"].to_numpy(dtype=float),
                 color="red",
@@ -195,7 +210,8 @@ def _mpl_dfer_results_figure_from_frame(
             )
             ax.set_ylabel("dF/F")
         else:
-            ax.plot(
+            plot_decimated(
+                ax,
                 t_min,
                 df["Z_470"].to_numpy(dtype=float),
                 color="green",
@@ -203,7 +219,8 @@ def _mpl_dfer_results_figure_from_frame(
                 alpha=0.55,
                 label="470nm Z-score",
             )
-            ax.plot(
+            plot_decimated(
+                ax,
                 t_min,
                 df["Z_560"].to_numpy(dtype=float),
                 color="red",
@@ -215,13 +232,17 @@ def _mpl_dfer_results_figure_from_frame(
     else:
         if graph == "dfof":
             if show_405:
-                ax.plot(t_min, df["dFoF_405"].to_numpy(dtype=float), color="purple", linewidth=0.6, label="405nm dF/F")
-            ax.plot(t_min, df["dFoF_465"].to_numpy(dtype=float), color="green", linewidth=0.6, label="465nm dF/F")
+                plot_decimated(ax, t_min, df["dFoF_405"].to_numpy(dtype=float),
+                               color="purple", linewidth=0.6, label="405nm dF/F")
+            plot_decimated(ax, t_min, df["dFoF_465"].to_numpy(dtype=float),
+                           color="green", linewidth=0.6, label="465nm dF/F")
             ax.set_ylabel("dF/F")
         else:
             if show_405:
-                ax.plot(t_min, df["Z_405"].to_numpy(dtype=float), color="purple", linewidth=0.6, label="405nm Z-score")
-            ax.plot(t_min, df["Z_465"].to_numpy(dtype=float), color="green", linewidth=0.6, label="465nm Z-score")
+                plot_decimated(ax, t_min, df["Z_405"].to_numpy(dtype=float),
+                               color="purple", linewidth=0.6, label="405nm Z-score")
+            plot_decimated(ax, t_min, df["Z_465"].to_numpy(dtype=float),
+                           color="green", linewidth=0.6, label="465nm Z-score")
             ax.set_ylabel("Z-score")
 
     ax.set_xlabel("Time (min)")
@@ -231,12 +252,12 @@ def _mpl_dfer_results_figure_from_frame(
 
 
 def _mpl_dfer_results_figure(csv_path: str, graph: str = "dfof", show_405: bool = True) -> Figure:
-    """Read a DFer output CSV and return a single-panel matplotlib Figure.
+    """Read a DFer output (bundle or CSV) and return a single-panel matplotlib Figure.
 
     graph: 'dfof' | 'zscore'
     Always shows all channels together (both 470+560 for dual, 405+465 for single).
     """
-    df = pd.read_csv(csv_path, index_col=False)
+    df = read_result_frame(csv_path, mmap=False)
     return _mpl_dfer_results_figure_from_frame(df, graph, show_405)
 
 
@@ -251,20 +272,20 @@ def _mpl_single_option_figure(data: dict, idx: int, dual_display: str = "both")
 
     if file_type == "single":
         adj_key = ["smooth_adj_1", "smooth_adj_2", "smooth_adj_3", "smooth_adj_4"][idx]
-        ax.plot(t, data["smooth_465"], color="green", linewidth=0.6, label="465nm")
-        ax.plot(t, data[adj_key], color="red", linewidth=0.6, alpha=0.7, label="fitted control")
+        plot_decimated(ax, t, data["smooth_465"], color="green", linewidth=0.6, label="465nm")
+        plot_decimated(ax, t, data[adj_key], color="red", linewidth=0.6, alpha=0.7, label="fitted control")
     else:
         key = ["adj1", "adj2", "adj3", "adj4"][idx]
         if dual_display in {"both", "470"}:
-            ax.plot(t, data["p470"]["target_smooth"], color="green", linewidth=0.6,
-                    alpha=0.8, label="470nm")
-            ax.plot(t, data["p470"][key], color="green", linewidth=0.6,
-                    alpha=0.3, linestyle="--", label="470 fitted")
+            plot_decimated(ax, t, data["p470"]["target_smooth"], color="green", linewidth=0.6,
+                           alpha=0.8, label="470nm")
+            plot_decimated(ax, t, data["p470"][key], color="green", linewidth=0.6,
+                           alpha=0.3, linestyle="--", label="470 fitted")
         if dual_display in {"both", "560"}:
-            ax.plot(t, data["p560"]["target_smooth"], color="red", linewidth=0.6,
-                    alpha=0.8, label="560nm")
-            ax.plot(t, data["p560"][key], color="red", linewidth=0.6,
-                    alpha=0.3, linestyle="--", label="560 fitted")
+            plot_decimated(ax, t, data["p560"]["target_smooth"], color="red", linewidth=0.6,
+                           alpha=0.8, label="560nm")
+            plot_decimated(ax, t, data["p560"][key], color="red", linewidth=0.6,
+                           alpha=0.3, linestyle="--", label="560 fitted")
 
     ax.set_title(title, fontsize=10)
     ax.set_ylabel("RFU")
@@ -283,6 +304,89 @@ class GraphReference:
     end_line: object
 
 
+@dataclass
+class RawGraph:
+    file_path: str
+    file_type: str
+    reference: GraphReference
+
+
+def _raw_single_graph(t: np.ndarray, y405: np.ndarray, y465: np.ndarray) -> GraphReference:
+    figure = Figure(figsize=(10, 4), dpi=100)
+    ax465 = figure.add_subplot(111)
+    ax405 = ax465.twinx()
+
+    s405_min, s405_max = float(y405.min()), float(y405.max())
+    y_top_405 = s405_max + s405_min
+    y_bot_405 = s405_min - 0.01 * s405_min
+    range_405 = y_top_405 - y_bot_405
+
+    s465_min, s465_max = float(y465.min()), float(y465.max())
+    plot_decimated(ax465, t, y465, color="green", linewidth=0.6)
+    plot_decimated(ax405, t, y405, color="purple", linewidth=0.6, alpha=0.5)
+    ax465.set_ylabel("465nm Signal", color="green")
+    ax405.set_ylabel("405nm Signal", color="purple")
+    ax465.tick_params(axis="y", labelcolor="green")
+    ax405.tick_params(axis="y", labelcolor="purple")
+    ax465.set_ylim([s465_min - 0.5 * range_405, s465_max * 1.02])
+    ax405.set_ylim(y_bot_405, y_top_405)
+
+    start_line = ax465.axvline(x=t[0], color="red", linestyle="--", linewidth=1.5, label="Window start")
+    end_line = ax465.axvline(x=t[-1], color="blue", linestyle="--", linewidth=1.5, label="Window end")
+    ax465.set_title("Raw Data — single channel")
+    ax465.set_xlabel("Time (s)")
+    ax465.set_xlim([t[0], t[-1]])
+    handles, labels = ax465.get_legend_handles_labels()
+    ax465.legend(handles, labels, fontsize=8, loc="upper right")
+    _tighten_time_axes(figure)
+    figure.tight_layout()
+
+    return GraphReference(figure, ax465, ax405, start_line, end_line)
+
+
+def _raw_dual_graph(t: np.ndarray, y470: np.ndarray, y560: np.ndarray) -> GraphReference:
+    figure = Figure(figsize=(10, 4), dpi=100)
+    ax = figure.add_subplot(111)
+    plot_decimated(ax, t, y470, color="green", linewidth=0.6, label="470nm")
+    plot_decimated(ax, t, y560, color="red", linewidth=0.6, alpha=0.8, label="560nm")
+    ax.set_ylabel("RFU")
+    ax.set_xlabel("Time (s)")
+    ax.set_title("Raw Data — dual channel")
+    start_line = ax.axvline(x=t[0], color="red", linestyle="--", linewidth=1.5, label="Window start")
+    end_line = ax.axvline(x=t[-1], color="blue", linestyle="--", linewidth=1.5, label="Window end")
+    ax.legend(fontsize=8, loc="upper right")
+    ax.set_xlim([t[0], t[-1]])
+    _tighten_time_axes(figure)
+    figure.tight_layout()
+
+    return GraphReference(figure, ax, None, start_line, end_line)
+
+
+def _prepare_raw_graph(
+    file_path: str,
+    progress: ProgressCallback | None = None,
+    cancel: CancelToken | None = None,
+) -> RawGraph:
+    """Load a raw recording and build its graph; safe to run off the UI thread.
+
+    The figure has no Qt canvas yet; ``GraphPanel.set_figure`` attaches one.
+    ``progress`` is accepted for ``_Worker`` and unused; a cancelled load
+    stops before building the figure.
+    """
+    recording = load_recording(file_path)
+    if cancel is not None:
+        cancel.raise_if_cancelled()
+    if recording.file_type == "single":
+        reference = _raw_single_graph(
+            recording.time, recording.channels["405"], recording.channels["465"]
+        )
+    else:
+        reference = _raw_dual_graph(
+            recording.time / 1000.0, recording.channels["470"], recording.channels["560"]
+        )
+    return RawGraph(file_path, recording.file_type, reference)
+
+
 class GraphPanel(QWidget):
     def __init__(self, parent: QWidget | None = None) -> None:
         super().__init__(parent)
@@ -324,17 +428,28 @@ class GraphPanel(QWidget):
 # ---------------------------------------------------------------------------
 
 class _Worker(QObject):
+    """Run a staged DFer/PFer call off the UI thread.
+
+    ``fn`` must accept the ``progress``/``cancel`` hooks of
+    ``src.dfer.progress``; stage updates arrive on ``progress`` and
+    ``cancel_token`` stops the run at its next stage boundary.
+    """
+
     finished = Signal(object)
     failed = Signal(object)
+    progress = Signal(str, float)
 
     def __init__(self, fn, kwargs: dict) -> None:
         super().__init__()
         self._fn = fn
         self._kwargs = kwargs
+        self.cancel_token = CancelToken()
 
     def run(self) -> None:
         try:
-            result = self._fn(**self._kwargs)
+            result = self._fn(**self._kwargs, progress=self.progress.emit, cancel=self.cancel_token)
+        except AnalysisCancelled as exc:
+            self.failed.emit(exc)
         except Exception as exc:
             logging.getLogger(__name__).exception("Background analysis failed")
             self.failed.emit(exc)
@@ -413,6 +528,9 @@ class RawPhotometryProcessingQt(QWidget):
         self._plot_save_counts: dict[str, int] = {}
         self._thread: QThread | None = None
         self._worker: _Worker | None = None
+        self._worker_error_handler = None
+        self._raw_worker: _Worker | None = None
+        self._raw_loads: dict[QThread, _Worker] = {}
         self._log_handler: _QtLogHandler | None = None
         self._log_handler_loggers: list[logging.Logger] = []
         self._log_signal_connected = False
@@ -634,8 +752,34 @@ class RawPhotometryProcessingQt(QWidget):
         card_layout.addWidget(self.file_path_edit, 1)
 
         layout.addWidget(card)
+        layout.addWidget(self._build_progress_row(panel))
         return panel
 
+    def _build_progress_row(self, parent: QWidget) -> QWidget:
+        row = QWidget(parent)
+        row_layout = QHBoxLayout(row)
+        row_layout.setContentsMargins(0, 0, 0, 0)
+        row_layout.setSpacing(8)
+
+        self._progress_label = QLabel("Idle", row)
+        self._progress_label.setStyleSheet(subtitle_stylesheet())
+        self._progress_label.setMinimumWidth(120)
+        row_layout.addWidget(self._progress_label)
+
+        self._progress_bar = QProgressBar(row)
+        self._progress_bar.setRange(0, 100)
+        self._progress_bar.setValue(0)
+        self._progress_bar.setTextVisible(False)
+        self._progress_bar.setFixedHeight(10)
+        row_layout.addWidget(self._progress_bar, 1)
+
+        self.btn_cancel = QPushButton("Cancel", row)
+        apply_button_role(self.btn_cancel, "outlined")
+        self.btn_cancel.setEnabled(False)
+        self.btn_cancel.clicked.connect(self._cancel_worker)
+        row_layout.addWidget(self.btn_cancel)
+        return row
+
     def _build_analysis_window_panel(self) -> QFrame:
         panel = QFrame(self.top_frame)
         panel.setObjectName("rawPhotWindowPanel")
@@ -764,6 +908,18 @@ class RawPhotometryProcessingQt(QWidget):
         run_title.setStyleSheet(section_title_stylesheet())
         choose_layout.addWidget(run_title)
 
+        self._dfer_binary_checkbox = QCheckBox("Also write binary result bundle", choose_card)
+        self._dfer_binary_checkbox.setToolTip(
+            "Write a memory-mappable .npy/.json copy of the results next to the CSV."
+        )
+        self._dfer_binary_checkbox.setChecked(
+            bool(getattr(self.settings_manager, "dfer_binary_output", False))
+        )
+        self._dfer_binary_checkbox.toggled.connect(self._save_dfer_binary_output)
+        choose_layout.addWidget(self._dfer_binary_checkbox)
+        self._dfer_cache_checkbox = self._result_cache_checkbox(choose_card)
+        choose_layout.addWidget(self._dfer_cache_checkbox)
+
         btn_row = QHBoxLayout()
         btn_row.setSpacing(6)
         self.btn_run_final = QPushButton("Run final analysis", choose_card)
@@ -849,9 +1005,17 @@ QPlainTextEdit {{
 
     def _shutdown_for_close(self) -> bool:
         self._teardown_log_handler()
-        if self._thread is not None and self._thread.isRunning():
-            self._thread.quit()
-            if not self._thread.wait(3000):
+        running = [
+            (thread, worker)
+            for thread, worker in [(self._thread, self._worker), *self._raw_loads.items()]
+            if thread is not None and thread.isRunning()
+        ]
+        for thread, worker in running:
+            if worker is not None:
+                worker.cancel_token.cancel()
+            thread.quit()
+        if running:
+            if not all(thread.wait(3000) for thread, _ in running):
                 # The dashboard will keep this tool alive when unload returns
                 # False. Restore the handler that was detached at the start of
                 # shutdown so the still-running tool remains fully usable.
@@ -979,6 +1143,9 @@ QPlainTextEdit {{
         run_title.setStyleSheet(section_title_stylesheet())
         run_layout.addWidget(run_title)
 
+        self._pfer_cache_checkbox = self._result_cache_checkbox(run_card)
+        run_layout.addWidget(self._pfer_cache_checkbox)
+
         btn_row = QHBoxLayout()
         btn_row.setSpacing(6)
         self.btn_run_pfer = QPushButton("Run peak finder", run_card)
@@ -1003,10 +1170,12 @@ QPlainTextEdit {{
     def _start_worker(self, fn, kwargs: dict, on_success, on_error) -> None:
         self._thread = QThread(self)
         self._worker = _Worker(fn, kwargs)
+        self._worker_error_handler = on_error
         self._worker.moveToThread(self._thread)
         self._thread.started.connect(self._worker.run)
+        self._worker.progress.connect(self._on_worker_progress)
         self._worker.finished.connect(on_success)
-        self._worker.failed.connect(on_error)
+        self._worker.failed.connect(self._on_worker_failed)
         self._worker.finished.connect(self._thread.quit)
         self._worker.failed.connect(self._thread.quit)
         self._thread.finished.connect(self._thread.deleteLater)
@@ -1017,11 +1186,40 @@ QPlainTextEdit {{
         self._thread = None
         self._worker = None
 
+    def _on_worker_progress(self, stage: str, fraction: float) -> None:
+        if self._unloading:
+            return
+        self._progress_label.setText(_STAGE_LABELS.get(stage, stage))
+        self._progress_bar.setValue(round(fraction * 100))
+
+    def _on_worker_failed(self, error: object) -> None:
+        if isinstance(error, AnalysisCancelled):
+            if self._unloading:
+                return
+            self._set_busy(False)
+            self._progress_label.setText("Cancelled")
+            self._append_log("INFO  [Analysis] Cancelled.")
+            return
+        if not self._unloading:
+            self._progress_label.setText("Failed")
+        if self._worker_error_handler is not None:
+            self._worker_error_handler(error)
+
+    def _cancel_worker(self) -> None:
+        if self._worker is None:
+            return
+        self._worker.cancel_token.cancel()
+        self.btn_cancel.setEnabled(False)
+        self._progress_label.setText("Cancelling...")
+
     def _set_busy(self, busy: bool) -> None:
         self.btn_run_final.setEnabled(not busy)
         self.btn_run_pfer.setEnabled(not busy)
         self.btn_apply_window.setEnabled(not busy)
+        self.btn_cancel.setEnabled(busy)
         if busy:
+            self._progress_label.setText(_STAGE_LABELS["load"])
+            self._progress_bar.setValue(0)
             QApplication.setOverrideCursor(Qt.WaitCursor)
         else:
             QApplication.restoreOverrideCursor()
@@ -1074,18 +1272,9 @@ QPlainTextEdit {{
             self._load_photometry_file(file_path)
 
     def _load_photometry_file(self, file_path: str) -> None:
-        try:
-            self._draw_raw_graph(file_path)
-        except Exception as exc:
-            show_action_error(
-                "Photometry file not recognised",
-                "NeuroSyncApp could not load the selected photometry file",
-                exc,
-                self,
-                "Select the original raw photometry CSV rather than a processed DFer or PFer output file.",
-            )
-            return
-        file_type, _ = detect_photometry_file_type(file_path)
+        self._start_raw_load(file_path)
+
+    def _raw_file_loaded(self, file_path: str, file_type: str) -> None:
         self._selected_file = file_path
         if file_type == "dual":
             self._output_folder = str(Path(file_path).parent.parent / "dfof_results")
@@ -1107,74 +1296,62 @@ QPlainTextEdit {{
 
     # ── raw graph ──────────────────────────────────────────────────────────
 
-    def _draw_raw_graph(self, file_path: str) -> None:
-        file_type, skiprows = detect_photometry_file_type(file_path)
-        if file_type == "single":
-            df = pd.read_csv(file_path, index_col=False, low_memory=False)
-            validate_single_df(df)
-            t = df["#time(seconds)"][1:].to_numpy(dtype=float)
-            y405 = df["405nm"][1:].to_numpy(dtype=float)
-            y465_col = "465nm" if "465nm" in df.columns else "490nm"
-            y465 = df[y465_col][1:].to_numpy(dtype=float)
-            self._draw_single_raw(t, y405, y465)
-        else:
-            df = pd.read_csv(file_path, skiprows=skiprows, index_col=False, low_memory=False)
-            validate_dual_df(df)
-            t = df["TimeStamp"].astype(float).to_numpy() / 1000.0
-            y470 = df["CH1-470"].astype(float).to_numpy()
-            y560 = df["CH1-560"].astype(float).to_numpy()
-            self._draw_dual_raw(t, y470, y560)
+    def _start_raw_load(self, file_path: str) -> None:
+        """Load and plot ``file_path`` on a worker thread; the latest request wins."""
+        if self._raw_worker is not None:
+            self._raw_worker.cancel_token.cancel()
+        thread = QThread(self)
+        worker = _Worker(_prepare_raw_graph, {"file_path": file_path})
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.finished.connect(self._on_raw_graph_ready)
+        worker.failed.connect(self._on_raw_graph_failed)
+        worker.finished.connect(thread.quit)
+        worker.failed.connect(thread.quit)
+        thread.finished.connect(thread.deleteLater)
+        thread.finished.connect(self._forget_raw_load)
+        # Superseded loads keep running until their read returns, so every
+        # load stays referenced until its thread finishes.
+        self._raw_loads[thread] = worker
+        self._raw_worker = worker
+        self._append_log(f"INFO  [DFer] Loading: {file_path}")
+        thread.start()
+
+    def _forget_raw_load(self) -> None:
+        self._raw_loads.pop(self.sender(), None)
+
+    def _on_raw_graph_ready(self, graph: object) -> None:
+        if self._unloading or self.sender() is not self._raw_worker:
+            return
+        self._raw_worker = None
+        assert isinstance(graph, RawGraph)
+        self._show_raw_graph(graph.reference)
+        self._raw_file_loaded(graph.file_path, graph.file_type)
+
+    def _on_raw_graph_failed(self, error: object) -> None:
+        if self._unloading or self.sender() is not self._raw_worker:
+            return
+        self._raw_worker = None
+        if isinstance(error, AnalysisCancelled):
+            return
+        exc = error if isinstance(error, BaseException) else RuntimeError(str(error))
+        show_action_error(
+            "Photometry file not recognised",
+            "NeuroSyncApp could not load the selected photometry file",
+            exc,
+            self,
+            "Select the original raw photometry CSV rather than a processed DFer or PFer output file.",
+        )
+
+    def _show_raw_graph(self, reference: GraphReference) -> None:
+        self._raw_graph_ref = reference
+        self.raw_graph_panel.set_figure(reference.figure)
 
     def _draw_single_raw(self, t: np.ndarray, y405: np.ndarray, y465: np.ndarray) -> None:
-        figure = Figure(figsize=(10, 4), dpi=100)
-        ax465 = figure.add_subplot(111)
-        ax405 = ax465.twinx()
-
-        s405_min, s405_max = float(y405.min()), float(y405.max())
-        y_top_405 = s405_max + s405_min
-        y_bot_405 = s405_min - 0.01 * s405_min
-        range_405 = y_top_405 - y_bot_405
-
-        s465_min, s465_max = float(y465.min()), float(y465.max())
-        ax465.plot(t, y465, color="green", linewidth=0.6)
-        ax405.plot(t, y405, color="purple", linewidth=0.6, alpha=0.5)
-        ax465.set_ylabel("465nm Signal", color="green")
-        ax405.set_ylabel("405nm Signal", color="purple")
-        ax465.tick_params(axis="y", labelcolor="green")
-        ax405.tick_params(axis="y", labelcolor="purple")
-        ax465.set_ylim([s465_min - 0.5 * range_405, s465_max * 1.02])
-        ax405.set_ylim(y_bot_405, y_top_405)
-
-        start_line = ax465.axvline(x=t[0], color="red", linestyle="--", linewidth=1.5, label="Window start")
-        end_line = ax465.axvline(x=t[-1], color="blue", linestyle="--", linewidth=1.5, label="Window end")
-        ax465.set_title("Raw Data — single channel")
-        ax465.set_xlabel("Time (s)")
-        ax465.set_xlim([t[0], t[-1]])
-        handles, labels = ax465.get_legend_handles_labels()
-        ax465.legend(handles, labels, fontsize=8, loc="upper right")
-        _tighten_time_axes(figure)
-        figure.tight_layout()
-
-        self._raw_graph_ref = GraphReference(figure, ax465, ax405, start_line, end_line)
-        self.raw_graph_panel.set_figure(figure)
+        self._show_raw_graph(_raw_single_graph(t, y405, y465))
 
     def _draw_dual_raw(self, t: np.ndarray, y470: np.ndarray, y560: np.ndarray) -> None:
-        figure = Figure(figsize=(10, 4), dpi=100)
-        ax = figure.add_subplot(111)
-        ax.plot(t, y470, color="green", linewidth=0.6, label="470nm")
-        ax.plot(t, y560, color="red", linewidth=0.6, alpha=0.8, label="560nm")
-        ax.set_ylabel("RFU")
-        ax.set_xlabel("Time (s)")
-        ax.set_title("Raw Data — dual channel")
-        start_line = ax.axvline(x=t[0], color="red", linestyle="--", linewidth=1.5, label="Window start")
-        end_line = ax.axvline(x=t[-1], color="blue", linestyle="--", linewidth=1.5, label="Window end")
-        ax.legend(fontsize=8, loc="upper right")
-        ax.set_xlim([t[0], t[-1]])
-        _tighten_time_axes(figure)
-        figure.tight_layout()
-
-        self._raw_graph_ref = GraphReference(figure, ax, None, start_line, end_line)
-        self.raw_graph_panel.set_figure(figure)
+        self._show_raw_graph(_raw_dual_graph(t, y470, y560))
 
     # ── time window ────────────────────────────────────────────────────────
 
@@ -1243,6 +1420,33 @@ QPlainTextEdit {{
         self.settings_manager.last_run_dfer_option = option
         self.settings_manager.save_variables()
 
+    def _save_dfer_binary_output(self, checked: bool) -> None:
+        self.settings_manager.dfer_binary_output = bool(checked)
+        self.settings_manager.save_variables()
+
+    def _result_cache_checkbox(self, parent: QWidget) -> QCheckBox:
+        checkbox = QCheckBox("Reuse identical earlier runs (result cache)", parent)
+        checkbox.setToolTip(
+            "Restore the outputs of an identical earlier run instead of recomputing. "
+            "Stores copies of every output in the settings folder."
+        )
+        checkbox.setChecked(bool(getattr(self.settings_manager, "dfer_result_cache", False)))
+        checkbox.toggled.connect(self._save_result_cache_enabled)
+        return checkbox
+
+    def _save_result_cache_enabled(self, checked: bool) -> None:
+        # The DFer and PFer checkboxes share one setting; keep them in step.
+        for checkbox in (
+            getattr(self, "_dfer_cache_checkbox", None),
+            getattr(self, "_pfer_cache_checkbox", None),
+        ):
+            if checkbox is not None and checkbox.isChecked() != checked:
+                checkbox.blockSignals(True)
+                checkbox.setChecked(checked)
+                checkbox.blockSignals(False)
+        self.settings_manager.dfer_result_cache = bool(checked)
+        self.settings_manager.save_variables()
+
     # ── DFer option plots ──────────────────────────────────────────────────
 
     def _on_generate_options(self, show_missing_file_warning: bool = True) -> None:
@@ -1328,9 +1532,9 @@ QPlainTextEdit {{
         graph = "zscore" if self._dfer_results_combo.currentIndex() == 1 else "dfof"
         loaded_new_result = self._dfer_result_frame is None or self._dfer_result_csv != csv_path
         if loaded_new_result:
-            self._dfer_result_frame = _normalise_dfer_result_frame(
-                pd.read_csv(csv_path, index_col=False)
-            )
+            # Kept across runs, so read it into memory rather than mapping the
+            # bundle the next DFer run will overwrite.
+            self._dfer_result_frame = read_result_frame(csv_path, mmap=False)
             self._dfer_result_csv = csv_path
         is_dual = "dFoF_470" in self._dfer_result_frame.columns
         self._dfer_show_405_checkbox.blockSignals(True)
@@ -1420,6 +1624,9 @@ QPlainTextEdit {{
                 "make_plots": False,
                 "mode": "full",
                 "plot_stage": "final",
+                "options": self._options_data,
+                "binary_output": self._dfer_binary_checkbox.isChecked(),
+                "cache": self._dfer_cache_checkbox.isChecked(),
             },
             self._run_final_done,
             self._run_final_failed,
@@ -1486,6 +1693,7 @@ QPlainTextEdit {{
                 "prominence": self._prominence_spin.value(),
                 "artifact_threshold": self._artifact_spin.value(),
                 "make_plots": False,
+                "cache": self._pfer_cache_checkbox.isChecked(),
             },
             self._pfer_done,
             self._pfer_failed,
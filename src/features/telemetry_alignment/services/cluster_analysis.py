@@ -14,6 +14,17 @@ from src.processing.cluster_detection import (
 from src.processing.telemetry_processing import (
     build_aligned_photometry_cluster_data,
 )
+from src.processing.telemetry_series import TelemetrySeries
+
+
+def _time_span(extended_data):
+    if extended_data is None or extended_data.empty:
+        return "N/A", "N/A"
+    if isinstance(extended_data, TelemetrySeries):
+        minutes = extended_data.minutes
+    else:
+        minutes = extended_data["Time (min)"]
+    return minutes.min(), minutes.max()
 
 
 class TelemetryClusterService:
@@ -185,9 +196,7 @@ class TelemetryClusterService:
             )
 
             if not all_temp_data or all(all_temp.empty for all_temp in all_temp_data):
-                ext = self.app.extended_temp_data
-                t_min = ext["Time (min)"].min() if ext is not None and not ext.empty else "N/A"
-                t_max = ext["Time (min)"].max() if ext is not None and not ext.empty else "N/A"
+                t_min, t_max = _time_span(self.app.extended_temp_data)
                 logger.warning(
                     "Period '%s': all temp windows are empty. "
                     "Extended temp data spans Time(min) [%s, %s]. "
@@ -196,9 +205,7 @@ class TelemetryClusterService:
                 )
                 continue
             if not all_act_data or all(all_act.empty for all_act in all_act_data):
-                ext = self.app.extended_act_data
-                t_min = ext["Time (min)"].min() if ext is not None and not ext.empty else "N/A"
-                t_max = ext["Time (min)"].max() if ext is not None and not ext.empty else "N/A"
+                t_min, t_max = _time_span(self.app.extended_act_data)
                 logger.warning(
                     "Period '%s': all act windows are empty. "
                     "Extended act data spans Time(min) [%s, %s]. "
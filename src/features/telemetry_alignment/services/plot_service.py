@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
 import logging
 import math
@@ -10,7 +11,8 @@ import re
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-from PySide6.QtWidgets import QInputDialog, QMessageBox
+from PySide6.QtCore import QEventLoop
+from PySide6.QtWidgets import QApplication, QInputDialog, QMessageBox
 
 from src.processing.telemetry_processing import (
     AmbiguousTelemetryAlignmentError,
@@ -23,6 +25,7 @@ from src.processing.telemetry_processing import (
     parse_recording_date,
     upsample_telemetry_data,
 )
+from src.processing.telemetry_series import TelemetrySeries
 
 
 logger = logging.getLogger(__name__)
@@ -141,68 +144,95 @@ class TelemetryPlotService:
         selected_index = choices.index(selected_label)
         return pd.Timestamp(candidates[selected_index]["target_datetime"])
 
-    def _extract_data_with_alignment_choice(
+    def _extract_telemetry_files(
         self,
-        file_path,
-        sheet_name,
+        file_paths,
         target_date,
         target_time,
         duration,
         selected_alignment_datetime=None,
     ):
-        try:
-            return (
-                self.extract_data_for_date_and_offset(
+        """Run ``extract_data_for_date_and_offset`` for each file on a worker pool.
+
+        Returns a dict with each label's result, or the
+        ``AmbiguousTelemetryAlignmentError`` it raised; other errors propagate.
+        Qt keeps repainting (but ignores user input) until all files are loaded.
+        """
+        with ThreadPoolExecutor(
+            max_workers=len(file_paths), thread_name_prefix="telemetry-load"
+        ) as pool:
+            futures = {
+                label: pool.submit(
+                    self.extract_data_for_date_and_offset,
                     file_path,
-                    sheet_name,
-                    target_date,
-                    target_time,
-                    duration,
-                    selected_alignment_datetime,
-                ),
-                selected_alignment_datetime,
-            )
-        except AmbiguousTelemetryAlignmentError as exc:
-            selected_alignment_datetime = self._prompt_for_alignment_candidate(
-                exc.candidates
-            )
-            if selected_alignment_datetime is None:
-                return None, None
-            return (
-                self.extract_data_for_date_and_offset(
-                    file_path,
-                    sheet_name,
+                    self.app.mouse_name,
                     target_date,
                     target_time,
                     duration,
                     selected_alignment_datetime,
-                ),
-                selected_alignment_datetime,
-            )
-
-    def _extract_overlay_dataframe(
+                )
+                for label, file_path in file_paths.items()
+            }
+            pending = set(futures.values())
+            while pending:
+                _, pending = wait(pending, timeout=0.05)
+                if QApplication.instance() is not None:
+                    QApplication.processEvents(
+                        QEventLoop.ProcessEventsFlag.ExcludeUserInputEvents
+                    )
+
+        results = {}
+        for label, future in futures.items():
+            try:
+                results[label] = future.result()
+            except AmbiguousTelemetryAlignmentError as exc:
+                results[label] = exc
+        return results
+
+    def _extract_with_alignment_choice(
         self,
-        file_path,
-        sheet_name,
+        file_paths,
         target_date,
         target_time,
-        extraction_duration,
-        extended_duration,
-        selected_alignment_datetime,
-        label,
-        data_type,
+        duration,
     ):
-        result, selected_alignment_datetime = self._extract_data_with_alignment_choice(
-            file_path,
-            sheet_name,
+        """Load all telemetry files, prompting once if any alignment date is ambiguous.
+
+        After a choice every file is reloaded with it, so they share one anchor.
+        Returns ``None`` if the prompt is cancelled.
+        """
+        results = self._extract_telemetry_files(
+            file_paths, target_date, target_time, duration
+        )
+        ambiguous = [
+            result
+            for result in results.values()
+            if isinstance(result, AmbiguousTelemetryAlignmentError)
+        ]
+        if not ambiguous:
+            return results
+
+        selected_alignment_datetime = self._prompt_for_alignment_candidate(
+            ambiguous[0].candidates
+        )
+        if selected_alignment_datetime is None:
+            return None
+        return self._extract_telemetry_files(
+            file_paths,
             target_date,
             target_time,
-            extraction_duration,
+            duration,
             selected_alignment_datetime,
         )
-        if result is None:
-            return None, selected_alignment_datetime
 
+    def _build_overlay_dataframe(
+        self,
+        result,
+        extraction_duration,
+        extended_duration,
+        label,
+        data_type,
+    ):
         telemetry_data, offset, previous_time = result
         logger.info(
             "%s telemetry selected anchor %s with %.3f minute offset.",
@@ -220,22 +250,22 @@ class TelemetryPlotService:
             sample_rate,
             data_type,
         )
+        # The buffered window feeds cluster extraction; as a series it is a
+        # view of the source arrays sliced by index arithmetic.
         extended_df = self.extract_data_with_buffer(
-            telemetry_data,
+            TelemetrySeries.from_frame(telemetry_data),
             previous_time,
             offset,
             extended_duration,
             sample_rate,
         )
-        return (
-            {
-                "source_data": telemetry_data,
-                "sample_rate": sample_rate,
-                "trimmed": trimmed_df,
-                "extended": extended_df,
-            },
-            selected_alignment_datetime,
-        )
+        return {
+            "source_data": telemetry_data,
+            "sample_rate": sample_rate,
+            "trimmed": trimmed_df,
+            # A slice of the whole file; keep only the buffered window alive.
+            "extended": extended_df.copy(),
+        }
 
     def _get_display_time_offset_minutes(self) -> float:
         if getattr(self.app, "data_type", None) != "photometry":
@@ -271,10 +301,12 @@ class TelemetryPlotService:
         return self._get_full_baseline_reference_column(selected_column_var.get())
 
     def _shift_overlay_time_axis(
-        self, dataframe: pd.DataFrame | None, minutes: float
-    ) -> pd.DataFrame | None:
+        self, dataframe: pd.DataFrame | TelemetrySeries | None, minutes: float
+    ) -> pd.DataFrame | TelemetrySeries | None:
         if dataframe is None:
             return None
+        if isinstance(dataframe, TelemetrySeries):
+            return dataframe.shifted(-minutes)
         if dataframe.empty or minutes == 0:
             return dataframe.copy()
 
@@ -1035,8 +1067,6 @@ class TelemetryPlotService:
         display_offset_minutes = self._get_display_time_offset_minutes()
         extraction_duration = full_duration
         extended_duration = full_duration + 60
-        act_data = None
-        temp_data = None
         self.app.raw_aligned_act_data = None
         self.app.raw_extended_act_data = None
         self.app.raw_aligned_temp_data = None
@@ -1067,75 +1097,53 @@ class TelemetryPlotService:
             display_offset_minutes,
         )
 
-        selected_alignment_datetime = None
+        # Activity first: its candidates are offered if both files are ambiguous.
+        file_paths = {
+            label: file_path
+            for label, file_path in (
+                ("Activity", act_file_path),
+                ("Temperature", temp_file_path),
+            )
+            if file_path is not None
+        }
+        results = self._extract_with_alignment_choice(
+            file_paths,
+            formatted_date,
+            target_time,
+            extraction_duration,
+        )
+        if results is None:
+            return None, None
+
         act_overlay = None
         temp_overlay = None
-        if act_file_path is not None:
-            act_overlay, selected_alignment_datetime = self._extract_overlay_dataframe(
-                act_file_path,
-                self.app.mouse_name,
-                formatted_date,
-                target_time,
+        if "Activity" in results:
+            act_overlay = self._build_overlay_dataframe(
+                results["Activity"],
                 extraction_duration,
                 extended_duration,
-                selected_alignment_datetime,
                 "Activity",
                 "act",
             )
-            if act_overlay is None:
-                return None, None
-
-        if temp_file_path is not None:
-            selected_before_temp = selected_alignment_datetime
-            temp_overlay, selected_alignment_datetime = self._extract_overlay_dataframe(
-                temp_file_path,
-                self.app.mouse_name,
-                formatted_date,
-                target_time,
+        if "Temperature" in results:
+            temp_overlay = self._build_overlay_dataframe(
+                results["Temperature"],
                 extraction_duration,
                 extended_duration,
-                selected_alignment_datetime,
                 "Temperature",
                 "temp",
             )
-            if temp_overlay is None:
-                return None, None
-
-            if (
-                selected_before_temp is None
-                and selected_alignment_datetime is not None
-                and act_file_path is not None
-            ):
-                act_overlay, _ = self._extract_overlay_dataframe(
-                    act_file_path,
-                    self.app.mouse_name,
-                    formatted_date,
-                    target_time,
-                    extraction_duration,
-                    extended_duration,
-                    selected_alignment_datetime,
-                    "Activity",
-                    "act",
-                )
-                if act_overlay is None:
-                    return None, None
 
         if act_overlay is not None:
-            act_data = act_overlay["source_data"]
             self.app.act_sample_rate = act_overlay["sample_rate"]
             self.app.raw_extended_act_data = act_overlay["extended"]
             self.app.raw_aligned_act_data = act_overlay["trimmed"]
 
         if temp_overlay is not None:
-            temp_data = temp_overlay["source_data"]
             self.app.temp_sample_rate = temp_overlay["sample_rate"]
             self.app.raw_extended_temp_data = temp_overlay["extended"]
             self.app.raw_aligned_temp_data = temp_overlay["trimmed"]
 
-        if self.app.data_type == "photometry" and temp_data is not None:
-            temp_data = self.upsample_data(temp_data)
-            temp_sample_rate = 0.1
-
         self.apply_cached_telemetry_for_current_display()
         trimmed_temp_df = self.app.temp_data
         trimmed_act_df = self.app.act_data
@@ -7,6 +7,7 @@ import re
 import pandas as pd
 
 from src.processing.telemetry_processing import get_universal_times
+from src.processing.telemetry_series import TelemetrySeries
 
 
 def _parse_optional_float(value) -> float | None:
@@ -203,15 +204,39 @@ def find_longest_cluster_times(data_dict: dict, cluster_number=None) -> tuple[fl
     return longest_pre_peak, longest_post_peak
 
 
+def _cluster_window(
+    extended_data: pd.DataFrame | TelemetrySeries,
+    universal_start_time: float,
+    universal_end_time: float,
+    alignment_time: float,
+    cluster_name: str,
+) -> pd.DataFrame:
+    if isinstance(extended_data, TelemetrySeries):
+        window = extended_data.window(universal_start_time, universal_end_time)
+        return window.to_frame(alignment_time, **{"Cluster Name": cluster_name})
+
+    window = extended_data[
+        (extended_data["Time (min)"] >= universal_start_time)
+        & (extended_data["Time (min)"] <= universal_end_time)
+    ].reset_index(drop=True)
+    window["Time (min)"] -= alignment_time
+    window["Cluster Name"] = cluster_name
+    return window
+
+
 def process_cluster_window(
     cluster_data: dict,
     longest_pre_peak: float,
     longest_post_peak: float,
-    extended_temp_data: pd.DataFrame,
-    extended_act_data: pd.DataFrame,
+    extended_temp_data: pd.DataFrame | TelemetrySeries,
+    extended_act_data: pd.DataFrame | TelemetrySeries,
     is_stim: bool = False,
 ) -> tuple[pd.DataFrame, pd.DataFrame]:
-    """Extract aligned temp/activity windows for a single cluster."""
+    """Extract aligned temp/activity windows for a single cluster.
+
+    ``TelemetrySeries`` inputs are sliced by index arithmetic, so only the
+    window itself is copied into the returned frame.
+    """
     if is_stim:
         stim_start = cluster_data["stim_start"]
         stim_end = cluster_data["stim_end"]
@@ -228,21 +253,12 @@ def process_cluster_window(
         )
         cluster_name = cluster_data["name"]
 
-    truncated_temp_data = extended_temp_data[
-        (extended_temp_data["Time (min)"] >= universal_start_time)
-        & (extended_temp_data["Time (min)"] <= universal_end_time)
-    ].copy()
-    truncated_act_data = extended_act_data[
-        (extended_act_data["Time (min)"] >= universal_start_time)
-        & (extended_act_data["Time (min)"] <= universal_end_time)
-    ].copy()
-
-    truncated_temp_data["Time (min)"] -= alignment_time
-    truncated_act_data["Time (min)"] -= alignment_time
-    truncated_temp_data.reset_index(drop=True, inplace=True)
-    truncated_act_data.reset_index(drop=True, inplace=True)
-    truncated_temp_data["Cluster Name"] = cluster_name
-    truncated_act_data["Cluster Name"] = cluster_name
+    truncated_temp_data = _cluster_window(
+        extended_temp_data, universal_start_time, universal_end_time, alignment_time, cluster_name
+    )
+    truncated_act_data = _cluster_window(
+        extended_act_data, universal_start_time, universal_end_time, alignment_time, cluster_name
+    )
     return truncated_temp_data, truncated_act_data
 
 
@@ -250,8 +266,8 @@ def process_data_for_clusters(
     clusters: list[dict],
     longest_pre_peak: float,
     longest_post_peak: float,
-    extended_temp_data: pd.DataFrame,
-    extended_act_data: pd.DataFrame,
+    extended_temp_data: pd.DataFrame | TelemetrySeries,
+    extended_act_data: pd.DataFrame | TelemetrySeries,
     is_stim: bool = False,
 ) -> tuple[list[pd.DataFrame], list[pd.DataFrame]]:
     """Extract aligned temp/activity windows for many clusters."""
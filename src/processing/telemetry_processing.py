@@ -7,7 +7,7 @@ types, NumPy arrays, or pandas DataFrames.
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
 from pathlib import Path
 import logging
 import re
@@ -15,9 +15,18 @@ import re
 import numpy as np
 import pandas as pd
 
+from src.processing.telemetry_sheet_cache import telemetry_sheet_cache
+from src.processing.telemetry_sheet_reader import read_telemetry_sheet
+from src.processing.telemetry_sheet_reader import resolve_sheet_name as _resolve_sheet_name  # noqa: F401
+from src.processing.telemetry_series import TelemetrySeries
 
 logger = logging.getLogger(__name__)
 
+_NAT = np.iinfo(np.int64).min
+_NS_PER_DAY = 86_400 * 10**9
+_UPSAMPLE_INTERVAL_NS = 100 * 10**6
+_CLOCK_TIME = re.compile(r"(\d{2}):(\d{2}):(\d{2})")
+
 
 class AmbiguousTelemetryAlignmentError(ValueError):
     """Raised when more than one telemetry start date can cover the recording."""
@@ -403,46 +412,87 @@ def calculate_nighttime_periods(
     return [(night_start.time(), night_end.time())]
 
 
+class _TimestampIndex:
+    """``Date Time`` column of a telemetry frame as int64 nanoseconds.
+
+    Built once per frame, so anchor lookups are a ``searchsorted`` on a sorted
+    column (a masked scan otherwise) instead of a datetime parse per lookup.
+    Unparseable timestamps are stored as NaT (the int64 minimum) and never match.
+    """
+
+    def __init__(self, dataframe: pd.DataFrame | TelemetrySeries):
+        if isinstance(dataframe, TelemetrySeries):
+            self.ns = dataframe.times
+        else:
+            column = dataframe["Date Time"]
+            if not pd.api.types.is_datetime64_dtype(column):
+                column = pd.to_datetime(column, errors="coerce")
+            self.ns = column.to_numpy(dtype="datetime64[ns]").view(np.int64)
+        self.valid = self.ns != _NAT
+        # NaT sorts first, so a frame with leading NaT rows still counts as sorted.
+        self.is_sorted = bool(np.all(self.ns[1:] >= self.ns[:-1]))
+
+    def __len__(self) -> int:
+        return len(self.ns)
+
+    def last_at_or_before(self, timestamp: pd.Timestamp) -> int | None:
+        """Return the position of the last row stamped at/before *timestamp*."""
+        target = pd.Timestamp(timestamp).as_unit("ns").value
+        if self.is_sorted:
+            position = int(np.searchsorted(self.ns, target, side="right")) - 1
+            return position if position >= 0 and self.valid[position] else None
+        positions = np.flatnonzero(self.valid & (self.ns <= target))
+        return int(positions[-1]) if len(positions) else None
+
+    def time_of_day(self) -> np.ndarray:
+        """Return each row's clock time as nanoseconds since midnight."""
+        return self.ns % _NS_PER_DAY
+
+    def timestamp(self, position: int) -> pd.Timestamp:
+        return pd.Timestamp(int(self.ns[position]))
+
+
+def _clock_time_ns(value: time) -> int:
+    return ((value.hour * 60 + value.minute) * 60 + value.second) * 10**9 + value.microsecond * 1000
+
+
 def find_offset_for_previous_time(
     dataframe: pd.DataFrame,
     target_time_str: str,
 ) -> tuple[float | None, str | None]:
     """Return the offset in minutes to the last timestamp before *target_time_str*."""
-    working_df = dataframe.copy()
-    working_df["DateTime"] = pd.to_datetime(working_df["Date Time"])
-    target_time = pd.to_datetime(target_time_str).time()
+    index = _TimestampIndex(dataframe)
+    target_clock = _clock_time_ns(pd.to_datetime(target_time_str).time())
 
-    working_df["Offset"] = working_df["DateTime"].apply(
-        lambda value: (datetime.combine(value.date(), target_time) - value)
-        if value.time() < target_time
-        else pd.Timedelta(days=1)
-    )
-
-    before_target = working_df[working_df["Offset"] < pd.Timedelta(days=1)]
-    if before_target.empty:
+    # Rows whose clock time is before the target on their own day.
+    clock = index.time_of_day()
+    before_target = np.flatnonzero(index.valid & (clock < target_clock))
+    if len(before_target) == 0:
         return None, None
 
-    last_row_before_target = before_target.iloc[-1]
-    offset_minutes = last_row_before_target["Offset"].total_seconds() / 60
-    prev_time_from_data = last_row_before_target["DateTime"].strftime("%H:%M:%S")
+    last_row_before_target = int(before_target[-1])
+    offset_minutes = (target_clock - int(clock[last_row_before_target])) / 1e9 / 60
+    prev_time_from_data = index.timestamp(last_row_before_target).strftime("%H:%M:%S")
     return offset_minutes, prev_time_from_data
 
 
 def _find_alignment_anchor(
     dataframe: pd.DataFrame,
     target_datetime: pd.Timestamp,
+    index: _TimestampIndex | None = None,
 ) -> tuple[float | None, pd.Timestamp | None, int | None]:
     """Return the nearest sample at/before *target_datetime* and its row index."""
     if dataframe.empty:
         return None, None, None
 
-    date_times = pd.to_datetime(dataframe["Date Time"], errors="coerce")
-    before_target = date_times[date_times <= target_datetime]
-    if before_target.empty:
+    if index is None:
+        index = _TimestampIndex(dataframe)
+    position = index.last_at_or_before(target_datetime)
+    if position is None:
         return None, None, None
 
-    anchor_index = int(before_target.index[-1])
-    previous_timestamp = pd.Timestamp(before_target.iloc[-1])
+    anchor_index = int(dataframe.index[position])
+    previous_timestamp = index.timestamp(position)
     offset_minutes = (target_datetime - previous_timestamp).total_seconds() / 60
     if offset_minutes < 0:
         return None, None, None
@@ -467,15 +517,18 @@ def _build_alignment_candidates(
     dataframe: pd.DataFrame,
     target_date,
     target_time: str,
+    index: _TimestampIndex | None = None,
 ) -> list[dict]:
     alignment_candidates = []
     if dataframe.empty:
         return alignment_candidates
 
+    if index is None:
+        index = _TimestampIndex(dataframe)
     last_timestamp = pd.Timestamp(dataframe["Date Time"].iloc[-1])
     for target_datetime in _candidate_target_datetimes(target_date, target_time):
         offset, previous_timestamp, anchor_index = _find_alignment_anchor(
-            dataframe, target_datetime
+            dataframe, target_datetime, index
         )
         if previous_timestamp is None or anchor_index is None:
             continue
@@ -544,52 +597,64 @@ def _select_alignment_candidate(
     return max(candidates, key=lambda candidate: candidate["available_minutes"])
 
 
-def _rows_matching_alignment_time(dataframe: pd.DataFrame, previous_time):
-    date_time_series = pd.to_datetime(dataframe["Date Time"], errors="coerce")
+def _alignment_start_position(dataframe: pd.DataFrame | TelemetrySeries, previous_time) -> int | None:
+    """Return the position of the first row stamped at the alignment time, if any.
+
+    An absolute *previous_time* must match a timestamp exactly; an ``HH:MM:SS``
+    string matches the first row at that clock time on any day.
+    """
+    index = _TimestampIndex(dataframe)
     absolute_timestamp = _alignment_timestamp(previous_time)
     if absolute_timestamp is not None:
-        return dataframe[date_time_series == absolute_timestamp]
-
-    previous_time_str = str(previous_time)
-    return dataframe[date_time_series.dt.strftime("%H:%M:%S") == previous_time_str]
-
-
-def _resolve_sheet_name(sheet_names: list[str], target_name: str) -> str:
-    """Return the matching sheet name, falling back to a case-insensitive match."""
-    if target_name in sheet_names:
-        return target_name
-
-    target_name_upper = target_name.upper()
-    sheet_names_upper = [name.upper() for name in sheet_names]
-    if target_name_upper in sheet_names_upper:
-        return sheet_names[sheet_names_upper.index(target_name_upper)]
+        matches = index.ns == absolute_timestamp.as_unit("ns").value
+    else:
+        clock = _CLOCK_TIME.fullmatch(str(previous_time))
+        if clock is None:
+            return None
+        hours, minutes, seconds = (int(part) for part in clock.groups())
+        if hours > 23 or minutes > 59 or seconds > 59:
+            return None
+        target_second = (hours * 60 + minutes) * 60 + seconds
+        matches = index.valid & (index.time_of_day() // 10**9 == target_second)
+    positions = np.flatnonzero(matches)
+    return int(positions[0]) if len(positions) else None
+
+
+def _extract_sheet_table(
+    file_path: str | Path,
+    sheet_name: str,
+    since: pd.Timestamp | None = None,
+) -> pd.DataFrame:
+    """Load a telemetry worksheet and return the tabular portion below the header label.
 
-    raise ValueError(f"Sheet name '{target_name}' not found in the Excel file.")
+    Converted sheets are kept in the telemetry sheet cache, so reloading an
+    unchanged workbook skips the xlsx parse. With *since*, only rows from
+    *since* onward (plus the latest sample before it) are returned.
+    """
+    sheet_cache = telemetry_sheet_cache()
+    data = sheet_cache.load(file_path, sheet_name)
+    if data is None:
+        # The whole sheet is converted once so later dates hit the cache too.
+        data = _parse_sheet_table(file_path, sheet_name)
+        sheet_cache.store(file_path, sheet_name, data)
+    return data if since is None else _rows_since(data, since)
 
 
-def _extract_sheet_table(file_path: str | Path, sheet_name: str) -> pd.DataFrame:
-    """Load a telemetry worksheet and return the tabular portion below the header label."""
-    excel_file = pd.ExcelFile(file_path)
-    correct_sheet_name = _resolve_sheet_name(excel_file.sheet_names, sheet_name)
-    data = pd.read_excel(file_path, sheet_name=correct_sheet_name)
+def _parse_sheet_table(file_path: str | Path, sheet_name: str) -> pd.DataFrame:
+    return read_telemetry_sheet(file_path, sheet_name).to_frame()
 
-    if "Time" not in data.columns:
-        time_label_row = data[data.eq("Time").any(axis=1)]
-        if time_label_row.empty:
-            raise ValueError("Couldn't locate the 'Time' label in the data.")
-        start_data_index = time_label_row.index[0] + 1
-    else:
-        start_data_index = data[data["Time"] == "Time"].index[0] + 1
 
-    data = data.iloc[start_data_index:]
-    data.columns = [str(col).upper() for col in data.columns]
+def _rows_since(data: pd.DataFrame, since: pd.Timestamp) -> pd.DataFrame:
+    """Keep rows stamped at/after *since* and the latest row before it.
 
-    sheet_name_upper = sheet_name.upper()
-    if sheet_name_upper in data.columns:
-        data = data.rename(columns={"NAME": "Date Time", sheet_name_upper: "Data"})
-
-    data["Date Time"] = pd.to_datetime(data["Date Time"], errors="coerce")
-    return data
+    That row keeps "last sample at/before t" lookups unchanged for t >= since.
+    """
+    date_times = data["Date Time"]
+    keep = np.array(date_times >= since)
+    earlier = date_times.where(date_times < since)
+    if earlier.notna().any():
+        keep[data.index.get_loc(earlier.idxmax())] = True
+    return data[keep]
 
 
 def extract_data_for_date_and_offset(
@@ -601,7 +666,9 @@ def extract_data_for_date_and_offset(
     selected_alignment_datetime=None,
 ) -> tuple[pd.DataFrame, float | None, str | pd.Timestamp | None]:
     """Load telemetry data for *target_date* and locate its alignment offset."""
-    data = _extract_sheet_table(file_path, sheet_name)
+    # Alignment candidates start no earlier than the day before target_date.
+    earliest_candidate = pd.Timestamp(pd.to_datetime(target_date).date()) - pd.Timedelta(days=1)
+    data = _extract_sheet_table(file_path, sheet_name, since=earliest_candidate)
     data = data.dropna(subset=["Date Time"]).sort_values("Date Time")
 
     dup_count = data["Date Time"].duplicated().sum()
@@ -610,9 +677,14 @@ def extract_data_for_date_and_offset(
         logger.info("Removed %s duplicate timestamps from telemetry.", dup_count)
 
     data = data.reset_index(drop=True)
-    target_date_parsed = pd.to_datetime(target_date).date()
-    date_data = data[data["Date Time"].dt.date >= target_date_parsed].copy()
-    target_day_data = data[data["Date Time"].dt.date == target_date_parsed]
+    # Sorted, NaT-free and deduplicated: day boundaries are searchsorted positions.
+    index = _TimestampIndex(data)
+    target_day = pd.Timestamp(pd.to_datetime(target_date).date()).as_unit("ns")
+    day_start, day_end = np.searchsorted(
+        index.ns, [target_day.value, (target_day + pd.Timedelta(days=1)).value]
+    )
+    date_data = data.iloc[day_start:].copy()
+    target_day_data = data.iloc[day_start:day_end]
 
     total_points = len(date_data)
     missing_points = date_data["Data"].isna().sum() if "Data" in date_data else 0
@@ -625,7 +697,7 @@ def extract_data_for_date_and_offset(
             )
 
     alignment_candidates = _build_alignment_candidates(
-        data, target_date, target_time
+        data, target_date, target_time, index
     )
     if alignment_candidates:
         selected_candidate = _select_alignment_candidate(
@@ -645,74 +717,88 @@ def extract_data_for_date_and_offset(
 
 
 def extract_and_trim_data(
-    dataframe: pd.DataFrame,
+    dataframe: pd.DataFrame | TelemetrySeries,
     previous_time,
     offset: float,
     duration: float,
     sample_rate: float,
-) -> pd.DataFrame:
-    """Trim a telemetry dataframe to the requested duration and build a relative time axis."""
+) -> pd.DataFrame | TelemetrySeries:
+    """Trim telemetry to the requested duration and build a relative time axis.
+
+    A ``TelemetrySeries`` comes back as a series whose axis starts at zero.
+    """
     if previous_time in (None, "") or offset is None:
         raise ValueError(
             "The selected alignment time is earlier than the first telemetry sample "
             "available for that date."
         )
 
-    matching_rows = _rows_matching_alignment_time(dataframe, previous_time)
-    if matching_rows.empty:
+    start_index = _alignment_start_position(dataframe, previous_time)
+    if start_index is None:
         raise ValueError(
             f"Could not locate telemetry samples matching the alignment time {previous_time}."
         )
 
-    start_index = dataframe.index.get_loc(matching_rows.index[0])
     num_data_points = int(((duration + offset) * 60) / sample_rate)
-    extracted_data = dataframe.iloc[start_index : start_index + num_data_points]
-
     rows_to_trim = int(np.ceil((offset * 60) / sample_rate))
+    if isinstance(dataframe, TelemetrySeries):
+        extracted_data = dataframe[start_index : start_index + num_data_points]
+        return extracted_data[rows_to_trim:].with_axis(sample_rate)
+
+    extracted_data = dataframe.iloc[start_index : start_index + num_data_points]
     trimmed_df = extracted_data.iloc[rows_to_trim:].copy()
-    trimmed_df["Time (min)"] = [(i * (sample_rate / 60)) for i in range(len(trimmed_df))]
+    trimmed_df["Time (min)"] = np.arange(len(trimmed_df)) * (sample_rate / 60)
     return trimmed_df
 
 
 def extract_data_with_buffer(
-    dataframe: pd.DataFrame,
+    dataframe: pd.DataFrame | TelemetrySeries,
     offset: float,
     sample_rate: float,
     previous_time=None,
     duration: float | None = None,
-) -> pd.DataFrame:
-    """Return a copy of *dataframe* with a relative time axis that includes the leading buffer."""
-    if dataframe.empty:
-        return dataframe.copy()
+) -> pd.DataFrame | TelemetrySeries:
+    """Return a copy of *dataframe* with a relative time axis that includes the leading buffer.
 
-    extracted_extended_data = dataframe.copy()
+    A ``TelemetrySeries`` comes back as a view whose axis starts at ``-offset``.
+    """
+    if dataframe.empty:
+        return dataframe if isinstance(dataframe, TelemetrySeries) else dataframe.copy()
 
-    if "Offset" in extracted_extended_data.columns:
-        start_offset = extracted_extended_data.iloc[0]["Offset"].total_seconds() / 60
+    extracted_extended_data = dataframe
+    if isinstance(dataframe, pd.DataFrame) and "Offset" in dataframe.columns:
+        start_offset = dataframe.iloc[0]["Offset"].total_seconds() / 60
     else:
         start_offset = float(offset)
 
         if previous_time:
-            matching_rows = _rows_matching_alignment_time(dataframe, previous_time)
-            if not matching_rows.empty:
-                start_index = dataframe.index.get_loc(matching_rows.index[0])
+            start_index = _alignment_start_position(dataframe, previous_time)
+            if start_index is not None:
+                end_index = None
                 if duration is not None:
-                    num_data_points = int(((duration + offset) * 60) / sample_rate)
-                    extracted_extended_data = dataframe.iloc[
-                        start_index : start_index + num_data_points
-                    ].copy()
+                    end_index = start_index + int(((duration + offset) * 60) / sample_rate)
+                if isinstance(dataframe, TelemetrySeries):
+                    extracted_extended_data = dataframe[start_index:end_index]
                 else:
-                    extracted_extended_data = dataframe.iloc[start_index:].copy()
+                    extracted_extended_data = dataframe.iloc[start_index:end_index]
 
-    extracted_extended_data = extracted_extended_data.reset_index(drop=True)
-    extracted_extended_data["Time (min)"] = [
-        (i * (sample_rate / 60) - start_offset) for i in range(len(extracted_extended_data))
-    ]
+    if isinstance(extracted_extended_data, TelemetrySeries):
+        return extracted_extended_data.with_axis(sample_rate, start_offset)
+
+    extracted_extended_data = extracted_extended_data.reset_index(drop=True).copy()
+    extracted_extended_data["Time (min)"] = (
+        np.arange(len(extracted_extended_data)) * (sample_rate / 60) - start_offset
+    )
     return extracted_extended_data
 
 
-def upsample_telemetry_data(dataframe: pd.DataFrame) -> pd.DataFrame:
+def upsample_telemetry_data(
+    dataframe: pd.DataFrame | TelemetrySeries,
+) -> pd.DataFrame | TelemetrySeries:
     """Upsample telemetry data to 100 ms resolution using linear interpolation."""
+    if isinstance(dataframe, TelemetrySeries):
+        return _upsample_series(dataframe)
+
     working_df = dataframe.copy()
     if "DateTime" not in working_df.columns:
         if "Date Time" not in working_df.columns:
@@ -732,6 +818,32 @@ def upsample_telemetry_data(dataframe: pd.DataFrame) -> pd.DataFrame:
     return upsampled_df[["Date Time", "Data", "DateTime", "Offset"]]
 
 
+def _upsample_series(series: TelemetrySeries) -> TelemetrySeries:
+    # Same grid as resample("100ms"): from the first timestamp's 100 ms bin to the last sample.
+    if series.empty:
+        return series.with_axis(_UPSAMPLE_INTERVAL_NS / 1e9, series.anchor_offset)
+    origin = int(series.times[0])
+    start = origin // _UPSAMPLE_INTERVAL_NS * _UPSAMPLE_INTERVAL_NS
+    grid = np.arange(start, int(series.times[-1]) + 1, _UPSAMPLE_INTERVAL_NS, dtype=np.int64)
+    valid = ~np.isnan(series.values)
+    if not valid.any():
+        values = np.full(len(grid), np.nan)
+    else:
+        values = np.interp(
+            grid - origin,
+            series.times[valid] - origin,
+            series.values[valid],
+            left=np.nan,
+            right=np.nan,
+        )
+    return TelemetrySeries(
+        grid,
+        values.astype(np.float32),
+        _UPSAMPLE_INTERVAL_NS / 1e9,
+        series.anchor_offset - (start - origin) / (60 * 10**9),
+    )
+
+
 def calculate_stim_timings(
     stim_data_df: pd.DataFrame,
     start_time_str: str,
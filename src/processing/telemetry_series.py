@@ -0,0 +1,174 @@
+"""
+Array-backed telemetry channel with an implicit relative time axis.
+
+The aligned telemetry frames carried a ``Date Time`` column, float64 values
+and a ``Time (min)`` column rebuilt for every slice, and each cluster window
+masked and copied the whole frame. ``TelemetrySeries`` keeps one channel as
+int64 nanosecond timestamps and float32 values. Its relative time axis is
+never stored: sample ``i`` sits at ``i * sample_interval / 60 - anchor_offset``
+minutes when the samples are uniform, and at its timestamp's distance from the
+first sample otherwise. Time-to-index lookups are O(1) for uniform series and a
+``searchsorted`` for the rest, slices are views, and shifting the axis only
+changes ``anchor_offset``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+
+import numpy as np
+import pandas as pd
+
+
+TIMESTAMP_COLUMN = "Date Time"
+VALUE_COLUMN = "Data"
+TIME_COLUMN = "Time (min)"
+_NS_PER_MINUTE = 60 * 10**9
+
+
+def detect_sample_interval(times: np.ndarray) -> float | None:
+    """Return the spacing of *times* (int64 ns) in seconds, or None if it is not uniform."""
+    if len(times) < 2:
+        return None
+    steps = np.diff(times)
+    if steps[0] <= 0 or not np.all(steps == steps[0]):
+        return None
+    return float(steps[0]) / 1e9
+
+
+@dataclass(frozen=True)
+class TelemetrySeries:
+    """One telemetry channel on a relative minutes axis.
+
+    ``times`` holds int64 nanosecond timestamps in ascending order and
+    ``values`` the float32 samples. ``sample_interval`` is the spacing in
+    seconds that defines the axis of a uniform series (None for irregular
+    samples), and ``anchor_offset`` is how many minutes the first sample lies
+    before time zero.
+    """
+
+    times: np.ndarray
+    values: np.ndarray
+    sample_interval: float | None = None
+    anchor_offset: float = 0.0
+
+    def __post_init__(self) -> None:
+        if len(self.times) != len(self.values):
+            raise ValueError("TelemetrySeries times and values must have the same length.")
+        if self.sample_interval is not None and not self.sample_interval > 0:
+            raise ValueError("TelemetrySeries sample_interval must be positive.")
+
+    @classmethod
+    def from_frame(
+        cls,
+        dataframe: pd.DataFrame,
+        sample_interval: float | None = None,
+        anchor_offset: float = 0.0,
+    ) -> "TelemetrySeries":
+        """Build a series from the ``Date Time`` and ``Data`` columns of a telemetry frame.
+
+        Without *sample_interval* the spacing is detected from the timestamps.
+        """
+        date_times = dataframe[TIMESTAMP_COLUMN]
+        if not pd.api.types.is_datetime64_dtype(date_times):
+            date_times = pd.to_datetime(date_times, errors="coerce")
+        times = date_times.to_numpy(dtype="datetime64[ns]").view(np.int64)
+        values = pd.to_numeric(dataframe[VALUE_COLUMN], errors="coerce").to_numpy(dtype=np.float32)
+        if sample_interval is None:
+            sample_interval = detect_sample_interval(times)
+        return cls(times, values, sample_interval, float(anchor_offset))
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def __getitem__(self, key: slice) -> "TelemetrySeries":
+        """Return the samples in *key* as a view, keeping their axis positions."""
+        if not isinstance(key, slice) or key.step not in (None, 1):
+            raise TypeError("TelemetrySeries only supports contiguous slices.")
+        start = range(len(self))[key].start
+        return replace(
+            self,
+            times=self.times[key],
+            values=self.values[key],
+            anchor_offset=-self._minutes_at(start) if start < len(self) else self.anchor_offset,
+        )
+
+    @property
+    def empty(self) -> bool:
+        return len(self) == 0
+
+    @property
+    def nbytes(self) -> int:
+        return self.times.nbytes + self.values.nbytes
+
+    @property
+    def minutes(self) -> np.ndarray:
+        """Return the relative time axis in minutes."""
+        if self.sample_interval is not None:
+            return np.arange(len(self)) * (self.sample_interval / 60) - self.anchor_offset
+        if self.empty:
+            return np.empty(0)
+        return (self.times - self.times[0]) / _NS_PER_MINUTE - self.anchor_offset
+
+    def _minutes_at(self, position: int) -> float:
+        if self.sample_interval is not None:
+            return position * (self.sample_interval / 60) - self.anchor_offset
+        return (int(self.times[position]) - int(self.times[0])) / _NS_PER_MINUTE - self.anchor_offset
+
+    def position(self, minutes: float, side: str = "left") -> int:
+        """Return where *minutes* falls on the axis, like ``np.searchsorted(self.minutes, minutes, side)``."""
+        count = len(self)
+        if count == 0 or np.isnan(minutes):
+            return count
+        # Estimate from the interval (or the timestamps), then step over
+        # floating-point rounding at the boundary.
+        if self.sample_interval is not None:
+            estimate = np.ceil((minutes + self.anchor_offset) / (self.sample_interval / 60))
+            guess = int(np.clip(estimate, 0, count))
+        else:
+            target = int(self.times[0]) + (minutes + self.anchor_offset) * _NS_PER_MINUTE
+            guess = int(np.searchsorted(self.times, target, side=side))
+
+        def before(index: int) -> bool:
+            value = self._minutes_at(index)
+            return value < minutes if side == "left" else value <= minutes
+
+        while guess > 0 and not before(guess - 1):
+            guess -= 1
+        while guess < count and before(guess):
+            guess += 1
+        return guess
+
+    def window(self, start: float, end: float) -> "TelemetrySeries":
+        """Return the samples with ``start <= minutes <= end`` as a view."""
+        first = self.position(start, side="left")
+        last = self.position(end, side="right")
+        return self[first:max(first, last)]
+
+    def with_axis(self, sample_interval: float | None, anchor_offset: float = 0.0) -> "TelemetrySeries":
+        """Return the same samples on a new time axis."""
+        return replace(self, sample_interval=sample_interval, anchor_offset=float(anchor_offset))
+
+    def shifted(self, minutes: float) -> "TelemetrySeries":
+        """Return the same samples with the time axis moved by *minutes*."""
+        return replace(self, anchor_offset=self.anchor_offset - minutes)
+
+    def copy(self) -> "TelemetrySeries":
+        """Return the series with its own arrays, releasing the ones it was sliced from."""
+        return replace(self, times=self.times.copy(), values=self.values.copy())
+
+    def to_frame(self, origin: float = 0.0, **columns) -> pd.DataFrame:
+        """Return a ``Date Time``/``Data``/``Time (min)`` frame, times relative to *origin*.
+
+        Values are widened through their shortest float32 decimal, so exports
+        show the recorded reading rather than float32 rounding noise. Extra
+        keyword *columns* are appended as given.
+        """
+        return pd.DataFrame(
+            {
+                TIMESTAMP_COLUMN: self.times.view("datetime64[ns]"),
+                VALUE_COLUMN: self.values.astype(str).astype(np.float64),
+                TIME_COLUMN: self.minutes - origin,
+                **columns,
+            }
+        )
@@ -0,0 +1,137 @@
+"""
+Columnar cache of converted telemetry worksheets.
+
+Parsing a Temp/Act workbook sheet (reading the xlsx, finding the "Time"
+label row and converting the ``Date Time`` strings) takes seconds for
+multi-week exports, and the alignment workflow reloads the same sheets on
+every file change or retry. ``TelemetrySheetCache`` stores each converted
+sheet as memory-mappable ``.npy`` arrays — the timestamps as int64
+nanoseconds and the value columns as a float64 matrix — plus a small JSON
+header with the workbook's resolved path, size and mtime, the sheet name
+and the column names. An entry is only used while the workbook's size and
+mtime still match the header.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.shared.persistence.app_paths import config_file_path
+
+
+logger = logging.getLogger(__name__)
+
+SHEET_CACHE_DIRNAME = "telemetry_sheet_cache"
+SHEET_CACHE_FORMAT_VERSION = 1
+TIMESTAMP_COLUMN = "Date Time"
+
+
+def _workbook_signature(path: Path) -> list[int]:
+    stat = path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _save_array_atomic(path: Path, array: np.ndarray) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=".npy")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            np.save(handle, array)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+class TelemetrySheetCache:
+    """Converted telemetry sheets keyed by workbook path, size, mtime and sheet name."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def _paths(self, workbook: Path, sheet_name: str) -> tuple[Path, Path, Path]:
+        digest = hashlib.sha256(f"{workbook}\0{sheet_name}".encode()).hexdigest()[:32]
+        return (
+            self.root / f"{digest}.json",
+            self.root / f"{digest}.time.npy",
+            self.root / f"{digest}.values.npy",
+        )
+
+    def load(self, file_path: str | Path, sheet_name: str) -> pd.DataFrame | None:
+        """Return the cached table for *sheet_name*, or None if it is missing or stale."""
+        workbook = Path(file_path).expanduser().resolve()
+        header_path, time_path, values_path = self._paths(workbook, sheet_name)
+        try:
+            header = json.loads(header_path.read_text(encoding="utf-8"))
+            if (
+                header.get("format_version") != SHEET_CACHE_FORMAT_VERSION
+                or header.get("signature") != _workbook_signature(workbook)
+            ):
+                return None
+            times = np.load(time_path, mmap_mode="r")
+            values = np.load(values_path, mmap_mode="r")
+            columns = [str(column) for column in header["columns"]]
+            order = [str(column) for column in header["order"]]
+            n_rows = int(header["n_rows"])
+            start = int(header["index_start"])
+        except (OSError, KeyError, TypeError, ValueError):
+            return None
+        if times.shape != (n_rows,) or values.shape != (n_rows, len(columns)):
+            return None
+
+        # Copied out of the maps: callers are free to modify the frame.
+        table = pd.DataFrame(
+            {TIMESTAMP_COLUMN: np.array(times).view("datetime64[ns]")},
+            index=pd.RangeIndex(start, start + len(times)),
+        )
+        for position, column in enumerate(columns):
+            table[column] = np.array(values[:, position])
+        return table[order]
+
+    def store(self, file_path: str | Path, sheet_name: str, table: pd.DataFrame) -> None:
+        """Save a converted sheet table; failures are logged and ignored."""
+        workbook = Path(file_path).expanduser().resolve()
+        header_path, time_path, values_path = self._paths(workbook, sheet_name)
+        index = table.index
+        if not isinstance(index, pd.RangeIndex) or index.step != 1 or table.columns.duplicated().any():
+            return
+        columns = [column for column in table.columns if column != TIMESTAMP_COLUMN]
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            times = table[TIMESTAMP_COLUMN].to_numpy(dtype="datetime64[ns]").view(np.int64)
+            values = table[columns].to_numpy(dtype=np.float64).reshape(len(table), len(columns))
+            _save_array_atomic(time_path, times)
+            _save_array_atomic(values_path, values)
+            header = {
+                "format_version": SHEET_CACHE_FORMAT_VERSION,
+                "path": str(workbook),
+                "sheet": sheet_name,
+                "signature": _workbook_signature(workbook),
+                "n_rows": len(table),
+                "index_start": int(index.start),
+                "columns": [str(column) for column in columns],
+                "order": [str(column) for column in table.columns],
+            }
+            fd, tmp = tempfile.mkstemp(dir=self.root, prefix=".tmp-", suffix=".json")
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(header, handle)
+            os.replace(tmp, header_path)
+        except (OSError, TypeError, ValueError) as exc:
+            logger.warning("Could not cache telemetry sheet %s of %s: %s", sheet_name, workbook.name, exc)
+
+    def clear(self) -> None:
+        """Delete every cached sheet."""
+        for path in self.root.glob("*"):
+            path.unlink(missing_ok=True)
+
+
+def telemetry_sheet_cache() -> TelemetrySheetCache:
+    """Return the sheet cache in the per-user config directory."""
+    return TelemetrySheetCache(config_file_path(SHEET_CACHE_DIRNAME))
@@ -0,0 +1,228 @@
+"""
+Streaming reader for telemetry workbook sheets.
+
+``pd.read_excel`` builds the whole sheet as object-dtype cells before the
+header block above the "Time" label row is thrown away. ``read_telemetry_sheet``
+walks the sheet with openpyxl's read-only mode instead: it skips the header
+block while scanning, converts the data rows in fixed-size chunks and keeps
+only typed arrays — datetime64[ns] timestamps and one float64 array per value
+column. An optional ``since`` timestamp drops earlier rows chunk by chunk, so
+they are never held.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from numbers import Number
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+
+TIMESTAMP_COLUMN = "Date Time"
+CHUNK_ROWS = 65_536
+_NAT = np.iinfo(np.int64).min
+
+
+@dataclass(frozen=True)
+class TelemetrySheetArrays:
+    """Typed columns of the data block of one telemetry sheet.
+
+    ``index`` holds each row's position below the sheet's header row (the
+    index ``pd.read_excel`` would give it). ``columns`` lists the table's
+    column names in sheet order, with the timestamp column named
+    ``TIMESTAMP_COLUMN``; ``values`` maps the other names to float64 arrays.
+    """
+
+    index: np.ndarray
+    times: np.ndarray
+    columns: list[str]
+    values: dict[str, np.ndarray] = field(default_factory=dict)
+
+    def to_frame(self) -> pd.DataFrame:
+        data = {TIMESTAMP_COLUMN: self.times, **self.values}
+        if len(self.index) and np.array_equal(self.index, np.arange(self.index[0], self.index[0] + len(self.index))):
+            index = pd.RangeIndex(int(self.index[0]), int(self.index[0]) + len(self.index))
+        else:
+            index = pd.Index(self.index)
+        return pd.DataFrame({column: data[column] for column in self.columns}, index=index)
+
+
+def resolve_sheet_name(sheet_names: list[str], target_name: str) -> str:
+    """Return the matching sheet name, falling back to a case-insensitive match."""
+    if target_name in sheet_names:
+        return target_name
+
+    target_name_upper = target_name.upper()
+    sheet_names_upper = [name.upper() for name in sheet_names]
+    if target_name_upper in sheet_names_upper:
+        return sheet_names[sheet_names_upper.index(target_name_upper)]
+
+    raise ValueError(f"Sheet name '{target_name}' not found in the Excel file.")
+
+
+def _header_names(cells: tuple) -> list[str]:
+    # Same names pd.read_excel gives the first row: "Unnamed: i" for blanks
+    # and ".n" suffixes for repeats.
+    names: list[str] = []
+    seen: dict[str, int] = {}
+    for position, cell in enumerate(cells):
+        name = f"Unnamed: {position}" if cell is None else str(cell)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _table_columns(header: list[str], sheet_name: str) -> list[str]:
+    columns = [name.upper() for name in header]
+    if sheet_name.upper() in columns:
+        rename = {"NAME": TIMESTAMP_COLUMN, sheet_name.upper(): "Data"}
+        columns = [rename.get(column, column) for column in columns]
+    return columns
+
+
+def _to_float(cell) -> float:
+    if isinstance(cell, Number) and not isinstance(cell, bool):
+        return float(cell)
+    if isinstance(cell, str):
+        try:
+            return float(cell)
+        except ValueError:
+            return np.nan
+    return np.nan
+
+
+def _to_timestamps(cells: list) -> np.ndarray:
+    if all(isinstance(cell, datetime) or cell is None for cell in cells):
+        converted = pd.to_datetime(pd.Series(cells, dtype=object), errors="coerce")
+    else:
+        converted = pd.to_datetime(pd.Series(cells, dtype=object).astype("string"), errors="coerce")
+    return converted.to_numpy(dtype="datetime64[ns]").view(np.int64)
+
+
+class _ChunkBuffer:
+    """Collect raw data rows and convert them to typed arrays every ``CHUNK_ROWS`` rows."""
+
+    def __init__(self, columns: list[str], since: pd.Timestamp | None) -> None:
+        self.columns = columns
+        self.time_position = columns.index(TIMESTAMP_COLUMN)
+        self.since_ns = None if since is None else pd.Timestamp(since).as_unit("ns").value
+        self.rows: list[tuple] = []
+        self.positions: list[int] = []
+        self.index: list[np.ndarray] = []
+        self.times: list[np.ndarray] = []
+        self.values: dict[str, list[np.ndarray]] = {
+            column: [] for column in columns if column != TIMESTAMP_COLUMN
+        }
+        # The latest row before ``since``, kept so lookups of the last sample
+        # at/before a time on or after ``since`` are unchanged.
+        self.before: tuple[int, int, dict[str, float]] | None = None
+
+    def append(self, position: int, cells: tuple) -> None:
+        self.rows.append(cells)
+        self.positions.append(position)
+        if len(self.rows) >= CHUNK_ROWS:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.rows:
+            return
+        width = len(self.columns)
+        rows = [tuple(cells[:width]) + (None,) * (width - len(cells)) for cells in self.rows]
+        times = _to_timestamps([cells[self.time_position] for cells in rows])
+        values = {
+            column: np.fromiter((_to_float(cells[position]) for cells in rows), dtype=np.float64, count=len(rows))
+            for position, column in enumerate(self.columns)
+            if column != TIMESTAMP_COLUMN
+        }
+        index = np.asarray(self.positions, dtype=np.int64)
+        self.rows.clear()
+        self.positions.clear()
+
+        if self.since_ns is not None:
+            valid = times != _NAT
+            early = valid & (times < self.since_ns)
+            if early.any():
+                last = np.flatnonzero(early)[np.argmax(times[early])]
+                if self.before is None or times[last] > self.before[1]:
+                    self.before = (int(index[last]), int(times[last]),
+                                   {column: float(array[last]) for column, array in values.items()})
+            keep = valid & ~early
+            index, times = index[keep], times[keep]
+            values = {column: array[keep] for column, array in values.items()}
+
+        self.index.append(index)
+        self.times.append(times)
+        for column, array in values.items():
+            self.values[column].append(array)
+
+    def result(self) -> TelemetrySheetArrays:
+        self.flush()
+        if self.before is not None:
+            position, time_ns, row = self.before
+            self.index.insert(0, np.array([position], dtype=np.int64))
+            self.times.insert(0, np.array([time_ns], dtype=np.int64))
+            for column, value in row.items():
+                self.values[column].insert(0, np.array([value]))
+        return TelemetrySheetArrays(
+            index=np.concatenate(self.index) if self.index else np.empty(0, dtype=np.int64),
+            times=(np.concatenate(self.times) if self.times else np.empty(0, dtype=np.int64)).view("datetime64[ns]"),
+            columns=list(self.columns),
+            values={
+                column: np.concatenate(arrays) if arrays else np.empty(0)
+                for column, arrays in self.values.items()
+            },
+        )
+
+
+def read_telemetry_sheet(
+    file_path: str | Path,
+    sheet_name: str,
+    since: pd.Timestamp | None = None,
+) -> TelemetrySheetArrays:
+    """Stream the data block below the "Time" label row of *sheet_name*.
+
+    The sheet name is matched case-insensitively. The first row is the header
+    (the sheet-name column becomes ``Data`` and ``Name`` becomes
+    ``Date Time``). Non-numeric values become NaN and unparseable timestamps
+    NaT. With *since*, rows with a missing or earlier timestamp are dropped,
+    except the latest row before *since*.
+    """
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[resolve_sheet_name(workbook.sheetnames, sheet_name)]
+        rows = worksheet.iter_rows(values_only=True)
+        header = _header_names(next(rows, ()))
+        columns = _table_columns(header, sheet_name)
+        if TIMESTAMP_COLUMN not in columns:
+            raise ValueError(f"Couldn't find the '{TIMESTAMP_COLUMN}' column in sheet '{sheet_name}'.")
+        label_position = header.index("Time") if "Time" in header else None
+
+        position = -1
+        for position, cells in enumerate(rows):
+            label_cells = cells if label_position is None else cells[label_position:label_position + 1]
+            if "Time" in label_cells:
+                break
+        else:
+            raise ValueError("Couldn't locate the 'Time' label in the data.")
+
+        buffer = _ChunkBuffer(columns, since)
+        blank: list[int] = []
+        for position, cells in enumerate(rows, start=position + 1):
+            if all(cell is None for cell in cells):
+                blank.append(position)  # kept only if a later row has data, like read_excel
+                continue
+            for blank_position in blank:
+                buffer.append(blank_position, ())
+            blank.clear()
+            buffer.append(position, cells)
+        return buffer.result()
+    finally:
+        workbook.close()
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+import pytest
+
+from src.dfer.recording import recording_cache
+
+
+@pytest.fixture
+def empty_recording_cache():
+    """Start and finish a test with an empty process-wide recording cache."""
+    recording_cache().clear()
+    yield recording_cache()
+    recording_cache().clear()
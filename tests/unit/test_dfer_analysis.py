@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import src.dfer.df_dual as df_dual
+import src.dfer.df_single as df_single
+import src.dfer.df_stream as df_stream
+from src.dfer import compute_options, run_analysis, run_pfer
+from tests.utils.photometry_csv import write_dual_csv, write_single_csv
+
+pytestmark = pytest.mark.usefixtures("empty_recording_cache")
+
+
+@pytest.mark.parametrize(
+    ("writer", "module", "compute_name"),
+    [
+        (write_single_csv, df_single, "compute_single_options"),
+        (write_dual_csv, df_dual, "compute_dual_options"),
+    ],
+)
+def test_run_analysis_reuses_matching_options(tmp_path, monkeypatch, writer, module, compute_name):
+    path = writer(tmp_path / "session" / "rec.csv")
+    options = compute_options(path, "10", "250")
+    expected = np.loadtxt(run_analysis(path, "10", "250", "3"), delimiter=",")
+
+    calls = []
+    original = getattr(module, compute_name)
+    monkeypatch.setattr(module, compute_name, lambda *a: calls.append(a) or original(*a))
+
+    reused = np.loadtxt(run_analysis(path, "10", "250", "3", options=options), delimiter=",")
+    assert calls == []
+    np.testing.assert_array_equal(reused, expected)
+
+    run_analysis(path, "20", "250", "3", options=options)
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize("writer", [write_single_csv, write_dual_csv])
+@pytest.mark.parametrize(("w_start", "w_end", "analysis_path"), [("", "", "1"), ("10", "250", "4")])
+def test_streaming_analysis_matches_in_memory_run(tmp_path, writer, w_start, w_end, analysis_path):
+    path = writer(tmp_path / "session" / "rec.csv")
+    expected = np.loadtxt(run_analysis(path, w_start, w_end, analysis_path), delimiter=",")
+
+    streamed = np.loadtxt(
+        run_analysis(path, w_start, w_end, analysis_path, streaming=True, chunk_rows=700),
+        delimiter=",",
+    )
+
+    np.testing.assert_allclose(streamed, expected, rtol=0, atol=2e-6)
+    assert list((tmp_path).rglob("*.npy")) == []
+
+
+def test_streaming_finds_exact_median_interval_for_jittered_timestamps(tmp_path, monkeypatch):
+    path = write_single_csv(tmp_path / "session" / "rec.csv")
+    data = np.loadtxt(path, delimiter=",", skiprows=1)
+    rng = np.random.default_rng(7)
+    data[:, 0] += rng.uniform(-0.004, 0.004, len(data))
+    np.savetxt(path, data, delimiter=",", header="#time(seconds),405nm,465nm", comments="", fmt="%.9f")
+    monkeypatch.setattr(df_stream, "MAX_DISTINCT_INTERVALS", 50)
+
+    layout = df_stream._stream_layout(str(path))
+    length, dt_sec = df_stream._scan_time(str(path), layout, chunk_rows=700)
+
+    t_vec = np.loadtxt(path, delimiter=",", skiprows=1)[1:, 0]
+    assert length == len(t_vec)
+    assert dt_sec == float(np.median(np.diff(t_vec)))
+    expected = np.loadtxt(run_analysis(path, "10", "250", "1"), delimiter=",")
+    streamed = np.loadtxt(run_analysis(path, "10", "250", "1", streaming=True, chunk_rows=700),
+                          delimiter=",")
+    np.testing.assert_allclose(streamed, expected, rtol=0, atol=2e-6)
+
+
+
+@pytest.mark.parametrize("writer", [write_single_csv, write_dual_csv])
+def test_float32_precision_agrees_with_float64_within_tolerance(tmp_path, writer):
+    path = writer(tmp_path / "session" / "rec.csv", n=6000)
+
+    options = compute_options(path, "10", "", precision="float32")
+    assert options["t_min"].dtype == np.float64
+    assert all(
+        value.dtype == np.float32
+        for key, value in options.items()
+        if key != "t_min" and isinstance(value, np.ndarray)
+    )
+
+    out_path = run_analysis(path, "10", "", "2")
+    names = Path(out_path).read_text(encoding="utf-8").splitlines()[0].lstrip("# ").split(",")
+    expected = np.loadtxt(out_path, delimiter=",")
+    stats64 = np.loadtxt(run_pfer(out_path).splitlines()[0], delimiter=",", ndmin=2)
+    stats32 = np.loadtxt(run_pfer(out_path, precision="float32").splitlines()[0], delimiter=",", ndmin=2)
+    np.testing.assert_allclose(stats32, stats64, rtol=0, atol=1e-4)
+
+    compact = np.loadtxt(run_analysis(path, "10", "", "2", precision="float32"), delimiter=",")
+    assert compact.shape == expected.shape
+    for index, name in enumerate(names):
+        atol = 1e-3 if name.startswith("Z_") else 1e-4
+        np.testing.assert_allclose(compact[:, index], expected[:, index], rtol=1e-6, atol=atol, err_msg=name)
+
+
+def test_unknown_precision_is_rejected(tmp_path):
+    path = write_single_csv(tmp_path / "session" / "rec.csv")
+
+    with pytest.raises(ValueError, match="precision"):
+        run_analysis(path, precision="float16")
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import csv
+import os
+
+import pandas as pd
+import pytest
+
+from src.dfer import batch, run_analysis
+from src.dfer.batch import discover_dfer_outputs, discover_recordings, run_dfer_batch, run_pfer_batch
+from src.dfer.pfer import _run_pfer
+from tests.utils.photometry_csv import write_dual_csv, write_single_csv
+
+
+@pytest.fixture(autouse=True)
+def _isolated_neurosync_config(tmp_path, monkeypatch):
+    monkeypatch.setenv("NEUROSYNCAPP_CONFIG_DIR", str(tmp_path / "config"))
+
+
+def _read_manifest(path):
+    with open(path, newline="", encoding="utf-8") as handle:
+        return {row["input"]: row for row in csv.DictReader(handle)}
+
+
+def test_discover_recordings_skips_result_folders(tmp_path):
+    write_single_csv(tmp_path / "a.csv")
+    write_single_csv(tmp_path / "sub" / "b.csv")
+    (tmp_path / "dfof_results").mkdir()
+    (tmp_path / "dfof_results" / "a_Data.csv").write_text("t_min\n", encoding="utf-8")
+
+    found = discover_recordings(tmp_path)
+
+    assert [p.name for p in found] == ["a.csv", "b.csv"]
+    assert [p.name for p in discover_recordings(str(tmp_path / "*.csv"))] == ["a.csv"]
+
+
+def test_run_dfer_batch_writes_manifest_and_skips_up_to_date(tmp_path):
+    first = write_single_csv(tmp_path / "rec1.csv", seed=1)
+    second = write_single_csv(tmp_path / "rec2.csv", seed=2)
+    (tmp_path / "behaviour.csv").write_text("Behaviour,Start\nA,1\n", encoding="utf-8")
+
+    manifest = run_dfer_batch(tmp_path, analysis_path="2", max_workers=2)
+
+    rows = _read_manifest(manifest)
+    assert rows[str(first.resolve())]["status"] == "ok"
+    assert rows[str(second.resolve())]["status"] == "ok"
+    assert rows[str((tmp_path / "behaviour.csv").resolve())]["status"] == "skipped"
+    assert (tmp_path / "dfof_results" / "rec1_Data.csv").exists()
+
+    rerun = _read_manifest(run_dfer_batch(tmp_path, max_workers=1))
+    assert rerun[str(first.resolve())]["status"] == "up-to-date"
+
+    os.utime(first, (first.stat().st_atime, first.stat().st_mtime + 60))
+    refreshed = _read_manifest(run_dfer_batch(tmp_path, max_workers=1))
+    assert refreshed[str(first.resolve())]["status"] == "ok"
+    assert refreshed[str(second.resolve())]["status"] == "up-to-date"
+
+
+def test_batch_reports_are_not_picked_up_as_recordings(tmp_path):
+    recording = str(write_single_csv(tmp_path / "rec.csv").resolve())
+    first = _read_manifest(run_dfer_batch(tmp_path, max_workers=1))
+    run_pfer_batch(tmp_path, max_workers=1)
+
+    second = _read_manifest(run_dfer_batch(tmp_path, max_workers=1))
+    custom = tmp_path / "dfof_runs" / "runs.csv"
+    run_dfer_batch(tmp_path, max_workers=1, manifest_path=custom)
+    custom_run = _read_manifest(run_dfer_batch(tmp_path, max_workers=1, manifest_path=custom))
+
+    assert (tmp_path / batch.PFER_SUMMARY_NAME).exists()
+    assert list(first) == list(second) == list(custom_run) == [recording]
+    assert second[recording]["status"] == "up-to-date"
+
+
+def test_batch_cli_returns_error_code_for_missing_source(tmp_path):
+    assert batch.main(["dfer", str(tmp_path / "missing")]) == 1
+
+
+def test_batch_worker_leaves_recording_cache_empty(tmp_path, empty_recording_cache):
+    path = write_single_csv(tmp_path / "rec.csv")
+
+    out_path, _ = batch._run_one(str(path), "", "", "1", False)
+
+    assert out_path.endswith("rec_Data.csv")
+    assert len(empty_recording_cache) == 0
+
+
+def test_batch_scan_does_not_create_result_folders(tmp_path):
+    write_single_csv(tmp_path / "short.csv", n=50)
+
+    rows = _read_manifest(run_dfer_batch(tmp_path, max_workers=1))
+
+    assert rows[str((tmp_path / "short.csv").resolve())]["status"] == "failed"
+    assert not (tmp_path / "dfof_results").exists()
+
+
+def test_run_pfer_batch_writes_one_summary_row_per_file_and_signal(tmp_path):
+    single = run_analysis(write_single_csv(tmp_path / "rec1.csv", n=6000))
+    dual = run_analysis(write_dual_csv(tmp_path / "rec2" / "session.csv", n=6000))
+    broken = tmp_path / "dfof_results" / "broken_Data.csv"
+    broken.write_text("# t_min\n0.0\n", encoding="utf-8")
+    assert [p.name for p in discover_dfer_outputs(tmp_path)] == [
+        "broken_Data.csv", "rec1_Data.csv", "rec2_Dual_Data.csv"]
+
+    summary = pd.read_csv(run_pfer_batch(tmp_path, max_workers=2), dtype={"signal": str})
+
+    assert list(summary.columns) == batch.PFER_SUMMARY_COLUMNS
+    assert summary["input"].tolist() == [str(broken.resolve()), single, dual, dual]
+    assert summary["signal"].fillna("").tolist() == ["", "465", "470", "560"]
+    assert summary["status"].tolist() == ["failed", "ok", "ok", "ok"]
+    for path in (single, dual):
+        _, expected = _run_pfer(path, "", "", batch.DEFAULT_PROMINENCE, batch.DEFAULT_ART_THRESHOLD,
+                                False, "float64", None, None)
+        rows = summary[summary["input"] == path]
+        assert rows["peak_count"].tolist() == [row["peak_count"] for row in expected]
+        assert rows["mean_amplitude"].tolist() == pytest.approx([row["mean_amplitude"] for row in expected])
+        assert rows["warning1"].tolist() == [row["warning1"] for row in expected]
+        assert rows["warning2"].tolist() == [row["warning2"] for row in expected]
+
+
+def test_batch_cli_runs_pfer(tmp_path):
+    run_analysis(write_single_csv(tmp_path / "rec.csv", n=6000))
+    summary = tmp_path / "cohort.csv"
+
+    assert batch.main(["pfer", str(tmp_path / "dfof_results"), "--workers", "1",
+                       "--summary", str(summary)]) == 0
+
+    assert pd.read_csv(summary)["status"].tolist() == ["ok"]
+    assert (tmp_path / "dfof_results" / "rec_Data_Peak_STATS.csv").exists()
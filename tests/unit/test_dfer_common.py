@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+import pytest
+from scipy.signal import butter, filtfilt, savgol_filter
+
+import src.dfer.df_common as df_common
+from src.dfer.df_common import (
+    BUTTER_CUTOFF,
+    BUTTER_ORDER,
+    SAVGOL_COARSE,
+    SAVGOL_FINE,
+    filter_bank,
+    quadratic_baselines,
+    savgol_smooth,
+)
+
+
+def _traces(n=4000, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(n) / 20.0
+    control = 100.0 + 3.0 * np.exp(-t / 60.0) + rng.normal(0, 0.3, n)
+    targets = np.vstack([
+        200.0 + 4.0 * np.exp(-t / 50.0) + np.sin(t / 3.0) + rng.normal(0, 0.3, n),
+        150.0 + 2.0 * np.exp(-t / 40.0) + np.cos(t / 2.0) + rng.normal(0, 0.3, n),
+        120.0 + 1.0 * np.exp(-t / 30.0) + np.sin(t / 5.0) + rng.normal(0, 0.3, n),
+    ])
+    return control, targets
+
+
+def _legacy_pair(control, target, fs):
+    idx = np.arange(len(target))
+    scaled = control * (np.mean(target) / np.mean(control))
+    control_quad = np.polyval(np.polyfit(idx, control, 2), idx)
+    target_quad = np.polyval(np.polyfit(idx, target, 2), idx)
+    scaled_quad = np.polyval(np.polyfit(idx, scaled, 2), idx)
+    raw_df = (control - control_quad) / control_quad
+    adj1 = scaled_quad * raw_df + scaled_quad
+    adj2 = target_quad * raw_df + target_quad
+    b, a = butter(BUTTER_ORDER, BUTTER_CUTOFF, fs=fs, btype="low")
+    f1, f2, ft = (filtfilt(b, a, x, padtype=None) for x in (adj1, adj2, target))
+    return {
+        "target_smooth": savgol_filter(ft, *SAVGOL_FINE),
+        "adj1": savgol_filter(f1, *SAVGOL_FINE),
+        "adj2": savgol_filter(f2, *SAVGOL_FINE),
+        "adj3": savgol_filter(f1, *SAVGOL_COARSE),
+        "adj4": savgol_filter(f2, *SAVGOL_COARSE),
+        "scaled_quad": scaled_quad,
+    }
+
+
+def test_quadratic_baselines_match_per_trace_polyfit():
+    control, targets = _traces()
+    idx = np.arange(control.size)
+
+    fits = quadratic_baselines(np.vstack([control, targets]))
+
+    for row, trace in zip(fits, [control, *targets]):
+        np.testing.assert_allclose(row, np.polyval(np.polyfit(idx, trace, 2), idx), rtol=1e-12)
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_filter_bank_matches_per_pair_pipeline(max_workers):
+    control, targets = _traces()
+    fs = 20.0
+
+    bank = filter_bank(control, targets, fs, max_workers=max_workers)
+
+    for row, target in enumerate(targets):
+        expected = _legacy_pair(control, target, fs)
+        for key, values in expected.items():
+            np.testing.assert_allclose(bank[key][row], values, rtol=1e-10, atol=1e-10)
+
+
+def test_filter_bank_filters_control_once_and_pairs_on_worker_threads(monkeypatch):
+    control, targets = _traces()
+    calls = []
+    original = df_common._lowpass
+    monkeypatch.setattr(df_common, "_lowpass", lambda rows, fs: calls.append(
+        (rows.shape[0], threading.current_thread().name)) or original(rows, fs))
+
+    filter_bank(control, targets, 20.0, max_workers=2)
+
+    assert sorted(rows for rows, _ in calls) == [1, 2, 2, 2]
+    assert all(name.startswith("dfer-pair") for _, name in calls)
+
+
+def test_savgol_smooth_matches_scipy_for_every_engine():
+    rng = np.random.default_rng(3)
+    stack = 100.0 + np.cumsum(rng.normal(size=(2, 5001)), axis=-1)
+
+    for window, poly in [(501, 0), (501, 3), (201, 2), (21, 6), (5, 0)]:
+        np.testing.assert_allclose(
+            savgol_smooth(stack, window, poly),
+            savgol_filter(stack, window, poly, axis=-1),
+            rtol=0,
+            atol=1e-9,
+        )
+        np.testing.assert_allclose(
+            savgol_smooth(stack[0], window, poly),
+            savgol_filter(stack[0], window, poly),
+            rtol=0,
+            atol=1e-9,
+        )
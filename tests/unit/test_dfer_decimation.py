@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.dfer.decimation import POINTS_PER_BIN, minmax_decimate, minmax_indices
+
+
+def _bin_extent(x, y, edges):
+    which = np.searchsorted(edges, x, side="right") - 1
+    return [(y[which == b].min(), y[which == b].max()) for b in range(len(edges) - 1)]
+
+
+@pytest.mark.parametrize("n", [10_007, 50_000])
+def test_minmax_keeps_every_bin_envelope(n):
+    rng = np.random.default_rng(n)
+    x = np.arange(n, dtype=float)
+    trace = rng.normal(size=n).cumsum()
+    trace[rng.integers(0, n, 5)] += 1_000.0  # isolated spikes must survive
+
+    kept_x, kept = minmax_decimate(x, {"trace": trace}, n_bins=300)
+
+    assert len(kept_x) <= POINTS_PER_BIN * 300 + 2
+    assert kept_x[0] == x[0] and kept_x[-1] == x[-1]
+    assert np.all(np.diff(kept_x) > 0)
+    assert np.isin(np.flatnonzero(trace > 500), kept_x).all()
+    # Every bin (pixel column) spans the same values as in the full trace.
+    width = -(-n // 300)
+    edges = np.append(np.arange(0, n, width), n)
+    assert _bin_extent(kept_x, kept["trace"], edges) == _bin_extent(x, trace, edges)
+
+
+def test_minmax_indices_union_keeps_each_trace_envelope():
+    rng = np.random.default_rng(0)
+    a = rng.normal(size=20_000)
+    b = -a[::-1]
+
+    index = minmax_indices(100, a, b)
+
+    assert a[index].max() == a.max() and a[index].min() == a.min()
+    assert b[index].max() == b.max() and b[index].min() == b.min()
+
+
+def test_minmax_indices_keeps_short_traces_whole():
+    assert minmax_indices(10, np.arange(20.0)).tolist() == list(range(20))
+    with pytest.raises(ValueError, match="same length"):
+        minmax_indices(10, np.zeros(5), np.zeros(6))
+
+
+def test_trace_figures_decimate_overview_and_keep_full_detail():
+    pytest.importorskip("bokeh")
+    from src.dfer.plotting import trace_figures, trace_sources
+
+    n = 200_000
+    x = np.arange(n) / 1200.0
+    y = np.sin(x) + np.random.default_rng(1).normal(scale=0.1, size=n)
+
+    sources = trace_sources(x, {"y": y}, width=1000)
+    overview, detail = trace_figures("rec", sources, {"y": dict(line_color="green")},
+                                     "Time(min)", "DF/F", width=1000, height=300)
+
+    overview_source, detail_source = sources
+    assert len(overview_source.data["x"]) <= POINTS_PER_BIN * 1000 + 2
+    assert len(detail_source.data["x"]) == n
+    np.testing.assert_allclose(detail_source.data["y"], y, rtol=1e-6, atol=1e-6)
+    assert overview.output_backend == detail.output_backend == "webgl"
+    assert detail.x_range.end < x[-1]
+    assert any(getattr(tool, "x_range", None) is detail.x_range for tool in overview.tools)
+
+
+def test_plot_decimated_redecimates_on_zoom_and_follows_twin_axes():
+    from matplotlib.figure import Figure
+
+    from src.dfer.decimation import plot_decimated
+
+    n = 500_000
+    x = np.arange(n, dtype=float)
+    y = np.random.default_rng(2).normal(size=n)
+    fig = Figure(figsize=(10, 4), dpi=100)
+    ax = fig.add_subplot(111)
+    twin = ax.twinx()
+    line = plot_decimated(ax, x, y, color="green")
+    twin_line = plot_decimated(twin, x, -y, color="purple")
+    ax.set_xlim(x[0], x[-1])
+
+    width = int(ax.bbox.width)
+    assert len(line.get_xdata()) <= POINTS_PER_BIN * width + 2
+    assert line.get_ydata().max() == y.max() and line.get_ydata().min() == y.min()
+
+    ax.set_xlim(1_000, 1_200)
+
+    for drawn, trace in ((line, y), (twin_line, -y)):
+        xdata = np.asarray(drawn.get_xdata())
+        assert xdata[0] == x[0] and xdata[-1] == x[-1]
+        np.testing.assert_array_equal(xdata[1:-1], x[999:1202])
+        np.testing.assert_array_equal(np.asarray(drawn.get_ydata())[1:-1], trace[999:1202])
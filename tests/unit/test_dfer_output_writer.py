@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import gzip
+
+import numpy as np
+import pytest
+
+from src.dfer.output_writer import BLOCK_ROWS, CsvWriter, write_csv, write_csv_async
+from src.dfer.progress import AnalysisCancelled, CancelToken
+
+COLUMNS = ["t_min", "dFoF_465", "Z_465"]
+
+
+def _matrix(n=BLOCK_ROWS + 17):
+    rng = np.random.default_rng(0)
+    matrix = rng.normal(scale=1e3, size=(n, len(COLUMNS)))
+    matrix[:6, 1] = [np.nan, np.inf, -np.inf, -0.0, 1e20, -5e-7]
+    return matrix
+
+
+def _savetxt_bytes(tmp_path, matrix, fmt="%f"):
+    path = tmp_path / "reference.csv"
+    np.savetxt(path, matrix, delimiter=",", header=",".join(COLUMNS), fmt=fmt)
+    return path.read_bytes()
+
+
+def test_write_csv_matches_savetxt_byte_for_byte(tmp_path):
+    matrix = _matrix()
+
+    out = write_csv(tmp_path / "out.csv", matrix, COLUMNS)
+
+    assert out.read_bytes() == _savetxt_bytes(tmp_path, matrix)
+
+
+def test_csv_writer_blocks_and_decimals_match_savetxt(tmp_path):
+    matrix = _matrix(n=500)
+
+    with CsvWriter(tmp_path / "out.csv", COLUMNS, decimals=3) as writer:
+        writer.write(matrix[:200])
+        writer.write(matrix[200:])
+
+    assert (tmp_path / "out.csv").read_bytes() == _savetxt_bytes(tmp_path, matrix, fmt="%.3f")
+
+
+def test_write_csv_compress_and_async(tmp_path):
+    matrix = _matrix(n=300)
+    expected = _savetxt_bytes(tmp_path, matrix)
+
+    gz_path = write_csv(tmp_path / "out.csv.gz", matrix, COLUMNS, compress=True)
+    with gzip.open(gz_path, "rb") as handle:
+        assert handle.read() == expected
+
+    future = write_csv_async(tmp_path / "async.csv", matrix, COLUMNS)
+    matrix[:] = 0.0  # the writer works from its own copy
+    assert future.result().read_bytes() == expected
+
+
+def test_cancelled_write_removes_partial_file(tmp_path):
+    cancel = CancelToken()
+    path = tmp_path / "out.csv"
+
+    with pytest.raises(AnalysisCancelled):
+        with CsvWriter(path, COLUMNS, cancel=cancel) as writer:
+            writer.write(_matrix(10))
+            cancel.cancel()
+            writer.write(_matrix(10))
+
+    assert not path.exists()
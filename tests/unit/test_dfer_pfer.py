@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.dfer import run_analysis, run_pfer, sweep_prominence
+from src.dfer.pfer import WAVEFORM_HALF, WAVEFORM_TAIL, _fix_jitter, _waveforms_for_peaks
+from tests.utils.photometry_csv import write_dual_csv, write_single_csv
+
+
+def _reference_fix_jitter(peaks_arr, troughs_arr, prom_arr, width_arr):
+    """The DFer_v1.4 loop that ``_fix_jitter`` replaced."""
+    if len(peaks_arr) == 0 or len(troughs_arr) == 0:
+        return peaks_arr, troughs_arr, prom_arr, width_arr
+    if peaks_arr[0] < troughs_arr[0]:
+        peaks_arr, prom_arr, width_arr = peaks_arr[1:], prom_arr[1:], width_arr[1:]
+    if len(peaks_arr) == 0 or len(troughs_arr) == 0:
+        return peaks_arr, troughs_arr, prom_arr, width_arr
+    if peaks_arr[-1] < troughs_arr[-1]:
+        troughs_arr = troughs_arr[:-1]
+    if len(peaks_arr) == 0 or len(troughs_arr) == 0:
+        return peaks_arr, troughs_arr, prom_arr, width_arr
+
+    peak_id = np.column_stack([peaks_arr, np.ones(len(peaks_arr))])
+    trough_id = np.column_stack([troughs_arr, np.full(len(troughs_arr), 2)])
+    combined = np.vstack([peak_id, trough_id])
+    order = np.argsort(combined[:, 0])
+    types = combined[order, 1].astype(int)
+    jitter = np.where(np.diff(types) == 0)[0]
+    for idx in reversed(jitter):
+        del_pos = idx // 2
+        if types[idx] == 2:
+            troughs_arr = np.delete(troughs_arr, del_pos)
+        else:
+            peaks_arr = np.delete(peaks_arr, del_pos)
+            prom_arr = np.delete(prom_arr, del_pos)
+            width_arr = np.delete(width_arr, del_pos)
+    return peaks_arr, troughs_arr, prom_arr, width_arr
+
+
+def _events(rng, n_events, p_jitter):
+    """Alternating trough/peak indices with occasional same-type repeats.
+
+    Repeats are confined to the first half: the reference loop assumes a
+    repeat at merged position i sits at slot i // 2, so repeats late in a
+    drifting sequence make it delete past the end of an array.
+    """
+    types = np.arange(n_events) % 2 == 1  # True = peak, starting with a trough
+    flips = (rng.random(n_events) < p_jitter) & (np.arange(n_events) < n_events // 2)
+    types = np.where(flips, ~types, types)
+    positions = np.cumsum(rng.integers(1, 20, n_events))
+    peaks, troughs = positions[types], positions[~types]
+    return peaks, troughs, rng.random(len(peaks)), rng.random(len(peaks)) * 10
+
+
+def _assert_same(actual, expected):
+    for got, want in zip(actual, expected):
+        np.testing.assert_array_equal(got, want)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_fix_jitter_matches_reference_loop(seed):
+    rng = np.random.default_rng(seed)
+    peaks, troughs, prom, width = _events(rng, int(rng.integers(2, 300)), p_jitter=rng.uniform(0, 0.3))
+
+    _assert_same(_fix_jitter(peaks, troughs, prom, width),
+                 _reference_fix_jitter(peaks, troughs, prom, width))
+
+
+def test_fix_jitter_handles_runs_and_missing_properties():
+    peaks = np.array([5, 7, 9, 20, 30])
+    troughs = np.array([1, 2, 3, 15, 25, 26])
+
+    peaks_out, troughs_out, prom_out, width_out = _fix_jitter(peaks, troughs)
+    expected = _reference_fix_jitter(peaks, troughs, np.zeros(5), np.zeros(5))
+
+    np.testing.assert_array_equal(peaks_out, expected[0])
+    np.testing.assert_array_equal(troughs_out, expected[1])
+    assert prom_out is None and width_out is None
+
+
+def test_fix_jitter_drops_deletions_past_the_end():
+    # Four leading troughs push the peak deletion index past the peaks array,
+    # where the reference loop raised IndexError.
+    peaks = np.array([10, 11])
+    troughs = np.array([1, 2, 3, 4])
+
+    peaks_out, troughs_out, _, _ = _fix_jitter(peaks, troughs, np.ones(2), np.ones(2))
+
+    np.testing.assert_array_equal(troughs_out, [4])
+    np.testing.assert_array_equal(peaks_out, [10, 11])
+
+
+def test_fix_jitter_matches_reference_at_1e5_events():
+    rng = np.random.default_rng(7)
+    peaks, troughs, prom, width = _events(rng, 100_000, p_jitter=0.05)
+
+    _assert_same(_fix_jitter(peaks, troughs, prom, width),
+                 _reference_fix_jitter(peaks, troughs, prom, width))
+
+
+def test_waveforms_match_per_peak_slices():
+    rng = np.random.default_rng(3)
+    trace = np.cumsum(rng.normal(size=2000)).astype(np.float32)
+    t_vec = np.arange(2000) / 600.0
+    peak_idx = np.array([10, 49, 50, 400, 401, 1500, 1900, 1901, 1999])
+
+    sigs, waveform_time, mean_wave = _waveforms_for_peaks(trace, t_vec, t_vec[peak_idx])
+
+    expected = [trace[i - WAVEFORM_HALF:i + WAVEFORM_TAIL] for i in peak_idx
+                if i >= WAVEFORM_HALF and i + WAVEFORM_TAIL <= len(trace)]
+    expected = [wave - wave.min() for wave in expected]
+    assert sigs.shape == (len(expected), WAVEFORM_HALF + WAVEFORM_TAIL)
+    assert sigs.dtype == trace.dtype
+    np.testing.assert_array_equal(sigs, np.array(expected))
+    np.testing.assert_allclose(mean_wave, np.mean(expected, axis=0), rtol=1e-6)
+    assert waveform_time.shape == (WAVEFORM_HALF + WAVEFORM_TAIL,)
+
+
+def test_waveforms_without_usable_peaks_are_empty():
+    trace = np.zeros(120)
+
+    sigs, waveform_time, mean_wave = _waveforms_for_peaks(trace, np.arange(120.0), np.array([5.0, 60.0]))
+
+    assert sigs.shape == (0, WAVEFORM_HALF + WAVEFORM_TAIL)
+    assert waveform_time is None and mean_wave is None
+
+
+@pytest.mark.usefixtures("empty_recording_cache")
+@pytest.mark.parametrize("writer", [write_single_csv, write_dual_csv])
+def test_prominence_sweep_matches_run_pfer_at_each_threshold(tmp_path, writer):
+    dfer_csv = Path(run_analysis(writer(tmp_path / "session" / "rec.csv", n=6000)))
+    prominences = [0.002, 0.0005, 0.001]
+
+    table = sweep_prominence(dfer_csv, prominences, write_stats=True)
+
+    assert list(table["prominence"].unique()) == sorted(prominences)
+    assert (dfer_csv.parent / f"{dfer_csv.stem}_Prominence_SWEEP.csv").exists()
+    assert table["peak_count"].max() > 0
+    for row in table.itertuples():
+        reference = run_pfer(dfer_csv, prominence=row.prominence).splitlines()
+        expected = [path for path in reference if len(reference) == 1 or f"_{row.signal}_Peak" in path][0]
+        assert Path(row.stats_csv).read_bytes() == Path(expected).read_bytes()
+        assert row.peak_count == len(np.loadtxt(expected, delimiter=",", ndmin=2))
+
+
+def test_prominence_sweep_requires_positive_thresholds(tmp_path):
+    with pytest.raises(ValueError, match="prominences"):
+        sweep_prominence(tmp_path / "missing.csv", [])
+    with pytest.raises(ValueError, match="prominences"):
+        sweep_prominence(tmp_path / "missing.csv", [0.0, 0.01])
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import pytest
+
+from src.dfer import compute_options, run_analysis, run_pfer
+from src.dfer.df_common import expected_analysis_output_path
+from src.dfer.progress import DFER_STAGES, PFER_STAGES, AnalysisCancelled, CancelToken
+from tests.utils.photometry_csv import write_dual_csv, write_single_csv
+
+pytestmark = pytest.mark.usefixtures("empty_recording_cache")
+
+
+@pytest.mark.parametrize("writer", [write_single_csv, write_dual_csv])
+def test_run_analysis_reports_every_stage_in_order(tmp_path, writer):
+    path = writer(tmp_path / "session" / "rec.csv")
+    calls = []
+
+    run_analysis(path, "10", "", "1", progress=lambda stage, fraction: calls.append((stage, fraction)))
+
+    assert [stage for stage, _ in calls] == [s for s in DFER_STAGES if s != "plot"] + ["done"]
+    fractions = [fraction for _, fraction in calls]
+    assert fractions == sorted(fractions)
+    assert fractions[0] == 0.0 and fractions[-1] == 1.0
+
+
+def test_streaming_and_pfer_report_progress(tmp_path):
+    path = write_single_csv(tmp_path / "session" / "rec.csv")
+    streamed, peaks = [], []
+
+    out_path = run_analysis(path, streaming=True, chunk_rows=500,
+                            progress=lambda stage, fraction: streamed.append(fraction))
+    run_pfer(out_path, progress=lambda stage, fraction: peaks.append(stage))
+
+    assert streamed == sorted(streamed) and streamed[-1] == 1.0
+    assert peaks == [s for s in PFER_STAGES if s != "plot"] + ["done"]
+
+
+@pytest.mark.parametrize("cancel_at", ["load", "fit", "smooth", "dfof", "write"])
+def test_cancel_stops_run_at_next_stage(tmp_path, cancel_at):
+    path = write_single_csv(tmp_path / "session" / "rec.csv")
+    cancel = CancelToken()
+    seen = []
+
+    def progress(stage, fraction):
+        seen.append(stage)
+        if stage == cancel_at:
+            cancel.cancel()
+
+    with pytest.raises(AnalysisCancelled):
+        run_analysis(path, progress=progress, cancel=cancel)
+
+    assert seen[-1] == cancel_at
+    assert not expected_analysis_output_path(path, create_dir=False).exists()
+
+
+def test_cancelled_options_preview_raises(tmp_path):
+    path = write_dual_csv(tmp_path / "session" / "rec.csv")
+    cancel = CancelToken()
+    cancel.cancel()
+
+    with pytest.raises(AnalysisCancelled):
+        compute_options(path, cancel=cancel)
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import os
+
+import numpy as np
+import pytest
+
+import src.dfer.recording as recording_module
+from src.dfer.df_common import detect_photometry_file_type
+from src.dfer.recording import RecordingCache, load_recording
+from tests.utils.photometry_csv import write_dual_csv, write_single_csv
+
+
+pytestmark = pytest.mark.usefixtures("empty_recording_cache")
+
+
+def test_load_recording_parses_single_and_dual(tmp_path):
+    single_path = write_single_csv(tmp_path / "single.csv", n=50, signal_label="490nm")
+    single = load_recording(single_path)
+    dual = load_recording(write_dual_csv(tmp_path / "dual.csv", n=50, metadata_row=True))
+
+    assert single.file_type == "single"
+    assert single.signal_label == "490nm"
+    assert len(single.time) == 49
+    assert single.channels["405"][0] == pytest.approx(np.loadtxt(single_path, delimiter=",", skiprows=2)[0, 1])
+    assert single.channels["465"].flags.writeable is False
+
+    assert dual.file_type == "dual"
+    assert dual.skiprows == 1
+    assert list(dual.channels) == ["410", "470", "560"]
+    assert dual.time[-1] == pytest.approx(4900.0)
+    assert len({single, dual, load_recording(single_path)}) == 2
+
+
+def test_load_recording_reuses_parse_until_file_changes(tmp_path, monkeypatch):
+    path = write_single_csv(tmp_path / "single.csv", n=50)
+    calls = []
+    original = recording_module._parse_recording
+    monkeypatch.setattr(
+        recording_module,
+        "_parse_recording",
+        lambda *args: calls.append(args) or original(*args),
+    )
+
+    first = load_recording(path)
+    assert load_recording(path) is first
+    assert detect_photometry_file_type(path) == ("single", 0)
+    assert len(calls) == 1
+
+    write_single_csv(path, n=60)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert len(load_recording(path).time) == 59
+    assert len(calls) == 2
+
+
+def test_recording_cache_evicts_least_recently_used_by_bytes(tmp_path):
+    paths = [write_single_csv(tmp_path / f"rec{i}.csv", n=50) for i in range(3)]
+    entry_bytes = load_recording(paths[0]).nbytes
+    cache = RecordingCache(max_bytes=2 * entry_bytes)
+
+    cache.load(paths[0])
+    cache.load(paths[1])
+    cache.load(paths[0])
+    cache.load(paths[2])
+
+    assert len(cache) == 2
+    assert cache.total_bytes == 2 * entry_bytes
+    assert cache.peek(recording_module.recording_key(paths[1])) is None
+    assert cache.peek(recording_module.recording_key(paths[0])) is not None
+
+
+def test_load_recording_parses_only_the_required_columns(tmp_path):
+    path = tmp_path / "extra.csv"
+    rows = "\n".join(f"{i * 0.1:.1f},{100 + i},{200 + i},note {i},{i % 2}" for i in range(6))
+    path.write_text("\ufeff#time(seconds),405nm,465nm,Comment,DigitalIO\n" + rows + "\n", encoding="utf-8")
+
+    recording = load_recording(path)
+
+    assert recording.time.tolist() == pytest.approx([0.1, 0.2, 0.3, 0.4, 0.5])
+    assert recording.channels["465"].tolist() == [201.0, 202.0, 203.0, 204.0, 205.0]
+    for values in (recording.time, *recording.channels.values()):
+        assert values.dtype == np.float64
+        assert values.flags.c_contiguous
+
+
+def test_load_recording_reports_missing_dual_columns_from_the_header(tmp_path):
+    path = tmp_path / "dual.csv"
+    path.write_text("Device,Serial\nTimeStamp,CH1-410,CH1-470\n0,1,2\n", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="missing required column\\(s\\): 'CH1-560'"):
+        load_recording(path)
+    assert recording_module.sniff_photometry_header(path) == ("dual", 1, ["TimeStamp", "CH1-410", "CH1-470"])
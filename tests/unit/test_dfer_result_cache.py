@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+import src.dfer.analysis as analysis
+import src.dfer.pfer as pfer
+from src.dfer import run_analysis, run_pfer
+from src.dfer.result_cache import ResultCache, result_cache
+from src.dfer.results_io import bundle_paths, fresh_bundle_columns
+from tests.utils.photometry_csv import write_dual_csv, write_single_csv
+
+pytestmark = pytest.mark.usefixtures("empty_recording_cache")
+
+
+@pytest.fixture(autouse=True)
+def _isolated_neurosync_config(tmp_path, monkeypatch):
+    monkeypatch.setenv("NEUROSYNCAPP_CONFIG_DIR", str(tmp_path / "config"))
+
+
+def _count_calls(monkeypatch, module, name):
+    calls = []
+    original = getattr(module, name)
+    monkeypatch.setattr(module, name, lambda *a, **k: calls.append(a) or original(*a, **k))
+    return calls
+
+
+@pytest.mark.parametrize("writer", [write_single_csv, write_dual_csv])
+def test_cached_dfer_run_restores_identical_outputs(tmp_path, monkeypatch, writer):
+    path = writer(tmp_path / "session" / "rec.csv")
+    out = run_analysis(path, "10", "250", "2", binary_output=True, cache=True)
+    expected = open(out, "rb").read()
+    matrix_path, _ = bundle_paths(out)
+    expected_matrix = matrix_path.read_bytes()
+    calls = _count_calls(monkeypatch, analysis, "_run_analysis")
+
+    assert run_analysis(path, "10", "250", "2", binary_output=True, cache=True) == out
+    os.remove(out)
+    matrix_path.unlink()
+    progress = []
+    assert run_analysis(path, "10", "250", "2", binary_output=True, cache=True,
+                        progress=lambda *a: progress.append(a)) == out
+
+    assert calls == []
+    assert progress == [("done", 1.0)]
+    assert open(out, "rb").read() == expected
+    assert matrix_path.read_bytes() == expected_matrix
+    assert fresh_bundle_columns(out) is not None
+
+
+def test_dfer_cache_misses_on_changed_parameters_or_content(tmp_path, monkeypatch):
+    path = write_single_csv(tmp_path / "rec.csv", seed=1)
+    run_analysis(path, cache=True)
+    calls = _count_calls(monkeypatch, analysis, "_run_analysis")
+
+    run_analysis(path, analysis_path="3", cache=True)
+    run_analysis(path, w_start="10", cache=True)
+    monkeypatch.setattr(analysis, "BUTTER_CUTOFF", 0.3)
+    run_analysis(path, cache=True)
+    assert len(calls) == 3
+    monkeypatch.undo()
+    calls = _count_calls(monkeypatch, analysis, "_run_analysis")
+    write_single_csv(path, seed=2)
+    run_analysis(path, cache=True)
+    run_analysis(path, cache=False)
+
+    assert len(calls) == 2
+
+
+def test_dfer_cache_matches_identical_content_at_a_new_mtime(tmp_path, monkeypatch):
+    path = write_single_csv(tmp_path / "rec.csv")
+    run_analysis(path, cache=True)
+    os.utime(path, (path.stat().st_atime, path.stat().st_mtime + 60))
+    calls = _count_calls(monkeypatch, analysis, "_run_analysis")
+
+    run_analysis(path, cache=True)
+
+    assert calls == []
+
+
+def test_cached_pfer_run_restores_outputs_and_summary(tmp_path, monkeypatch):
+    dfer_csv = run_analysis(write_dual_csv(tmp_path / "session" / "rec.csv", n=6000))
+    out, summary = pfer._run_pfer(dfer_csv, "", "", 0.003, 10, False, "float64", None, None, cache=True)
+    stats = out.splitlines()
+    contents = [open(p, "rb").read() for p in stats]
+    for p in stats:
+        os.remove(p)
+    calls = _count_calls(monkeypatch, pfer, "_compute_pfer")
+
+    assert pfer._run_pfer(dfer_csv, "", "", 0.003, 10, False, "float64", None, None, cache=True) == (out, summary)
+    assert run_pfer(dfer_csv, cache=True) == out
+    run_pfer(dfer_csv, prominence=0.004, cache=True)
+
+    assert len(calls) == 1
+    assert [open(p, "rb").read() for p in stats] == contents
+
+
+def test_result_cache_evicts_least_recently_used_runs(tmp_path):
+    cache = ResultCache(tmp_path / "cache", max_bytes=2500)
+    outputs = []
+    for name in "abc":
+        output = tmp_path / f"{name}.csv"
+        output.write_bytes(name.encode() * 1000)
+        outputs.append(output)
+    cache.store("a", "a.csv", [outputs[0]])
+    cache.store("b", "b.csv", [outputs[1]])
+    os.utime(cache.root / "entries" / "b.json", (0, 0))  # "a" is now the most recently used
+    cache.store("c", "c.csv", [outputs[2]])
+
+    assert cache.restore("b") is None
+    assert cache.restore("a") == "a.csv"
+    assert cache.restore("c") == "c.csv"
+    assert len(list((cache.root / "objects").iterdir())) == 2
+    assert result_cache().root.parent == tmp_path / "config"
+
+
+def test_result_cache_never_keeps_a_run_larger_than_its_budget(tmp_path):
+    output = tmp_path / "big.csv"
+    output.write_bytes(b"x" * 1000)
+
+    for max_bytes in (0, 999):
+        cache = ResultCache(tmp_path / f"cache{max_bytes}", max_bytes=max_bytes)
+        cache.store("big", "big.csv", [output])
+
+        assert cache.restore("big") is None
+        assert not [path for path in cache.root.rglob("*") if path.is_file()]
+
+    # The newest run is evicted too once its stored copy no longer fits.
+    cache = ResultCache(tmp_path / "cache", max_bytes=1000)
+    cache.store("big", "big.csv", [output])
+    assert cache.restore("big") == "big.csv"
+    cache.max_bytes = 999
+    cache._evict()
+
+    assert cache.restore("big") is None
+    assert not list((cache.root / "objects").iterdir())
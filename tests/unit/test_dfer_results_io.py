@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import os
+
+import numpy as np
+import pytest
+
+from src.dfer import run_analysis
+from src.dfer.results_io import bundle_paths, read_result_frame, write_result_bundle
+from tests.utils.photometry_csv import write_dual_csv, write_single_csv
+
+pytestmark = pytest.mark.usefixtures("empty_recording_cache")
+
+
+@pytest.mark.parametrize("writer", [write_single_csv, write_dual_csv])
+@pytest.mark.parametrize("streaming", [False, True])
+def test_binary_output_matches_csv_and_is_preferred(tmp_path, writer, streaming):
+    path = writer(tmp_path / "session" / "rec.csv")
+
+    out = run_analysis(path, "10", "250", "2", binary_output=True,
+                       streaming=streaming, chunk_rows=700)
+    matrix_path, header_path = bundle_paths(out)
+    assert matrix_path.exists() and header_path.exists()
+
+    from_csv = np.loadtxt(out, delimiter=",")
+    np.testing.assert_allclose(np.load(matrix_path), from_csv, rtol=0, atol=5e-7)
+
+    # Mark the bundle so the frame can only have come from it.
+    marked = np.load(matrix_path, mmap_mode="r+")
+    marked[:, 0] += 1000.0
+    marked.flush()
+    del marked
+    frame = read_result_frame(out)
+    assert frame.shape == from_csv.shape
+    np.testing.assert_allclose(frame["t_min"].to_numpy(), from_csv[:, 0] + 1000.0, rtol=0, atol=5e-7)
+
+    run_analysis(path, "10", "250", "2", streaming=streaming, chunk_rows=700)
+    assert not matrix_path.exists() and not header_path.exists()
+
+
+def test_read_result_frame_ignores_bundle_once_csv_changes(tmp_path):
+    csv_path = tmp_path / "rec_Data.csv"
+    np.savetxt(csv_path, np.c_[[0.0, 1.0, 2.0], [5.0, 6.0, 7.0]], delimiter=",",
+               header="t_min,dFoF_465", fmt="%f")
+    write_result_bundle(csv_path, np.c_[[0.0, 1.0, 2.0], [9.0, 9.0, 9.0]], ["t_min", "dFoF_465"])
+
+    assert read_result_frame(csv_path)["dFoF_465"].tolist() == [9.0, 9.0, 9.0]
+
+    stat = csv_path.stat()
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    frame = read_result_frame(csv_path)
+    assert list(frame.columns) == ["t_min", "dFoF_465"]
+    assert frame["dFoF_465"].tolist() == [5.0, 6.0, 7.0]
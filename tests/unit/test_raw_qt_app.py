@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import logging
+import threading
+import time
 
 import pytest
 from PySide6.QtWidgets import QApplication
@@ -12,6 +14,7 @@ from src.features.raw_photometry.app import (
     RawPhotometryProcessingQt,
     _mpl_dfer_results_figure_from_frame,
 )
+from tests.utils.photometry_csv import write_dual_csv, write_single_csv
 
 
 @pytest.fixture(autouse=True)
@@ -19,6 +22,15 @@ def _isolated_neurosync_config(tmp_path, monkeypatch):
     monkeypatch.setenv("NEUROSYNCAPP_CONFIG_DIR", str(tmp_path / "config"))
 
 
+def _wait_for_raw_loads(app, widget, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while widget._raw_loads and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    app.processEvents()
+    assert not widget._raw_loads
+
+
 def test_raw_qt_app_instantiates():
     app = QApplication.instance() or QApplication([])
     widget = RawPhotometryProcessingQt()
@@ -119,6 +131,67 @@ def test_raw_qt_remembers_selected_dfer_option(monkeypatch):
     widget.deleteLater()
 
 
+def test_raw_qt_binary_output_is_opt_in_and_remembered(monkeypatch):
+    app = QApplication.instance() or QApplication([])
+    widget = RawPhotometryProcessingQt()
+    captured = {}
+    saved = []
+
+    assert widget._dfer_binary_checkbox.isChecked() is False
+    monkeypatch.setattr(
+        widget.settings_manager,
+        "save_variables",
+        lambda: saved.append(widget.settings_manager.dfer_binary_output),
+    )
+    widget._dfer_binary_checkbox.setChecked(True)
+    assert saved == [True]
+
+    widget._selected_file = "recording.csv"
+    monkeypatch.setattr(widget, "_set_busy", lambda busy: None)
+    monkeypatch.setattr(
+        widget,
+        "_start_worker",
+        lambda fn, kwargs, on_success, on_error: captured.update(kwargs),
+    )
+    widget._on_run_final()
+
+    assert captured["binary_output"] is True
+    widget.deleteLater()
+
+
+def test_raw_qt_result_cache_is_opt_in_and_shared_by_dfer_and_pfer(monkeypatch):
+    app = QApplication.instance() or QApplication([])
+    widget = RawPhotometryProcessingQt()
+    captured = []
+    saved = []
+
+    assert not widget._dfer_cache_checkbox.isChecked()
+    assert not widget._pfer_cache_checkbox.isChecked()
+    monkeypatch.setattr(
+        widget.settings_manager,
+        "save_variables",
+        lambda: saved.append(widget.settings_manager.dfer_result_cache),
+    )
+    widget._pfer_cache_checkbox.setChecked(True)
+
+    assert widget._dfer_cache_checkbox.isChecked()
+    assert saved == [True]
+
+    widget._selected_file = "recording.csv"
+    widget._pfer_selected_csv = "dfer_output.csv"
+    monkeypatch.setattr(widget, "_set_busy", lambda busy: None)
+    monkeypatch.setattr(
+        widget,
+        "_start_worker",
+        lambda fn, kwargs, on_success, on_error: captured.append(kwargs["cache"]),
+    )
+    widget._on_run_final()
+    widget._on_run_pfer()
+
+    assert captured == [True, True]
+    widget.deleteLater()
+
+
 def test_raw_qt_late_logs_after_deleted_log_widget_are_ignored():
     app = QApplication.instance() or QApplication([])
     widget = RawPhotometryProcessingQt()
@@ -166,6 +239,9 @@ def test_raw_qt_final_dfer_uses_reference_plot_workflow(monkeypatch):
         "make_plots": False,
         "mode": "full",
         "plot_stage": "final",
+        "options": None,
+        "binary_output": False,
+        "cache": False,
     }
     widget.deleteLater()
 
@@ -199,6 +275,7 @@ def test_raw_qt_pfer_uses_reference_plot_workflow(monkeypatch):
         "prominence": 0.004,
         "artifact_threshold": 12,
         "make_plots": False,
+        "cache": False,
     }
     widget.deleteLater()
 
@@ -207,14 +284,12 @@ def test_raw_qt_file_selection_unlocks_options_and_locks_results(monkeypatch):
     app = QApplication.instance() or QApplication([])
     widget = RawPhotometryProcessingQt()
 
-    monkeypatch.setattr(widget, "_draw_raw_graph", lambda file_path: None)
-    monkeypatch.setattr(raw_app, "detect_photometry_file_type", lambda file_path: ("single", 0))
     monkeypatch.setattr(widget, "_refresh_time_preview", lambda: None)
     monkeypatch.setattr(widget, "_on_generate_options", lambda **kwargs: None)
     widget.notebook_graphs.setTabEnabled(2, True)
     widget.notebook_graphs.setTabEnabled(3, True)
 
-    widget._load_photometry_file("recording.csv")
+    widget._raw_file_loaded("recording.csv", "single")
 
     assert widget.notebook_graphs.isTabEnabled(1) is True
     assert widget.notebook_graphs.isTabEnabled(2) is False
@@ -229,12 +304,10 @@ def test_raw_qt_dual_file_selection_exports_above_session_folder(monkeypatch):
     app = QApplication.instance() or QApplication([])
     widget = RawPhotometryProcessingQt()
 
-    monkeypatch.setattr(widget, "_draw_raw_graph", lambda file_path: None)
-    monkeypatch.setattr(raw_app, "detect_photometry_file_type", lambda file_path: ("dual", 0))
     monkeypatch.setattr(widget, "_refresh_time_preview", lambda: None)
     monkeypatch.setattr(widget, "_on_generate_options", lambda **kwargs: None)
 
-    widget._load_photometry_file(str(raw_app.Path("parent/session/Fluorescence.csv")))
+    widget._raw_file_loaded(str(raw_app.Path("parent/session/Fluorescence.csv")), "dual")
 
     assert widget._output_folder == str(
         raw_app.Path("parent/session/Fluorescence.csv").parent.parent / "dfof_results"
@@ -265,6 +338,7 @@ def test_raw_qt_wrong_dual_file_reports_required_schema(tmp_path, monkeypatch):
     )
 
     widget._load_photometry_file(str(wrong_file))
+    _wait_for_raw_loads(app, widget)
 
     assert captured["title"] == "Photometry file not recognised"
     assert "missing required column" in str(captured["error"])
@@ -273,6 +347,42 @@ def test_raw_qt_wrong_dual_file_reports_required_schema(tmp_path, monkeypatch):
     widget.deleteLater()
 
 
+def test_raw_qt_file_loads_off_the_ui_thread_and_latest_selection_wins(tmp_path, monkeypatch):
+    app = QApplication.instance() or QApplication([])
+    widget = RawPhotometryProcessingQt()
+    first = write_single_csv(tmp_path / "first.csv")
+    second = write_dual_csv(tmp_path / "session" / "second.csv")
+    release_first = threading.Event()
+    load_recording = raw_app.load_recording
+
+    def slow_first(path, *args, **kwargs):
+        if str(path) == str(first):
+            release_first.wait(10)
+        return load_recording(path, *args, **kwargs)
+
+    monkeypatch.setattr(raw_app, "load_recording", slow_first)
+    monkeypatch.setattr(widget, "_on_generate_options", lambda **kwargs: None)
+
+    widget._load_photometry_file(str(first))
+    assert widget._selected_file is None  # returned while the first read is blocked
+    first_worker = widget._raw_worker
+    widget._load_photometry_file(str(second))
+    assert first_worker.cancel_token.cancelled
+
+    deadline = time.monotonic() + 10
+    while widget._selected_file is None and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    release_first.set()
+    _wait_for_raw_loads(app, widget)
+
+    assert widget._selected_file == str(second)
+    assert widget.file_path_edit.text() == str(second)
+    assert widget._raw_graph_ref.secondary_axis is None  # dual graph
+    assert widget.raw_graph_panel.canvas.figure is widget._raw_graph_ref.figure
+    widget.deleteLater()
+
+
 def test_raw_qt_signal_selector_matches_file_type():
     app = QApplication.instance() or QApplication([])
     widget = RawPhotometryProcessingQt()
@@ -455,3 +565,50 @@ def test_pfer_output_paths_are_beside_dfer_csv(tmp_path):
     assert _waveform_output_path(outdir, dfer_csv.stem, "465", False) == (
         outdir / "mouse_a_Data_Peak_WAVEFORM.csv"
     )
+
+
+def test_raw_qt_worker_passes_progress_and_cancel_hooks():
+    app = QApplication.instance() or QApplication([])
+    seen, failures = [], []
+
+    def staged(value, progress, cancel):
+        progress("fit", 0.25)
+        cancel.raise_if_cancelled()
+        return value
+
+    worker = raw_app._Worker(staged, {"value": 3})
+    worker.progress.connect(lambda stage, fraction: seen.append((stage, fraction)))
+    worker.finished.connect(seen.append)
+    worker.run()
+    assert seen == [("fit", 0.25), 3]
+
+    worker = raw_app._Worker(staged, {"value": 3})
+    worker.failed.connect(failures.append)
+    worker.cancel_token.cancel()
+    worker.run()
+    assert isinstance(failures[0], raw_app.AnalysisCancelled)
+
+
+def test_raw_qt_cancelled_run_resets_without_error_dialog(monkeypatch):
+    app = QApplication.instance() or QApplication([])
+    widget = RawPhotometryProcessingQt()
+    errors = []
+    widget._worker_error_handler = errors.append
+
+    widget._set_busy(True)
+    assert widget.btn_cancel.isEnabled() is True
+    widget._on_worker_progress("smooth", 0.5)
+    assert widget._progress_bar.value() == 50
+    assert widget._progress_label.text() == "Smoothing"
+
+    widget._on_worker_failed(raw_app.AnalysisCancelled("Analysis cancelled"))
+
+    assert errors == []
+    assert widget.btn_cancel.isEnabled() is False
+    assert widget.btn_run_final.isEnabled() is True
+    assert widget._progress_label.text() == "Cancelled"
+
+    failure = ValueError("bad window")
+    widget._on_worker_failed(failure)
+    assert errors == [failure]
+    widget.deleteLater()
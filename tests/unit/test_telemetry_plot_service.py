@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 import types
 
 import matplotlib
@@ -15,6 +16,7 @@ from src.features.telemetry_alignment.views.display_mode_presenter import (
     TelemetryDisplayPresenter,
 )
 from src.processing.telemetry_processing import AmbiguousTelemetryAlignmentError
+from src.processing.telemetry_series import TelemetrySeries
 
 
 class _Value:
@@ -122,8 +124,11 @@ def test_cached_telemetry_display_shift_can_be_reverted_without_reextracting():
     app.raw_extended_temp_data = pd.DataFrame(
         {"Time (min)": [-60.0, 0.0, 60.0], "Data": [36.0, 36.5, 37.0]}
     )
-    app.raw_extended_act_data = pd.DataFrame(
-        {"Time (min)": [-60.0, 0.0, 60.0], "Data": [0.0, 1.0, 2.0]}
+    app.raw_extended_act_data = TelemetrySeries(
+        np.arange(3, dtype=np.int64) * 3600 * 10**9,
+        np.array([0.0, 1.0, 2.0], dtype=np.float32),
+        sample_interval=3600.0,
+        anchor_offset=60.0,
     )
     service = TelemetryPlotService(app)
 
@@ -132,6 +137,7 @@ def test_cached_telemetry_display_shift_can_be_reverted_without_reextracting():
     assert app.temp_data["Time (min)"].tolist() == [-60.0, 0.0, 60.0]
     assert app.act_data["Time (min)"].tolist() == [-60.0, 0.0, 60.0]
     assert app.extended_temp_data["Time (min)"].tolist() == [-120.0, -60.0, 0.0]
+    assert app.extended_act_data.minutes.tolist() == [-120.0, -60.0, 0.0]
     assert app.raw_aligned_temp_data["Time (min)"].tolist() == [0.0, 60.0, 120.0]
 
     app.graph_settings_container_instance.remove_first_60_minutes_var.set(False)
@@ -140,6 +146,7 @@ def test_cached_telemetry_display_shift_can_be_reverted_without_reextracting():
     assert app.temp_data["Time (min)"].tolist() == [0.0, 60.0, 120.0]
     assert app.act_data["Time (min)"].tolist() == [0.0, 60.0, 120.0]
     assert app.extended_temp_data["Time (min)"].tolist() == [-60.0, 0.0, 60.0]
+    assert app.extended_act_data.minutes.tolist() == [-60.0, 0.0, 60.0]
 
 
 def test_overlay_extraction_keeps_alignment_anchor_and_uses_raw_duration():
@@ -314,14 +321,20 @@ def test_overlay_ambiguous_alignment_prompts_once_and_reuses_selection(monkeypat
 
     selected = pd.Timestamp("2024-01-01 12:00:00")
     assert len(prompt_choices) == 1
-    assert [call["file_path"] for call in extracted_calls] == [
-        "activity.xlsx",
-        "activity.xlsx",
-        "temperature.xlsx",
+    # Both files load together first, then again with the one chosen date.
+    assert sorted(
+        (call["selected_alignment_datetime"] is not None, call["file_path"])
+        for call in extracted_calls
+    ) == [
+        (False, "activity.xlsx"),
+        (False, "temperature.xlsx"),
+        (True, "activity.xlsx"),
+        (True, "temperature.xlsx"),
     ]
-    assert extracted_calls[0]["selected_alignment_datetime"] is None
-    assert extracted_calls[1]["selected_alignment_datetime"] == selected
-    assert extracted_calls[2]["selected_alignment_datetime"] == selected
+    assert all(
+        call["selected_alignment_datetime"] in (None, selected)
+        for call in extracted_calls
+    )
 
 
 def test_overlay_reloads_activity_if_temperature_prompts_for_alignment(monkeypatch):
@@ -412,17 +425,49 @@ def test_overlay_reloads_activity_if_temperature_prompts_for_alignment(monkeypat
     service.overlay_temp_and_act()
 
     selected = pd.Timestamp("2024-01-01 12:00:00")
-    assert [call["file_path"] for call in extracted_calls] == [
-        "activity.xlsx",
-        "temperature.xlsx",
-        "temperature.xlsx",
-        "activity.xlsx",
+    assert sorted(
+        (call["selected_alignment_datetime"] is not None, call["file_path"])
+        for call in extracted_calls
+    ) == [
+        (False, "activity.xlsx"),
+        (False, "temperature.xlsx"),
+        (True, "activity.xlsx"),
+        (True, "temperature.xlsx"),
     ]
-    assert extracted_calls[-1]["selected_alignment_datetime"] == selected
+    assert all(
+        call["selected_alignment_datetime"] in (None, selected)
+        for call in extracted_calls
+    )
     assert app.raw_aligned_act_data is not None
     assert app.raw_aligned_temp_data is not None
 
 
+def test_overlay_loads_activity_and_temperature_files_concurrently():
+    app = _App()
+    app.mouse_name = "MouseA"
+    service = TelemetryPlotService(app)
+    both_loading = threading.Barrier(2, timeout=5)
+    threads = {}
+
+    def fake_extract(file_path, *_args):
+        threads[file_path] = threading.get_ident()
+        both_loading.wait()  # raises BrokenBarrierError if the loads run one by one
+        return file_path
+
+    service.extract_data_for_date_and_offset = fake_extract
+
+    results = service._extract_telemetry_files(
+        {"Activity": "activity.xlsx", "Temperature": "temperature.xlsx"},
+        "01/02/2024",
+        "12:00:00",
+        120.0,
+    )
+
+    assert results == {"Activity": "activity.xlsx", "Temperature": "temperature.xlsx"}
+    assert len(set(threads.values())) == 2
+    assert threading.get_ident() not in threads.values()
+
+
 def test_current_photometry_data_uses_full_trace_baseline_reference():
     app = _App()
     app.data_selection_frame = types.SimpleNamespace(
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from datetime import date
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -16,6 +17,7 @@ from src.processing.telemetry_processing import (
     extract_and_trim_data,
     extract_data_for_date_and_offset,
     extract_data_with_buffer,
+    find_offset_for_previous_time,
     process_photometry_data,
     trim_data_to_minimum_length,
     upsample_telemetry_data,
@@ -251,6 +253,65 @@ def test_extract_data_for_date_and_offset_uses_selected_ambiguous_date(monkeypat
     assert date_data["Date Time"].iloc[0] == pd.Timestamp("2024-01-01 20:00:00")
 
 
+def test_extract_data_for_date_and_offset_aligns_a_month_of_ten_second_samples(monkeypatch):
+    import src.processing.telemetry_processing as telemetry_processing
+
+    times = pd.date_range("2024-01-01 00:00:03", periods=30 * 8640, freq="10s")
+    telemetry = pd.DataFrame({"Date Time": times, "Data": np.arange(len(times), dtype=float)})
+    monkeypatch.setattr(
+        telemetry_processing,
+        "_extract_sheet_table",
+        lambda *_args, **_kwargs: telemetry,
+    )
+
+    date_data, offset, previous_time = extract_data_for_date_and_offset(
+        "telemetry.xlsx",
+        "M1",
+        "01/15/2024",
+        "20:00:00",
+        duration=60,
+        selected_alignment_datetime="2024-01-15 20:00:00",
+    )
+    trimmed = extract_and_trim_data(date_data, "19:59:53", offset, 60, 10)
+
+    assert offset == pytest.approx(7 / 60)
+    assert previous_time == pd.Timestamp("2024-01-15 19:59:53")
+    assert date_data["Date Time"].iloc[0] == previous_time
+    assert trimmed["Date Time"].iloc[0] == pd.Timestamp("2024-01-15 20:00:03")
+    assert len(trimmed) == 359
+
+
+def test_alignment_lookups_skip_missing_timestamps_in_unsorted_frames():
+    from src.processing.telemetry_processing import _alignment_start_position, _find_alignment_anchor
+
+    dataframe = pd.DataFrame(
+        {
+            "Date Time": [
+                "2024-01-02 08:00:00",
+                "not a time",
+                "2024-01-01 09:00:00",
+                "2024-01-02 09:30:00",
+            ],
+            "Data": [1.0, 2.0, 3.0, 4.0],
+        },
+        index=[10, 11, 12, 13],
+    )
+
+    offset, previous_timestamp, anchor_index = _find_alignment_anchor(
+        dataframe, pd.Timestamp("2024-01-02 09:00:00")
+    )
+
+    assert (offset, previous_timestamp, anchor_index) == (
+        pytest.approx(1440.0),
+        pd.Timestamp("2024-01-01 09:00:00"),
+        12,
+    )
+    assert _alignment_start_position(dataframe, "09:30:00") == 3
+    assert _alignment_start_position(dataframe, pd.Timestamp("2024-01-01 09:00:00")) == 2
+    assert _alignment_start_position(dataframe, "9:30:00") is None
+    assert find_offset_for_previous_time(dataframe.iloc[:0], "20:00:00") == (None, None)
+
+
 def test_extract_data_with_buffer_uses_existing_offset_column():
     dataframe = pd.DataFrame(
         {
@@ -405,3 +466,72 @@ def test_apply_cluster_binning_uses_saved_bin_sizes():
 
     assert "binned_mean_temp_data" in mean_cluster_data[1]["full"]
     assert "binned_mean_act_data" in mean_cluster_data[1]["full"]
+
+
+def _write_telemetry_workbook(path, values, start="2024-01-01 12:00:00", step="10s"):
+    header = [["Serial #", "EM1"], ["Group", "Default"], ["Time", "Temperature"]]
+    stamps = pd.date_range(start, periods=len(values), freq=step)
+    rows = [
+        [stamp.strftime("%m/%d/%Y  %H:%M:%S"), value]
+        for stamp, value in zip(stamps, values)
+    ]
+    with pd.ExcelWriter(path) as writer:
+        pd.DataFrame([["Start Time", "01/01/2024"]]).to_excel(
+            writer, sheet_name="System", header=False, index=False
+        )
+        pd.DataFrame(header + rows, columns=["Name", "M1"]).to_excel(
+            writer, sheet_name="M1", index=False
+        )
+    return path
+
+
+def test_extract_sheet_table_reuses_cached_conversion_until_workbook_changes(
+    tmp_path, monkeypatch
+):
+    import src.processing.telemetry_processing as telemetry_processing
+
+    monkeypatch.setenv("NEUROSYNCAPP_CONFIG_DIR", str(tmp_path / "config"))
+    workbook = _write_telemetry_workbook(tmp_path / "Temp 24-1-1.xlsx", [36.5, "", 37.0])
+    parses = []
+    original_parse = telemetry_processing._parse_sheet_table
+    monkeypatch.setattr(
+        telemetry_processing,
+        "_parse_sheet_table",
+        lambda *args: parses.append(args) or original_parse(*args),
+    )
+
+    first = telemetry_processing._extract_sheet_table(workbook, "m1")
+    cached = telemetry_processing._extract_sheet_table(workbook, "m1")
+
+    assert len(parses) == 1
+    pd.testing.assert_frame_equal(cached, first)
+    assert cached["Date Time"].tolist() == pd.to_datetime(
+        ["2024-01-01 12:00:00", "2024-01-01 12:00:10", "2024-01-01 12:00:20"]
+    ).tolist()
+    assert cached["Data"].tolist()[::2] == [36.5, 37.0]
+    assert pd.isna(cached["Data"].iloc[1])
+
+    _write_telemetry_workbook(workbook, [38.0, 38.5])
+    changed = telemetry_processing._extract_sheet_table(workbook, "m1")
+
+    assert len(parses) == 2
+    assert changed["Data"].tolist() == [38.0, 38.5]
+
+
+def test_read_telemetry_sheet_streams_typed_columns_from_since(tmp_path):
+    from src.processing.telemetry_sheet_reader import read_telemetry_sheet
+
+    workbook = _write_telemetry_workbook(
+        tmp_path / "Act.xlsx", list(range(10)), start="2024-01-01 20:00", step="6h"
+    )
+
+    full = read_telemetry_sheet(workbook, "M1")
+    recent = read_telemetry_sheet(workbook, "m1", since=pd.Timestamp("2024-01-02 12:00"))
+
+    assert full.columns == ["Date Time", "Data"]
+    assert full.times.dtype == "datetime64[ns]" and full.values["Data"].dtype == "float64"
+    assert full.index.tolist() == list(range(3, 13))
+    # The latest row before *since* is kept for at/before lookups.
+    assert recent.times.tolist() == full.times[2:].tolist()
+    assert recent.values["Data"].tolist() == [2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0]
+    assert recent.to_frame().index.tolist() == list(range(5, 13))
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.processing.cluster_detection import process_cluster_window
+from src.processing.telemetry_processing import (
+    extract_and_trim_data,
+    extract_data_with_buffer,
+    upsample_telemetry_data,
+)
+from src.processing.telemetry_series import TelemetrySeries, detect_sample_interval
+
+
+def _telemetry_frame(n=2000, step="10s"):
+    rng = np.random.default_rng(n)
+    return pd.DataFrame(
+        {
+            "Date Time": pd.date_range("2024-01-01 11:59:53", periods=n, freq=step, unit="ns"),
+            "Data": np.round(rng.normal(37.0, 0.5, n), 2),
+        }
+    )
+
+
+def test_series_position_matches_searchsorted_on_its_time_axis():
+    uniform = TelemetrySeries.from_frame(_telemetry_frame(), anchor_offset=7 / 60)
+    times = np.cumsum(np.random.default_rng(3).integers(1, 20, 500)) * 10**9
+    irregular = TelemetrySeries(times, np.zeros(500, dtype=np.float32), anchor_offset=0.5)
+
+    assert uniform.sample_interval == 10.0
+    assert irregular.sample_interval is None
+    for series in (uniform, irregular):
+        minutes = series.minutes
+        probes = np.concatenate([minutes[::37], minutes[::41] + 1e-7, [-1e9, 1e9, minutes[-1]]])
+        for probe in probes:
+            for side in ("left", "right"):
+                assert series.position(probe, side) == np.searchsorted(minutes, probe, side), (probe, side)
+
+    window = uniform.window(5.0, 20.0)
+    np.testing.assert_allclose(window.minutes, uniform.minutes[(uniform.minutes >= 5) & (uniform.minutes <= 20)])
+    assert np.shares_memory(window.values, uniform.values)
+    assert not np.shares_memory(window.copy().values, uniform.values)
+    np.testing.assert_allclose(uniform.shifted(-2.0).minutes, uniform.minutes - 2.0)
+    assert detect_sample_interval(np.array([0, 10, 30])) is None
+
+
+def test_buffer_and_trim_helpers_accept_series():
+    frame = _telemetry_frame()
+    series = TelemetrySeries.from_frame(frame)
+    previous_time = pd.Timestamp("2024-01-01 11:59:53")
+
+    extended_frame = extract_data_with_buffer(frame, 7 / 60, 10, previous_time, duration=60)
+    extended = extract_data_with_buffer(series, 7 / 60, 10, previous_time, duration=60)
+    trimmed_frame = extract_and_trim_data(frame, "11:59:53", 7 / 60, 60, 10)
+    trimmed = extract_and_trim_data(series, "11:59:53", 7 / 60, 60, 10)
+
+    assert isinstance(extended, TelemetrySeries) and isinstance(trimmed, TelemetrySeries)
+    np.testing.assert_array_equal(extended.minutes, extended_frame["Time (min)"])
+    np.testing.assert_array_equal(trimmed.minutes, trimmed_frame["Time (min)"])
+    pd.testing.assert_frame_equal(
+        trimmed.to_frame(), trimmed_frame.reset_index(drop=True), check_index_type=False
+    )
+
+
+def test_cluster_window_from_series_matches_frame_window():
+    frame = _telemetry_frame()
+    extended_frame = extract_data_with_buffer(frame, 7 / 60, 10, "11:59:53")
+    extended = extract_data_with_buffer(TelemetrySeries.from_frame(frame), 7 / 60, 10, "11:59:53")
+    cluster = {"name": "2 Peaks", "peaks": [30.0, 45.5], "alignment_index": 1}
+
+    expected, _ = process_cluster_window(cluster, 10.0, 20.0, extended_frame, extended_frame)
+    temp, act = process_cluster_window(cluster, 10.0, 20.0, extended, extended)
+
+    assert list(temp.columns) == ["Date Time", "Data", "Time (min)", "Cluster Name"]
+    pd.testing.assert_frame_equal(temp, expected, check_exact=False, rtol=0, atol=1e-9)
+    pd.testing.assert_frame_equal(act, temp)
+    np.testing.assert_array_equal(
+        temp["Data"], frame.set_index("Date Time").loc[temp["Date Time"], "Data"]
+    )
+
+
+def test_series_upsample_interpolates_onto_a_100_ms_grid():
+    frame = pd.DataFrame(
+        {
+            "Date Time": pd.date_range("2024-01-01 12:00:00", periods=3, freq="1s", unit="ns"),
+            "Data": [1.0, np.nan, 3.0],
+        }
+    )
+
+    upsampled = upsample_telemetry_data(TelemetrySeries.from_frame(frame))
+
+    assert upsampled.sample_interval == pytest.approx(0.1)
+    assert len(upsampled) == 21
+    np.testing.assert_allclose(upsampled.values, np.linspace(1.0, 3.0, 21), rtol=1e-6)
+    np.testing.assert_allclose(
+        upsampled.values, upsample_telemetry_data(frame)["Data"].to_numpy(), rtol=1e-6
+    )
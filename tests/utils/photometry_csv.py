@@ -0,0 +1,34 @@
+"""Synthetic raw photometry CSVs shared by the DFer/PFer unit tests."""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def write_single_csv(path, n=3000, dt=0.1, seed=0, signal_label="465nm"):
+    """Write a single-photometry CSV (seconds time base) with a slow decay."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(n) * dt
+    y405 = 100.0 + 2.0 * np.exp(-t / 200.0) + rng.normal(0, 0.2, n)
+    y465 = 200.0 + 3.0 * np.exp(-t / 150.0) + np.sin(t / 5.0) + rng.normal(0, 0.2, n)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savetxt(path, np.c_[t, y405, y465], delimiter=",",
+               header=f"#time(seconds),405nm,{signal_label}", comments="", fmt="%.6f")
+    return path
+
+
+def write_dual_csv(path, n=3000, dt_ms=100.0, seed=1, metadata_row=False):
+    """Write a dual-photometry CSV (millisecond time base), optionally with a metadata row."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(n) * dt_ms
+    ts = t / 1000.0
+    y410 = 100.0 + 2.0 * np.exp(-ts / 200.0) + rng.normal(0, 0.2, n)
+    y470 = 200.0 + 3.0 * np.exp(-ts / 150.0) + np.sin(ts / 5.0) + rng.normal(0, 0.2, n)
+    y560 = 150.0 + 2.5 * np.exp(-ts / 100.0) + np.cos(ts / 4.0) + rng.normal(0, 0.2, n)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as handle:
+        if metadata_row:
+            handle.write("Device,Serial\n")
+        np.savetxt(handle, np.c_[t, y410, y470, y560], delimiter=",",
+                   header="TimeStamp,CH1-410,CH1-470,CH1-560", comments="", fmt="%.6f")
+    return path